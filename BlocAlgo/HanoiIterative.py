@@ -1,5 +1,6 @@
 import logging
 from BlocAlgo.Filtrer_analyseAlgo import AnalyseAlgo
+from BlocCommun.RunProfiler import mesurer
 
 class HanoiIterative:
     def __init__(self, nb_palet_camera):
@@ -14,19 +15,35 @@ class HanoiIterative:
         self.solve()                      # Genere les mouvements pour faire un minimum de deplacement
         #self.afficher_mouvements()        # Affiche les mouvements effectués sous forme de tableau 
 
+    @mesurer
     def solve(self):
         """
         Résout le problème de la Tour de Hanoï de manière itérative.
         Enregistre chaque mouvement dans la liste `movements`.
         """
+        self.movements = list(self.iterer_mouvements(self.nb_palet_camera, towers=self.towers))
+
+    @staticmethod
+    def iterer_mouvements(nb_palets, depart=0, towers=None):
+        """
+        Génère les mouvements un par un, à partir du coup depart + 1 : le premier mouvement
+        est disponible sans attendre le calcul des suivants.
+        :param nb_palets: Nombre de palets de la tour de départ.
+        :param depart: Nombre de coups déjà joués (reprise d'une partie).
+        :param towers: État des tours après depart coups, mis à jour à chaque mouvement
+                       (par défaut, calculé avec etat_tours).
+        :return: Générateur de tuples (coup, origine, destination, palets origine avant, palets destination avant).
+        """
+        if towers is None:
+            towers = HanoiIterative.etat_tours(nb_palets, depart)
         source, auxiliary, destination = 1, 2, 3
 
-        if self.nb_palet_camera % 2 == 0:
+        if nb_palets % 2 == 0:
             auxiliary, destination = destination, auxiliary
 
-        total_moves = (2 ** self.nb_palet_camera) - 1
+        total_moves = (2 ** nb_palets) - 1
 
-        for move in range(1, total_moves + 1):
+        for move in range(depart + 1, total_moves + 1):
             # Choix initial des tours
             # Détermine quel mouvement effectuer en fonction du numéro du coup
             if move % 3 == 1:
@@ -37,22 +54,40 @@ class HanoiIterative:
                 from_tower, to_tower = auxiliary, destination
 
             # Vérifie et effectue le mouvement du palet selon les règles du jeu
-            if self.towers[from_tower] and (not self.towers[to_tower] or self.towers[from_tower][-1] < self.towers[to_tower][-1]):
-                nb_palets_origine_avant = len(self.towers[from_tower])
-                nb_palets_destination_avant = len(self.towers[to_tower])
-                palet = self.towers[from_tower].pop()
-                self.towers[to_tower].append(palet)
-            elif self.towers[to_tower] and (not self.towers[from_tower] or self.towers[to_tower][-1] < self.towers[from_tower][-1]):
-                nb_palets_origine_avant = len(self.towers[to_tower])
-                nb_palets_destination_avant = len(self.towers[from_tower])
-                palet = self.towers[to_tower].pop()
-                self.towers[from_tower].append(palet)
+            if towers[from_tower] and (not towers[to_tower] or towers[from_tower][-1] < towers[to_tower][-1]):
+                nb_palets_origine_avant = len(towers[from_tower])
+                nb_palets_destination_avant = len(towers[to_tower])
+                palet = towers[from_tower].pop()
+                towers[to_tower].append(palet)
+            elif towers[to_tower] and (not towers[from_tower] or towers[to_tower][-1] < towers[from_tower][-1]):
+                nb_palets_origine_avant = len(towers[to_tower])
+                nb_palets_destination_avant = len(towers[from_tower])
+                palet = towers[to_tower].pop()
+                towers[from_tower].append(palet)
                 from_tower, to_tower = to_tower, from_tower  # Corrige l'ordre des tours
 
-            # Enregistre le mouvement
-            self.movements.append((
-                move, from_tower, to_tower, nb_palets_origine_avant, nb_palets_destination_avant
-            ))
+            # Produit le mouvement
+            yield move, from_tower, to_tower, nb_palets_origine_avant, nb_palets_destination_avant
+
+    @staticmethod
+    def etat_tours(nb_palets, nb_coups):
+        """
+        Calcule directement l'état des tours après nb_coups coups de la solution optimale,
+        sans rejouer les mouvements : le palet d (1 = plus petit) a bougé
+        (nb_coups + 2^(d-1)) // 2^d fois, toujours dans le même sens de rotation.
+        :param nb_palets: Nombre de palets de la tour de départ.
+        :param nb_coups: Nombre de coups déjà joués (0 à 2^n - 1).
+        :return: Dictionnaire {tour: [palets de bas en haut]}, comme self.towers.
+        """
+        if not 0 <= nb_coups <= 2 ** nb_palets - 1:
+            raise ValueError(f"Nombre de coups invalide : {nb_coups}")
+        towers = {1: [], 2: [], 3: []}
+        for palet in range(nb_palets, 0, -1):
+            deplacements = (nb_coups + (1 << (palet - 1))) >> palet
+            # Sens 1 -> 3 -> 2 si n - d est pair, sinon 1 -> 2 -> 3
+            sens = 2 if (nb_palets - palet) % 2 == 0 else 1
+            towers[(sens * deplacements) % 3 + 1].append(palet)
+        return towers
 
     def get_move_matrix(self, as_dict=False):
         """
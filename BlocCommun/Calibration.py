@@ -0,0 +1,43 @@
+import json
+import logging
+import os
+
+LOGGER = logging.getLogger(__name__)
+
+# Fichier de calibration de l'installation : écrit par BlocVision (marqueurs ArUco) et
+# par la calibration manuelle, lu par BlocRobot au démarrage
+CALIBRATION_PATH = os.path.join(os.path.expanduser("~"), ".hanoi", "calibration.json")
+
+
+def lire_calibration(path=CALIBRATION_PATH):
+    """
+    Lit le fichier de calibration. Retourne un dictionnaire vide s'il est absent ou illisible.
+    """
+    if path is None or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as calibration_file:
+            calibration = json.load(calibration_file)
+        return calibration if isinstance(calibration, dict) else {}
+    except (OSError, ValueError) as e:
+        LOGGER.warning("⚠️ Calibration illisible (%s), valeurs par défaut utilisées : %s", path, e)
+        return {}
+
+
+def ecrire_calibration(calibration, path=CALIBRATION_PATH):
+    """
+    Écrit le fichier de calibration de façon atomique (fichier temporaire puis remplacement).
+    Les clés déjà présentes et absentes de calibration sont conservées.
+    """
+    merged = lire_calibration(path)
+    merged.update(calibration)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as calibration_file:
+        json.dump(merged, calibration_file, indent=2)
+        calibration_file.flush()
+        os.fsync(calibration_file.fileno())
+    os.replace(tmp_path, path)
+    return merged
@@ -0,0 +1,214 @@
+import collections
+import contextlib
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".hanoi", "profiles")
+SAMPLE_INTERVAL = 0.005   # Période d'échantillonnage des piles (s)
+TOP_HOTSPOTS = 10         # Nombre de points chauds dans le résumé
+BLOCS = ("BlocAlgo", "BlocVision", "BlocRobot", "BlocInterface")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Sommets de pile d'un thread en attente (verrou, file, pool) : exclus des points chauds
+IDLE_FRAMES = {"threading:wait", "threading:_wait_for_tstate_lock", "queue:get", "handlers:dequeue",
+               "thread:_worker", "selectors:select"}
+
+_profiler = None
+_NO_SPAN = contextlib.nullcontext()
+
+
+def bloc_du_fichier(filename):
+    """
+    Retourne le bloc (BlocAlgo, BlocVision...) d'un fichier source du projet, ou None.
+    """
+    relative = os.path.relpath(os.path.abspath(filename), ROOT)
+    bloc = relative.split(os.sep, 1)[0]
+    return bloc if bloc in BLOCS else None
+
+
+def nom_frame(frame):
+    """
+    Nom d'un cadre de pile dans le fichier replié : module:fonction.
+    """
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+class RunProfiler:
+    """
+    Profil d'une partie complète : un thread échantillonne les piles de tous les threads
+    (Qt, robot, caméra, plan) et les blocs instrumentés enregistrent la durée de leurs étapes.
+    Le résultat est un fichier de piles repliées (format flamegraph.pl / speedscope)
+    et un résumé des points chauds.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL, clock=time.perf_counter):
+        self.interval = interval
+        self.clock = clock
+        self.stacks = collections.Counter()      # pile repliée -> nombre d'échantillons
+        self.hotspots = collections.Counter()    # fonction en sommet de pile -> nombre d'échantillons
+        self.bloc_samples = collections.Counter()
+        self.samples = 0
+        self.active_samples = 0                  # échantillons hors attente (verrou, file...)
+        self.spans = {}                          # étape -> [appels, total, max]
+        self.bloc_spans = collections.Counter()  # bloc -> durée cumulée des étapes les plus externes
+        self.started = None
+        self.duration = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._echantillonner, name="profiler", daemon=True)
+
+    def start(self):
+        self.started = self.clock()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = self.clock() - self.started
+
+    def _echantillonner(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self._ajouter_pile(names.get(ident, str(ident)), frame)
+
+    def _ajouter_pile(self, thread_name, frame):
+        leaf = nom_frame(frame)
+        location = f"{leaf} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+        stack = []
+        blocs = set()
+        while frame is not None:
+            if frame.f_code.co_filename != __file__:  # Masque les décorateurs du profileur
+                stack.append(nom_frame(frame))
+            bloc = bloc_du_fichier(frame.f_code.co_filename)
+            if bloc is not None:
+                blocs.add(bloc)
+            frame = frame.f_back
+        stack.append(thread_name)
+        with self._lock:
+            self.samples += 1
+            self.stacks[";".join(reversed(stack))] += 1
+            if leaf not in IDLE_FRAMES:
+                self.active_samples += 1
+                self.hotspots[location] += 1
+                self.bloc_samples.update(blocs)
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """
+        Chronomètre une étape "Bloc.étape". Seules les étapes les plus externes d'un bloc
+        comptent dans sa durée cumulée (pas de double comptage des appels imbriqués).
+        """
+        bloc = name.split(".", 1)[0]
+        active = self._local.__dict__.setdefault("blocs", [])
+        outermost = bloc not in active
+        active.append(bloc)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            active.pop()
+            with self._lock:
+                stats = self.spans.setdefault(name, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+                if outermost:
+                    self.bloc_spans[bloc] += elapsed
+
+    def ecrire_piles(self, path):
+        """
+        Écrit les piles repliées ("thread;module:fonction;... nombre"), une par ligne.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as folded_file:
+            for stack, count in sorted(self.stacks.items()):
+                folded_file.write(f"{stack} {count}\n")
+        return path
+
+    def resume(self, top=TOP_HOTSPOTS):
+        """
+        Résumé texte : points chauds (échantillons en sommet de pile), part de chaque bloc
+        dans les échantillons hors attente et durée des étapes chronométrées.
+        """
+        samples = max(self.active_samples, 1)
+        lines = [f"Profil : {self.duration:.2f} s, {self.samples} échantillons dont {self.active_samples} "
+                 f"hors attente ({self.interval * 1000:g} ms)",
+                 "", f"Top {top} des points chauds :"]
+        for name, count in self.hotspots.most_common(top):
+            lines.append(f"  {100 * count / samples:5.1f} %  {name}")
+        lines += ["", f"{'Bloc':<16}{'Échantillons':>14}{'Étapes (s)':>12}"]
+        for bloc in BLOCS:
+            lines.append(f"{bloc:<16}{100 * self.bloc_samples[bloc] / samples:>12.1f} %{self.bloc_spans[bloc]:>12.3f}")
+        lines += ["", f"{'Étape':<48}{'Appels':>8}{'Total (s)':>11}{'Max (s)':>10}"]
+        for name, (calls, total, longest) in sorted(self.spans.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<48}{calls:>8}{total:>11.3f}{longest:>10.3f}")
+        return "\n".join(lines)
+
+
+def demarrer_profilage(interval=SAMPLE_INTERVAL):
+    """
+    Démarre le profilage de la partie. Tant qu'il n'est pas démarré, span() et mesurer()
+    se réduisent à un test sur une variable globale.
+    """
+    global _profiler
+    arreter_profilage()
+    _profiler = RunProfiler(interval).start()
+    return _profiler
+
+
+def arreter_profilage(output_dir=PROFILE_DIR):
+    """
+    Arrête le profilage, écrit le fichier de piles repliées et le résumé, puis affiche le résumé.
+    :return: Chemin du fichier de piles repliées, ou None si aucun profilage n'était actif.
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    base = os.path.join(output_dir, time.strftime("run-%Y%m%d-%H%M%S"))
+    folded_path = profiler.ecrire_piles(base + ".folded")
+    summary = profiler.resume()
+    with open(base + ".txt", "w", encoding="utf-8") as summary_file:
+        summary_file.write(summary + "\n")
+    print(f"\n📊 {summary}")
+    print(f"🔥 Piles repliées : {folded_path} (flamegraph.pl {os.path.basename(folded_path)} > profil.svg)")
+    return folded_path
+
+
+def span(name):
+    """
+    Contexte chronométrant l'étape name ("Bloc.étape") si le profilage est actif.
+    """
+    profiler = _profiler
+    return _NO_SPAN if profiler is None else profiler.span(name)
+
+
+def mesurer(func):
+    """
+    Décorateur : chronomètre chaque appel de func sous le nom "Bloc.Classe.méthode" si le profilage est actif.
+    """
+    name = f"{func.__module__.split('.', 1)[0]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _profiler
+        if profiler is None:
+            return func(*args, **kwargs)
+        with profiler.span(name):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,336 @@
+import threading
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QGridLayout, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QSpinBox,
+    QCheckBox, QProgressBar, QGroupBox
+)
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+
+from BlocAlgo.HanoiIterative import HanoiIterative
+from BlocInterface.DetectionInterface import render_thumbnail
+from BlocInterface.RobotWorker import RobotWorker
+from BlocInterface.SimulationMoves import SimulationMoves
+from BlocRobot.DobotControl import PHOTO_POSE
+from BlocRobot.ExecutionJournal import ExecutionJournal, partie_a_reprendre
+from BlocRobot.MoveTelemetry import MoveTelemetry, DEFAULT_TELEMETRY_PATH
+from BlocRobot.StackHeightModel import StackHeightModel
+from BlocCommun.RunProfiler import mesurer
+
+PREVIEW_SIZE = (400, 300)     # Taille (px) de l'aperçu caméra et de la dernière détection
+PREVIEW_INTERVAL = 0.1        # Intervalle (s) entre deux images de l'aperçu
+
+
+class TaskWorker(QThread):
+    """
+    Exécute une tâche bloquante (connexion série, déplacement) hors du thread de l'interface.
+    """
+    done = pyqtSignal(object)   # Résultat de la tâche
+    failed = pyqtSignal(str)    # Message de l'erreur levée par la tâche
+
+    def __init__(self, task, *args):
+        """
+        :param task: callable - Tâche à exécuter.
+        :param args: Arguments de la tâche.
+        """
+        super().__init__()
+        self.task = task
+        self.args = args
+
+    def run(self):
+        try:
+            self.done.emit(self.task(*self.args))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class CameraWorker(QThread):
+    """
+    Seul propriétaire de la caméra : publie l'aperçu en continu et lance les détections
+    demandées sur la dernière image, sans que l'interface n'attende jamais la caméra.
+    """
+    frame_ready = pyqtSignal(QImage)            # Aperçu réduit de la dernière image
+    detection_ready = pyqtSignal(int, QImage)   # Nombre de palets, image des contours validés
+    failed = pyqtSignal(str)
+
+    def __init__(self, processor, interval=PREVIEW_INTERVAL):
+        """
+        :param processor: CameraProcessor - Traitement d'image et accès à la caméra.
+        :param interval: float - Intervalle (s) entre deux images de l'aperçu.
+        """
+        super().__init__()
+        self.processor = processor
+        self.interval = interval
+        self._detection_requested = threading.Event()
+        self._stop = threading.Event()
+
+    def request_detection(self):
+        """
+        Demande une détection sur la prochaine image (appelé depuis l'interface).
+        """
+        self._detection_requested.set()
+
+    def stop(self):
+        """
+        Arrête l'aperçu et libère la caméra.
+        """
+        self._stop.set()
+        self.wait()
+
+    def run(self):
+        if self.processor.capture_image(keep_open=True) is None:  # Préchauffage du capteur
+            self.failed.emit("Caméra indisponible")
+            return
+        try:
+            while not self._stop.is_set():
+                ok, frame = self.processor.cap.read()
+                if ok and frame is not None:
+                    self.frame_ready.emit(render_thumbnail(frame, PREVIEW_SIZE))
+                    if self._detection_requested.is_set():
+                        self._detection_requested.clear()
+                        num_discs, steps = self.processor.detect_discs(frame, int(time.time()))
+                        self.detection_ready.emit(num_discs, render_thumbnail(steps.image(len(steps) - 1), PREVIEW_SIZE))
+                self._stop.wait(self.interval)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.processor.release_camera()
+
+
+class Dashboard(QWidget):
+    """
+    Tableau de bord unique de la partie : aperçu caméra, dernière détection, position du bras
+    et progression des coups. La caméra, la liaison série et le robot sont pilotés par des
+    threads de travail qui alimentent l'interface par signaux ; le thread de l'interface
+    n'attend jamais.
+    """
+    def __init__(self, robot_factory, processor_factory, apercu=True, vitesse=1, progress_callback=None):
+        """
+        :param robot_factory: callable - Crée et connecte le robot (appelé dans un thread de travail).
+        :param processor_factory: callable - Crée le CameraProcessor.
+        :param apercu: bool - Propose l'aperçu des déplacements avant de lancer le robot.
+        :param vitesse: float - Facteur de vitesse de lecture de l'aperçu.
+        :param progress_callback: callable - Appelé (thread du robot) avec chaque enregistrement de coup terminé.
+        """
+        super().__init__()
+        self.robot_factory = robot_factory
+        self.processor_factory = processor_factory
+        self.vitesse = vitesse
+        self.progress_callback = progress_callback
+        self.robot = None
+        self.camera_worker = None
+        self.robot_worker = None
+        self.tasks = []         # TaskWorker en cours (références conservées jusqu'à leur fin)
+        self.journal = None
+        self.mirror = None
+        self.preview = None
+        self.reprise = partie_a_reprendre()
+
+        self.setWindowTitle("Tour de Hanoï - Tableau de bord")
+
+        # Caméra : aperçu et dernière détection
+        self.preview_label = QLabel("Caméra non démarrée")
+        self.detection_label = QLabel("Aucune détection")
+        for label in (self.preview_label, self.detection_label):
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            label.setMinimumSize(*PREVIEW_SIZE)
+        self.detect_button = QPushButton("📷 Détecter")
+        self.detect_button.setEnabled(False)
+        self.detect_button.clicked.connect(self.request_detection)
+
+        # Partie : nombre de palets, reprise, lancement
+        self.count_box = QSpinBox()
+        # Maximum du modèle de hauteurs par défaut, remplacé par celui du robot une fois connecté
+        self.count_box.setRange(1, StackHeightModel().max_discs)
+        self.resume_box = QCheckBox()
+        self.resume_box.setVisible(self.reprise is not None)
+        if self.reprise is not None:
+            self.count_box.setValue(self.reprise["nb_palets"])
+            self.resume_box.setText(f"Reprendre au coup {self.reprise['completed'] + 1} / {self.reprise['total_moves']}")
+            self.resume_box.setChecked(True)
+        self.preview_button = QPushButton("▶ Aperçu")
+        self.preview_button.setVisible(apercu)
+        self.preview_button.clicked.connect(self.show_preview)
+        self.start_button = QPushButton("🤖 Lancer le robot")
+        self.start_button.setEnabled(False)
+        self.start_button.clicked.connect(self.start_game)
+
+        # Robot : état, position et progression
+        self.status_label = QLabel()
+        self.pose_label = QLabel("Position : -")
+        self.progress_bar = QProgressBar()
+        self.progress_label = QLabel()
+
+        camera_box = QGroupBox("Caméra")
+        camera_layout = QGridLayout(camera_box)
+        camera_layout.addWidget(self.preview_label, 0, 0)
+        camera_layout.addWidget(self.detection_label, 0, 1)
+        camera_layout.addWidget(self.detect_button, 1, 1)
+
+        game_layout = QHBoxLayout()
+        game_layout.addWidget(QLabel("Palets :"))
+        game_layout.addWidget(self.count_box)
+        game_layout.addWidget(self.resume_box)
+        game_layout.addStretch()
+        game_layout.addWidget(self.preview_button)
+        game_layout.addWidget(self.start_button)
+
+        self.robot_box = QGroupBox("Robot")
+        self.robot_layout = QVBoxLayout(self.robot_box)
+        self.robot_layout.addWidget(self.status_label)
+        self.robot_layout.addWidget(self.pose_label)
+        self.robot_layout.addWidget(self.progress_bar)
+        self.robot_layout.addWidget(self.progress_label)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(camera_box)
+        layout.addLayout(game_layout)
+        layout.addWidget(self.robot_box)
+
+    # ----- Démarrage : connexion du robot puis caméra -----
+
+    def start(self):
+        """
+        Lance la connexion au robot en arrière-plan (l'interface reste réactive).
+        """
+        self.set_status("🔌 Connexion au robot...")
+        self.run_task(self.robot_factory, self.on_robot_connected)
+
+    def run_task(self, task, on_done, *args):
+        """
+        Exécute une tâche bloquante dans un TaskWorker et appelle on_done avec son résultat.
+        """
+        worker = TaskWorker(task, *args)
+        worker.done.connect(on_done)
+        worker.failed.connect(lambda error: self.set_status(f"❌ {error}"))
+        worker.finished.connect(lambda: self.tasks.remove(worker))
+        self.tasks.append(worker)
+        worker.start()
+
+    def on_robot_connected(self, robot):
+        self.robot = robot
+        self.count_box.setMaximum(robot.hauteurs.max_discs)  # Hauteurs calibrées de l'installation
+        self.set_status("📍 Positionnement du bras pour la photo...")
+        self.run_task(self.robot.move_to_and_check, self.on_photo_pose, *PHOTO_POSE)
+
+    def on_photo_pose(self, _):
+        self.set_pose(self.robot.cible_x, self.robot.cible_y, self.robot.cible_z)
+        self.set_status("✅ Robot prêt")
+        self.start_button.setEnabled(True)
+        self.camera_worker = CameraWorker(self.processor_factory())
+        self.camera_worker.frame_ready.connect(lambda image: self.preview_label.setPixmap(QPixmap.fromImage(image)))
+        self.camera_worker.detection_ready.connect(self.on_detection)
+        self.camera_worker.failed.connect(lambda error: self.preview_label.setText(f"❌ {error}"))
+        self.camera_worker.start()
+        self.detect_button.setEnabled(True)
+
+    # ----- Caméra -----
+
+    def request_detection(self):
+        self.detect_button.setEnabled(False)
+        self.camera_worker.request_detection()
+
+    @mesurer
+    def on_detection(self, num_discs, image):
+        self.detection_label.setPixmap(QPixmap.fromImage(image))
+        self.detect_button.setEnabled(True)
+        if num_discs > 0:
+            self.count_box.setValue(num_discs)
+            self.resume_box.setChecked(False)  # Nouvelle détection : nouvelle partie
+
+    # ----- Partie -----
+
+    def show_preview(self):
+        """
+        Ouvre l'aperçu des déplacements dans une fenêtre secondaire (sans bloquer le tableau de bord).
+        """
+        self.preview = SimulationMoves(self.count_box.value(), None, speed=self.vitesse)
+        self.preview.show()
+
+    def start_game(self):
+        """
+        Lance la partie : le robot joue dans un RobotWorker, suivi en direct par la simulation intégrée.
+        """
+        nb_palets = self.count_box.value()
+        reprendre = self.reprise is not None and self.resume_box.isChecked() \
+            and self.reprise["nb_palets"] == nb_palets
+        coups_faits = self.reprise["completed"] if reprendre else 0
+        for widget in (self.start_button, self.detect_button, self.count_box, self.resume_box):
+            widget.setEnabled(False)
+
+        total_moves = 2 ** nb_palets - 1
+        self.robot.definir_nb_palets(nb_palets)
+        # Mouvements générés au fil de la partie, à partir du premier coup restant
+        self.robot_worker = RobotWorker(self.robot, HanoiIterative.iterer_mouvements(nb_palets, coups_faits))
+        self.robot.telemetry = MoveTelemetry(DEFAULT_TELEMETRY_PATH, callback=self.publish_progress,
+                                             total_moves=total_moves, clock=self.robot.horloge,
+                                             initial_done=coups_faits)
+        self.journal = ExecutionJournal()
+        if coups_faits:
+            self.journal.reprendre()
+        else:
+            self.journal.commencer(nb_palets, total_moves)
+        self.robot.journal = self.journal
+        if coups_faits:
+            self.set_status(f"Reprise au coup {coups_faits + 1} : état des tours "
+                            f"{HanoiIterative.etat_tours(nb_palets, coups_faits)}")
+
+        self.progress_bar.setRange(0, total_moves)
+        self.progress_bar.setValue(coups_faits)
+        self.mirror = SimulationMoves(nb_palets, None, live=True, start_index=coups_faits)
+        self.robot_layout.addWidget(self.mirror)
+        self.robot_worker.move_started.connect(self.mirror.on_move_started)
+        self.robot_worker.move_started.connect(
+            lambda coup, origine, destination: self.set_status(f"🤖 Coup {coup} : Tour {origine} → Tour {destination}"))
+        self.robot_worker.move_done.connect(self.mirror.on_move_done)
+        self.robot_worker.move_done.connect(self.on_move_done)
+        self.robot_worker.pose_changed.connect(self.set_pose)
+        self.robot_worker.failed.connect(lambda error: self.set_status(f"❌ Partie interrompue : {error}"))
+        self.robot_worker.finished.connect(self.on_game_finished)
+        self.robot_worker.start()
+
+    def publish_progress(self, record):
+        """
+        Callback de MoveTelemetry (thread du robot) : transmet le coup terminé à l'interface.
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(record)
+        self.robot_worker.publish(record)
+
+    @mesurer
+    def on_move_done(self, record):
+        self.progress_bar.setValue(record["move"])
+        eta = record["eta"]
+        eta_text = f"{eta:.0f} s" if eta is not None else "inconnu"
+        self.progress_label.setText(f"Coup {record['move']} / {self.progress_bar.maximum()} | "
+                                    f"dernier coup {record['duration']:.1f} s | ETA {eta_text}")
+
+    def on_game_finished(self):
+        if self.robot_worker.error is not None:
+            self.journal.close()
+            return
+        self.journal.terminer()
+        print(f"Durées moyennes par phase : {self.robot.telemetry.summary()}")
+        self.robot.telemetry.close()
+        self.set_status("🏁 Partie terminée, retour à la position home...")
+        self.run_task(self.robot.return_to_home, lambda _: self.set_status("🏁 Partie terminée"))
+
+    # ----- Affichage -----
+
+    def set_status(self, text):
+        print(text)
+        self.status_label.setText(text)
+
+    def set_pose(self, x, y, z):
+        self.pose_label.setText(f"Position : x={x:.1f}  y={y:.1f}  z={z:.1f}")
+
+    def shutdown(self):
+        """
+        Arrête la caméra et attend la fin des threads de travail (appelé après la boucle Qt).
+        """
+        if self.camera_worker is not None:
+            self.camera_worker.stop()
+        if self.robot_worker is not None:
+            self.robot_worker.wait()  # La fenêtre peut être fermée avant la fin : le robot termine la partie
+        for task in list(self.tasks):
+            task.wait()
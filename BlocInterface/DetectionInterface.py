@@ -1,14 +1,63 @@
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QCheckBox, QPushButton, QVBoxLayout,
     QLabel, QInputDialog, QMessageBox
 )
 from PyQt6.QtGui import QPixmap, QImage
 from PyQt6.QtCore import Qt
+import cv2
 import numpy as np
 import time
 
 from BlocVision.CameraProcessor import CameraProcessor  # Classe de traitement d'image
+from BlocCommun.RunProfiler import mesurer
+
+VIEWER_SIZE = (800, 600)     # Taille maximale (px) d'affichage d'une étape
+THUMBNAIL_CACHE_SIZE = 4     # Nombre maximal de vignettes gardées en mémoire
+PRERENDER_AHEAD = 2          # Nombre d'étapes suivantes préparées en arrière-plan
+
+
+# Cache LRU des vignettes, partagé entre l'interface et le thread de pré-rendu
+class ThumbnailCache:
+    def __init__(self, capacity=THUMBNAIL_CACHE_SIZE):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)  # Devient la plus récemment utilisée
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)  # Éviction de la moins récemment utilisée
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+
+# Réduit une image BGR à la taille d'affichage et la convertit en QImage indépendante du tableau numpy
+@mesurer
+def render_thumbnail(image_np, size=VIEWER_SIZE):
+    height, width = image_np.shape[:2]
+    scale = min(size[0] / width, size[1] / height)
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    thumbnail = np.ascontiguousarray(cv2.resize(image_np, (max(1, round(width * scale)), max(1, round(height * scale))),
+                                                interpolation=interpolation))
+    if thumbnail.ndim == 2:
+        thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_GRAY2BGR)
+    height, width = thumbnail.shape[:2]
+    return QImage(thumbnail.data, width, height, 3 * width, QImage.Format.Format_BGR888).copy()
 
 # Fenêtre de configuration initiale (affichage et sauvegarde d'images)
 class InitialConfigWindow(QWidget):
@@ -47,13 +96,20 @@ class InitialConfigWindow(QWidget):
         self.close()
 
 
-# Fenêtre de visualisation des différentes étapes d'image
+# Fenêtre de visualisation des différentes étapes d'image.
+# images est une séquence de (titre, image) : liste, ou DetectionSteps qui rend chaque étape à la demande.
+# Les vignettes des étapes suivantes sont préparées en arrière-plan et gardées dans un cache LRU.
 class MultiImageViewer(QWidget):
-    def __init__(self, images: list[tuple[str, np.ndarray]]):
+    def __init__(self, images, cache_size=THUMBNAIL_CACHE_SIZE):
         super().__init__()
         self.setWindowTitle("Visualisation des étapes")
         self.images = images
         self.index = 0  # Index de l'image affichée
+        self.thumbnails = ThumbnailCache(cache_size)  # index -> (titre, QImage réduite)
+        self.pending = {}  # Étapes en cours de pré-rendu : index -> Future
+        self._pending_lock = threading.Lock()
+        self._images_lock = threading.Lock()  # DetectionSteps rend ses étapes sans protection entre threads
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="viewer-prerender")
 
         # Widgets
         self.image_label = QLabel()
@@ -76,18 +132,47 @@ class MultiImageViewer(QWidget):
         self.setLayout(layout)
         self.display_image(0)  # Affiche la première image
 
+    # Rend la vignette d'une étape (appelé dans le thread de pré-rendu ou, à défaut, à l'affichage)
+    def render_step(self, index):
+        thumbnail = self.thumbnails.get(index)
+        if thumbnail is None:
+            with self._images_lock:
+                title, image_np = self.images[index]
+            thumbnail = (title, render_thumbnail(image_np))
+            self.thumbnails.put(index, thumbnail)
+        return thumbnail
+
+    # Rendu en arrière-plan : l'étape quitte la liste des rendus en cours une fois prête
+    def prerender_step(self, index):
+        try:
+            return self.render_step(index)
+        finally:
+            with self._pending_lock:
+                self.pending.pop(index, None)
+
+    # Lance en arrière-plan le rendu des étapes suivantes absentes du cache
+    def prerender(self, index):
+        with self._pending_lock:
+            for next_index in range(index + 1, min(index + 1 + PRERENDER_AHEAD, len(self.images))):
+                if next_index not in self.thumbnails and next_index not in self.pending:
+                    self.pending[next_index] = self.executor.submit(self.prerender_step, next_index)
+
     # Affiche une image à un index donné
     def display_image(self, index):
-        title, image_np = self.images[index]
-        height, width, channel = image_np.shape
-        bytes_per_line = 3 * width
-
-        # Conversion en image Qt
-        q_img = QImage(image_np.data, width, height, bytes_per_line, QImage.Format.Format_BGR888)
+        with self._pending_lock:
+            future = self.pending.get(index)
+        # Étape déjà en cours de rendu : on attend ce rendu plutôt que de le refaire
+        title, q_img = future.result() if future is not None else self.render_step(index)
 
         # Mise à jour des widgets
         self.title_label.setText(title)
-        self.image_label.setPixmap(QPixmap.fromImage(q_img).scaled(800, 600, Qt.AspectRatioMode.KeepAspectRatio))
+        self.image_label.setPixmap(QPixmap.fromImage(q_img))
+        self.prerender(index)
+
+    # Arrête le pré-rendu à la fermeture de la fenêtre
+    def closeEvent(self, event):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        event.accept()
 
     # Affiche l'image suivante ou ferme si terminé
     def next_image(self):
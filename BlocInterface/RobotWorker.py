@@ -0,0 +1,47 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class RobotWorker(QThread):
+    """
+    Exécute les déplacements du robot dans un thread de travail et publie sa progression
+    par signaux Qt. Les signaux sont remis à l'interface par la boucle d'événements
+    (connexion en file) : la boucle série n'attend jamais l'affichage.
+    """
+    move_started = pyqtSignal(int, int, int)  # coup, tour d'origine, tour de destination
+    move_done = pyqtSignal(dict)              # Enregistrement MoveTelemetry du coup terminé
+    failed = pyqtSignal(str)                  # Message de l'erreur qui a interrompu la partie
+    pose_changed = pyqtSignal(float, float, float)  # Dernière position commandée (x, y, z)
+
+    def __init__(self, robot, movements):
+        """
+        :param robot: DobotControl - Robot connecté, utilisé uniquement depuis ce thread pendant la partie.
+        :param movements: Itérable des mouvements restant à jouer (matrice ou générateur HanoiIterative).
+        """
+        super().__init__()
+        self.robot = robot
+        self.movements = movements
+        self.error = None  # Exception ayant interrompu la partie
+
+    def publish(self, record):
+        """
+        Transmet à l'interface un coup terminé (callback de MoveTelemetry, appelé dans ce thread).
+
+        :param record: dict - Enregistrement du coup (move, duration, elapsed, eta...).
+        """
+        self.move_done.emit(record)
+
+    def run(self):
+        """
+        Joue tous les mouvements puis attend la fin des commandes empilées dans la file du Dobot.
+        """
+        try:
+            for coup, origine, destination, palets_origin_before, palets_destination_before in self.movements:
+                self.move_started.emit(coup, origine, destination)
+                self.robot.realiser_deplacement(origine, destination, palets_origin_before,
+                                                palets_destination_before, coup)
+                # Position commandée : aucune lecture série supplémentaire pendant la partie
+                self.pose_changed.emit(self.robot.cible_x, self.robot.cible_y, self.robot.cible_z)
+            self.robot.attendre_fin_mouvements()
+        except Exception as e:
+            self.error = e
+            self.failed.emit(str(e))
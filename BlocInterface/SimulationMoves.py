@@ -1,36 +1,232 @@
 import sys
-from PyQt6.QtWidgets import QApplication, QWidget
-from PyQt6.QtGui import QPainter, QColor, QBrush
-from PyQt6.QtCore import Qt, QTimer
+import time
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSlider, QLabel, QComboBox
+)
+from PyQt6.QtGui import QPainter, QColor, QBrush, QPixmap
+from PyQt6.QtCore import Qt, QTimer, QRect
 
 from BlocAlgo.HanoiIterative import HanoiIterative
+from BlocCommun.RunProfiler import mesurer
+
+MOVE_INTERVAL_MS = 1000     # Durée d'affichage d'un mouvement à la vitesse 1x
+MIN_INTERVAL_MS = 10        # Intervalle minimal du timer
+SPEED_FACTORS = (0.5, 1, 2, 5, 10, 50, 100, 1000)  # Vitesses de lecture proposées
+
+# Géométrie de la scène (px)
+TOWER_TOP = 80              # Haut du dessus des tours
+TOWER_BASE = 300            # Bas des tours, sur lequel repose le premier palet
+TOWER_HEIGHT = 200          # Hauteur des tours
 
 class SimulationMoves(QWidget):
 
-    def __init__(self, algorithm, qapplication):
+    def __init__(self, nb_palets, qapplication, speed=1, live=False, start_index=0):
         """
-        Initialise la fenêtre de simulation de la Tour de Hanoï.
+        Initialise la fenêtre de simulation de la Tour de Hanoï. Les mouvements sont générés au fil
+        de la lecture (HanoiIterative.iterer_mouvements) et les positions du curseur calculées
+        directement (HanoiIterative.etat_tours) : la liste des 2^n - 1 mouvements n'est jamais construite.
 
-        :param algorithm: HanoiIterative - Instance de l'algorithme contenant la solution.
+        :param nb_palets: int - Nombre de palets de la tour de départ.
+        :param qapplication: QApplication quittée à la fermeture, ou None (fenêtre secondaire, widget intégré).
+        :param speed: float - Facteur de vitesse de lecture (1 = un mouvement par seconde).
+        :param live: bool - Miroir du robot : l'affichage suit les signaux de RobotWorker au lieu du timer.
+        :param start_index: int - Nombre de coups déjà joués (reprise d'une partie).
         """
         super().__init__()
         self.qapplication = qapplication
-        self.algorithm = algorithm
+        self.nb_palets = nb_palets
         self.tower_positions = [100, 300, 500]  # Positions des tours sur l'interface graphique
-        self.palet_widths = [80, 70, 60, 50, 40][:self.algorithm.nb_palet_camera]  # Largeur des palets
-        self.towers = {0: list(range(1, self.algorithm.nb_palet_camera + 1)), 1: [], 2: []}  # État initial des tours
+        self.palet_widths = self.calculer_largeurs(nb_palets)  # Largeur des palets
+        self.palet_height = self.calculer_hauteur(nb_palets)  # Épaisseur des palets
+        self.scene = None  # Fond et tours, dessinés une fois dans un QPixmap
+        self.towers = {0: list(range(1, nb_palets + 1)), 1: [], 2: []}  # État initial des tours
         self.index = 0  # Indice du mouvement actuel
-        self.movements = self.algorithm.get_move_matrix()  # Récupération des mouvements
+        self.total_moves = 2 ** nb_palets - 1
+        self.moves = None  # Générateur des mouvements suivants, recréé après un déplacement du curseur
+        self.speed = speed
+        self.live = live
+        self.elapsed = 0.0        # Temps écoulé (s) au dernier coup terminé par le robot
+        self.eta = None           # Temps restant estimé (s) au dernier coup terminé
+        self.received_at = None   # Instant de réception du dernier coup terminé
 
-        print("Movements received in simulation:", self.movements)
+        print(f"Simulation de {self.total_moves} mouvements.")
 
         self.setWindowTitle("Tower of Hanoi - PyQt6")
-        self.setGeometry(100, 100, 600, 400)
+        self.setGeometry(100, 100, 600, 460)
+        self.init_controls()
 
         # Création du timer pour animer les mouvements
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.next_move)
-        self.timer.start(1000)  # Déclenchement toutes les secondes
+        self.set_speed(speed)
+        self.seek(start_index)
+        if live:
+            # Le temps écoulé et l'ETA défilent entre deux coups terminés
+            self.clock_timer = QTimer(self)
+            self.clock_timer.timeout.connect(self.update_label)
+            self.clock_timer.start(1000)
+        else:
+            self.timer.start()
+
+    def init_controls(self):
+        """
+        Crée la barre de lecture : lecture/pause, vitesse, curseur de position et lancement du robot.
+
+        :return: Aucun (ajoute les widgets sous la zone de dessin).
+        """
+        self.play_button = QPushButton("⏸ Pause")
+        self.play_button.clicked.connect(self.toggle_pause)
+
+        self.speed_box = QComboBox()
+        for factor in SPEED_FACTORS:
+            self.speed_box.addItem(f"x{factor:g}", factor)
+        if self.speed in SPEED_FACTORS:
+            self.speed_box.setCurrentIndex(SPEED_FACTORS.index(self.speed))
+        self.speed_box.currentIndexChanged.connect(lambda i: self.set_speed(self.speed_box.itemData(i)))
+
+        self.skip_button = QPushButton("⏭ Lancer le robot")
+        self.skip_button.clicked.connect(self.close)
+
+        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.slider.setRange(0, self.total_moves)
+        self.slider.valueChanged.connect(self.seek)
+
+        self.move_label = QLabel()
+        self.update_label()
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.play_button)
+        controls.addWidget(self.speed_box)
+        controls.addWidget(self.move_label)
+        controls.addStretch()
+        controls.addWidget(self.skip_button)
+
+        layout = QVBoxLayout(self)
+        layout.addStretch()  # La zone haute reste réservée au dessin des tours
+        layout.addWidget(self.slider)
+        layout.addLayout(controls)
+
+        if self.live:
+            # Le robot impose la position : pas de lecture ni de déplacement du curseur
+            for widget in (self.play_button, self.speed_box, self.skip_button):
+                widget.hide()
+            self.slider.setEnabled(False)
+
+    def set_speed(self, speed):
+        """
+        Change la vitesse de lecture.
+
+        :param speed: float - Facteur de vitesse (2 = deux mouvements par seconde).
+        """
+        self.speed = speed
+        self.timer.setInterval(max(MIN_INTERVAL_MS, int(MOVE_INTERVAL_MS / speed)))
+        # Au-delà de l'intervalle minimal, plusieurs mouvements sont sautés à chaque tick
+        self.moves_per_tick = max(1, round(speed * MIN_INTERVAL_MS / MOVE_INTERVAL_MS))
+
+    def toggle_pause(self):
+        """
+        Met en pause ou reprend la lecture (depuis le début si elle était terminée).
+        """
+        if self.timer.isActive():
+            self.timer.stop()
+            self.play_button.setText("▶ Lecture")
+            return
+        if self.index >= self.total_moves:
+            self.slider.setValue(0)
+        self.timer.start()
+        self.play_button.setText("⏸ Pause")
+
+    def seek(self, index):
+        """
+        Affiche l'état des tours après index mouvements, calculé directement sans rejouer les
+        mouvements précédents.
+
+        :param index: int - Nombre de mouvements joués (0 à self.total_moves).
+        """
+        if index == self.index:
+            return
+        nb_palets = self.nb_palets
+        etat = HanoiIterative.etat_tours(nb_palets, index)
+        # HanoiIterative numérote les palets du plus petit (1) au plus grand ; ici 1 est le plus grand
+        self.towers = {tour - 1: [nb_palets + 1 - palet for palet in palets] for tour, palets in etat.items()}
+        self.index = index
+        self.moves = None
+        self.update_label()
+        self.update_towers(0, 1, 2)
+
+    def update_label(self):
+        """
+        Met à jour le compteur de mouvements et, en miroir du robot, le temps écoulé et l'ETA.
+        """
+        text = f"Coup {self.index} / {self.total_moves}"
+        if self.live and self.received_at is not None:
+            since = time.monotonic() - self.received_at
+            text += f" | Écoulé {self.elapsed + since:.0f} s"
+            if self.eta is not None:
+                text += f" | ETA {max(self.eta - since, 0):.0f} s"
+        self.move_label.setText(text)
+
+    def on_move_started(self, coup, origine, destination):
+        """
+        Slot de RobotWorker.move_started : affiche le coup en cours d'exécution par le robot.
+        """
+        self.setWindowTitle(f"Tower of Hanoi - Coup {coup} en cours : Tour {origine} → Tour {destination}")
+
+    def on_move_done(self, record):
+        """
+        Slot de RobotWorker.move_done : affiche l'état des tours après le coup terminé par le robot.
+
+        :param record: dict - Enregistrement MoveTelemetry (move, elapsed, eta...).
+        """
+        self.elapsed = record["elapsed"]
+        self.eta = record["eta"]
+        self.received_at = time.monotonic()
+        self.seek(record["move"])
+        self.slider.setValue(self.index)
+        self.update_label()
+
+    @staticmethod
+    def calculer_largeurs(nb_palets, largeur_max=80, largeur_min=20):
+        """
+        Calcule la largeur d'affichage de chaque palet, du plus grand au plus petit.
+        Le pas de 10 px est conservé jusqu'à 5 palets puis réduit pour rester dans la colonne.
+
+        :param nb_palets: int - Nombre de palets de la tour.
+        :return: list - Largeurs (px) des palets.
+        """
+        if nb_palets <= 1:
+            return [largeur_max] * nb_palets
+        pas = min(10, (largeur_max - largeur_min) / (nb_palets - 1))
+        return [int(largeur_max - i * pas) for i in range(nb_palets)]
+
+    @staticmethod
+    def calculer_hauteur(nb_palets, hauteur_max=20, hauteur_min=2):
+        """
+        Calcule l'épaisseur d'affichage des palets pour que la tour complète tienne sur la colonne.
+
+        :param nb_palets: int - Nombre de palets de la tour.
+        :return: int - Épaisseur (px) d'un palet.
+        """
+        if nb_palets <= 0:
+            return hauteur_max
+        return max(hauteur_min, min(hauteur_max, (TOWER_HEIGHT - 20) // nb_palets))
+
+    def tower_rect(self, tower):
+        """
+        Zone de l'écran occupée par une tour et ses palets (zone à redessiner quand elle change).
+
+        :param tower: int - Index de la tour (0, 1 ou 2).
+        :return: QRect - Rectangle englobant.
+        """
+        width = max(self.palet_widths, default=30) + 4
+        return QRect(self.tower_positions[tower] - width // 2, TOWER_TOP, width, TOWER_BASE - TOWER_TOP + 2)
+
+    def update_towers(self, *towers):
+        """
+        Demande le rafraîchissement des seules tours modifiées.
+        """
+        for tower in towers:
+            self.update(self.tower_rect(tower))
 
     def move_palet(self, source, destination):
         """
@@ -52,48 +248,79 @@ class SimulationMoves(QWidget):
 
         :return: Aucun (met à jour self.towers et rafraîchit l'affichage).
         """
-        if self.index < len(self.movements):
-            move_num, source, destination, palets_origin_before, palets_destination_before = self.movements[self.index]
+        if self.moves_per_tick > 1 and self.index < self.total_moves:
+            self.seek(min(self.index + self.moves_per_tick, self.total_moves))
+            self.slider.setValue(self.index)
+        elif self.index < self.total_moves:
+            if self.moves is None:
+                self.moves = HanoiIterative.iterer_mouvements(self.nb_palets, self.index)
+            move_num, source, destination, palets_origin_before, palets_destination_before = next(self.moves)
             self.move_palet(source - 1, destination - 1)  # Ajustement pour indexation zéro
             print(f"Mouvement {move_num}: Tour {source} → Tour {destination} | Palets avant (Origine: {palets_origin_before}, Destination: {palets_destination_before})")
             self.index += 1
-            self.update()  # Redessiner la fenêtre après chaque mouvement
+            self.slider.setValue(self.index)  # seek ignore l'index déjà affiché
+            self.update_label()
+            self.update_towers(source - 1, destination - 1)  # Redessiner les deux tours concernées
         else:
             self.timer.stop()  # Arrêter le timer une fois tous les mouvements effectués
+            self.play_button.setText("▶ Lecture")
+
+    @mesurer
+    def render_scene(self):
+        """
+        Dessine la partie statique de la scène (fond et tours) dans un QPixmap réutilisé à chaque rafraîchissement.
+
+        :return: QPixmap - Scène à la taille de la fenêtre.
+        """
+        scene = QPixmap(self.size())
+        scene.fill(QColor(255, 255, 255))  # Fond blanc
+        painter = QPainter(scene)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setBrush(QBrush(QColor(0, 0, 0)))
+        for x in self.tower_positions:
+            painter.drawRect(x - 10, TOWER_BASE - TOWER_HEIGHT, 20, TOWER_HEIGHT)  # Base des tours
+            painter.drawEllipse(x - 15, TOWER_TOP, 30, 30)  # Dessus des tours
+        painter.end()
+        return scene
+
+    def resizeEvent(self, event):
+        """
+        Invalide la scène statique, redessinée à la nouvelle taille au prochain rafraîchissement.
+        """
+        self.scene = None
+        super().resizeEvent(event)
 
+    @mesurer
     def paintEvent(self, event):
         """
-        Dessine les tours et les palets dans l'interface graphique.
+        Dessine les tours et les palets dans l'interface graphique. Seule la zone à rafraîchir
+        est recopiée depuis la scène statique, et seuls les palets des tours qu'elle touche sont redessinés.
 
         :param event: QPaintEvent - Événement de mise à jour de l'interface.
         :return: Aucun (affichage graphique des tours et palets).
         """
+        if self.scene is None or self.scene.size() != self.size():
+            self.scene = self.render_scene()
+        area = event.rect()
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.fillRect(self.rect(), QColor(255, 255, 255))  # Fond blanc
-
-        # Dessiner les tours
-        for x in self.tower_positions:
-            painter.setBrush(QBrush(QColor(0, 0, 0)))
-            painter.drawRect(x - 10, 100, 20, 200)  # Base des tours
-            painter.drawEllipse(x - 15, 80, 30, 30)  # Dessus des tours
+        painter.drawPixmap(area, self.scene, area)
 
         # Dessiner les palets
+        painter.setBrush(QBrush(QColor(0, 0, 255)))  # palets en bleu
         for i, tower in self.towers.items():
+            if not area.intersects(self.tower_rect(i)):
+                continue
             for j, palet in enumerate(tower):
                 palet_index = palet - 1
                 if palet_index < len(self.palet_widths):  # Vérification pour éviter les erreurs d'indexation
-                    painter.setBrush(QBrush(QColor(0, 0, 255)))  # palets en bleu
                     painter.drawRect(
-                        self.tower_positions[i] - self.palet_widths[palet_index] // 2, 
-                        280 - j * 20, 
-                        self.palet_widths[palet_index], 20
+                        self.tower_positions[i] - self.palet_widths[palet_index] // 2,
+                        TOWER_BASE - (j + 1) * self.palet_height,
+                        self.palet_widths[palet_index], self.palet_height
                     )
+        painter.end()
 
-        # Connecter le signal de fermeture de la fenêtre à la méthode __closeEvent
-        self.closeEvent = self.__closeEvent
-
-    def __closeEvent(self, event):
+    def closeEvent(self, event):
         """
         Gère la fermeture de la fenêtre de simulation.
 
@@ -101,15 +328,13 @@ class SimulationMoves(QWidget):
         :return: Aucun (ferme l'application).
         """
         self.timer.stop()
+        if self.live:
+            self.clock_timer.stop()
         event.accept()
         print("Simulation fermée.")
-        self.close()
-        # Ferme l'application proprement
-        self.qapplication
+        # Ferme l'application proprement (sauf fenêtre secondaire, ouverte sans application)
         if self.qapplication:
             self.qapplication.quit()
-        else:
-            print("Aucune instance d'application PyQt6 en cours.")
 
     def __del__(self):
         """
@@ -119,12 +344,9 @@ class SimulationMoves(QWidget):
         self.timer.stop()
         if self.qapplication:
             self.qapplication.quit()
-        else:
-            print("Aucune instance d'application PyQt6 en cours.")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    algorithm = HanoiIterative(5)  # Nombre de palets fixé à 5
-    window = SimulationMoves(algorithm)
+    window = SimulationMoves(5, app)  # Nombre de palets fixé à 5
     window.show()
     sys.exit(app.exec())
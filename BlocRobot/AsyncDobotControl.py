@@ -0,0 +1,188 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from BlocRobot.DobotControl import DobotControl
+from BlocRobot.DobotQueue import QUEUE_POLL_INTERVAL, QUEUE_TIMEOUT, PTP_JUMP_XYZ, PTP_MOVL_XYZ
+from BlocRobot.MotionProfiles import PROFILE_BY_PHASE
+from BlocRobot.MoveTelemetry import PHASE_PICK, PHASE_PLACE
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncDobotControl:
+    """
+    Pilote asynchrone du Dobot construit sur DobotControl : toutes les commandes série
+    passent par une file asyncio et sont exécutées, dans l'ordre, par une seule tâche
+    d'entrées/sorties (dans un thread dédié, la liaison série de pydobot étant bloquante).
+    Les attentes de fin de mouvement rendent la main à la boucle asyncio, ce qui permet
+    à la capture, à la détection ou à l'interface de progresser pendant que le bras bouge.
+    """
+    def __init__(self, robot, poll_interval=QUEUE_POLL_INTERVAL):
+        """
+        :param robot: Instance DobotControl connectée.
+        :param poll_interval: Intervalle (s) entre deux lectures de l'index de file.
+        """
+        self.robot = robot
+        self.poll_interval = poll_interval
+        self._commands = None
+        self._io_task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dobot-io")
+        # Dobot simulé en temps virtuel : l'attente doit faire avancer son horloge
+        self._device_sleep = getattr(robot.device, "sleep", None)
+
+    @classmethod
+    async def creer(cls, **kwargs):
+        """
+        Connecte le Dobot (recherche du port, prise d'origine) sans bloquer la boucle asyncio
+        et démarre la tâche d'entrées/sorties.
+        :param kwargs: Paramètres de DobotControl.
+        """
+        loop = asyncio.get_running_loop()
+        robot = await loop.run_in_executor(None, lambda: DobotControl(**kwargs))
+        driver = cls(robot)
+        driver.start()
+        return driver
+
+    def start(self):
+        """
+        Démarre la tâche d'entrées/sorties série (à appeler depuis la boucle asyncio).
+        """
+        if self._io_task is None:
+            self._commands = asyncio.Queue()
+            self._io_task = asyncio.get_running_loop().create_task(self._io_loop())
+
+    async def close(self, disconnect=True):
+        """
+        Vide la file de commandes, arrête la tâche d'entrées/sorties et déconnecte le Dobot.
+        """
+        if self._io_task is not None:
+            if disconnect:
+                await self._call(self.robot.disconnect)
+            await self._commands.put(None)
+            await self._io_task
+            self._io_task = None
+        self._executor.shutdown(wait=True)
+
+    async def _io_loop(self):
+        """
+        Tâche unique d'accès à la liaison série : exécute les commandes dans l'ordre d'arrivée.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            command = await self._commands.get()
+            if command is None:
+                return
+            func, args, future = command
+            try:
+                result = await loop.run_in_executor(self._executor, func, *args)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+    async def _call(self, func, *args):
+        """
+        Place un appel dans la file de la tâche d'entrées/sorties et attend son résultat.
+        """
+        if self._io_task is None:
+            raise RuntimeError("Tâche d'entrées/sorties non démarrée (appeler start())")
+        future = asyncio.get_running_loop().create_future()
+        await self._commands.put((func, args, future))
+        return await future
+
+    # ----- Commandes -----
+
+    async def move_to(self, x, y, z, r=0, mode=PTP_MOVL_XYZ):
+        """
+        Déplace le bras et attend la fin du mouvement.
+        """
+        index = await self._call(self.robot.command_queue.push_move, x, y, z, r, mode)
+        self.robot.cible_x, self.robot.cible_y, self.robot.cible_z = x, y, z
+        await self.wait_for(index)
+
+    async def suck(self, enable):
+        """
+        Active ou désactive la ventouse et attend l'exécution de la commande.
+        """
+        index = await self._call(self.robot.command_queue.push_suck, enable)
+        await self.wait_for(index)
+
+    async def pose(self):
+        """
+        Retourne la position actuelle du bras.
+        """
+        return await self._call(self.robot.device.pose)
+
+    async def current_index(self):
+        """
+        Retourne l'index de la dernière commande exécutée par le Dobot.
+        """
+        return await self._call(self.robot.command_queue.current_index)
+
+    async def wait_for(self, index, timeout=QUEUE_TIMEOUT):
+        """
+        Attend que la commande d'index donné soit exécutée, sans bloquer la boucle asyncio.
+        """
+        start = self.robot.horloge()
+        while await self.current_index() < index:
+            if self.robot.horloge() - start > timeout:
+                raise TimeoutError(f"Index de file {index} non atteint après {timeout} s")
+            await self._pause(self.poll_interval)
+
+    async def _pause(self, seconds):
+        if self._device_sleep is not None:
+            await self._call(self._device_sleep, seconds)
+        else:
+            await asyncio.sleep(seconds)
+
+    async def realiser_deplacement(self, origine, destination, palets_origin_before, palets_destination_before,
+                                   coup=None):
+        """
+        Réalise un déplacement : le plan complet est empilé dans la file du Dobot (mouvements
+        enchaînés sans arrêt), puis la fin de chaque jalon de ventouse est attendue.
+        Les phases mesurées se terminent à l'exécution des jalons (PHASE_PICK, PHASE_PLACE,
+        puis la remontée éventuelle), pas à leur empilement.
+        :param coup: Numéro du coup, enregistré dans le journal une fois la dépose exécutée.
+        """
+        robot = self.robot
+        telemetry = robot.telemetry
+        plan = robot.planifier_deplacement(origine, destination, palets_origin_before, palets_destination_before)
+        if telemetry is not None:
+            telemetry.start_move(origine, destination, coup)
+            telemetry.phase(PHASE_PICK)
+        milestones = []
+        for phase, action, argument in plan:
+            if action == "suck":
+                last_index = await self._call(robot.command_queue.push_suck, argument)
+                milestones.append((phase, last_index))
+                continue
+            await self._call(robot.appliquer_profil, PROFILE_BY_PHASE[phase])
+            if action == "jump":
+                x, y, z, jump, limit = argument
+                await self._call(robot._regler_saut, jump, limit)
+                mode = PTP_JUMP_XYZ
+            else:
+                x, y, z = argument
+                mode = PTP_MOVL_XYZ
+            last_index = await self._call(robot.command_queue.push_move, x, y, z, 0, mode)
+            robot.cible_x, robot.cible_y, robot.cible_z = x, y, z
+        LOGGER.debug("Coup %s : %s -> %s empilé (dernier index %s)", coup, origine, destination, last_index)
+        for phase, milestone in milestones:
+            await self.wait_for(milestone)
+            if telemetry is not None and phase == "suction":
+                telemetry.phase(PHASE_PLACE)
+        if last_index > milestones[-1][1]:
+            if telemetry is not None:
+                telemetry.phase("lift")  # Remontée empilée après la dépose
+            await self.wait_for(last_index)
+        robot._journaliser((coup, origine, destination))
+        if telemetry is not None:
+            telemetry.end_move()
+
+    async def return_to_home(self):
+        """
+        Ramène le bras à sa position de départ.
+        """
+        await self._call(self.robot.return_to_home)
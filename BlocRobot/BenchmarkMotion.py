@@ -0,0 +1,121 @@
+import argparse
+from BlocAlgo.HanoiIterative import HanoiIterative
+from BlocRobot.DobotControl import (
+    DobotControl, EXECUTION_BLOCKING, EXECUTION_PIPELINE, MOTION_SEGMENTS, MOTION_JUMP
+)
+from BlocRobot.DobotSimulator import SimulatedDobot
+from BlocRobot.MoveTelemetry import MoveTelemetry
+from BlocRobot.MotionProfiles import profils_uniformes
+
+# Configurations comparées : (mode d'exécution, mode de trajectoire)
+CONFIGURATIONS = (
+    (EXECUTION_BLOCKING, MOTION_SEGMENTS),
+    (EXECUTION_PIPELINE, MOTION_SEGMENTS),
+    (EXECUTION_BLOCKING, MOTION_JUMP),
+    (EXECUTION_PIPELINE, MOTION_JUMP),
+)
+
+
+def mouvements_retour(movements):
+    """
+    Retourne la suite de mouvements qui ramène la tour à son état de départ.
+    Un coup (o -> d) avec (no, nd) palets avant devient (d -> o) avec (nd + 1, no - 1).
+    """
+    retour = []
+    for coup, (_, origine, destination, nb_origine, nb_destination) in enumerate(reversed(movements), start=1):
+        retour.append((coup, destination, origine, nb_destination + 1, nb_origine - 1))
+    return retour
+
+
+def executer_partie(robot, movements):
+    """
+    Exécute une suite de mouvements et retourne la durée totale (s), file du Dobot vidée.
+    La durée est mesurée sur l'horloge du robot (temps simulé pour un Dobot simulé).
+    """
+    start = robot.horloge()
+    for _, origine, destination, nb_origine, nb_destination in movements:
+        robot.realiser_deplacement(origine, destination, nb_origine, nb_destination)
+    robot.attendre_fin_mouvements()
+    return robot.horloge() - start
+
+
+def benchmark_modes(robot, nb_palets, configurations=CONFIGURATIONS):
+    """
+    Joue une partie complète pour chaque configuration (mode d'exécution, mode de trajectoire),
+    en alternant aller et retour pour que la tour revienne à sa position de départ.
+    La durée moyenne de chaque phase est mesurée par télémétrie et affichée.
+    :return: Dictionnaire "exécution/trajectoire" -> durée (s).
+    """
+    aller = HanoiIterative(nb_palets).get_move_matrix()
+    retour = mouvements_retour(aller)
+    robot.definir_nb_palets(nb_palets)
+    results = {}
+    sens = aller
+    for execution_mode, motion_mode in configurations:
+        robot.execution_mode = execution_mode
+        robot.motion_mode = motion_mode
+        name = f"{execution_mode}/{motion_mode}"
+        robot.telemetry = MoveTelemetry(total_moves=len(sens), clock=robot.horloge)
+        results[name] = executer_partie(robot, sens)
+        print(f"Mode {name} : {results[name]:.2f} s pour {len(sens)} coups")
+        phases = robot.telemetry.summary()["phases"]
+        print("    " + ", ".join(f"{phase} {duration:.2f} s" for phase, duration in phases.items()))
+        sens = retour if sens is aller else aller
+    robot.telemetry = None
+    return results
+
+
+def benchmark_profils(robot, nb_palets, configurations=CONFIGURATIONS):
+    """
+    Joue chaque configuration sans profils (vitesse par défaut du Dobot sur toutes les phases)
+    puis avec les profils de mouvement du robot, en alternant aller et retour.
+    :return: Dictionnaire "exécution/trajectoire [profils]" -> durée (s).
+    """
+    profils = robot.profils
+    aller = HanoiIterative(nb_palets).get_move_matrix()
+    retour = mouvements_retour(aller)
+    robot.definir_nb_palets(nb_palets)
+    results = {}
+    for execution_mode, motion_mode in configurations:
+        robot.execution_mode = execution_mode
+        robot.motion_mode = motion_mode
+        for label, reglage in (("sans profils", profils_uniformes()), ("profils", profils)):
+            robot.profils = reglage
+            name = f"{execution_mode}/{motion_mode} [{label}]"
+            results[name] = executer_partie(robot, aller)
+            print(f"Mode {name} : {results[name]:.2f} s pour {len(aller)} coups")
+            executer_partie(robot, retour)  # Ramène la tour à sa position de départ
+    robot.profils = profils
+    return results
+
+
+def afficher_resultats(results, nb_coups):
+    """
+    Affiche la durée totale et par coup de chaque mode, et le gain relatif au premier.
+    """
+    reference = next(iter(results.values()))
+    print(f"\n{'Mode':<36}{'Total (s)':<12}{'Par coup (s)':<14}{'Gain'}")
+    for mode, duration in results.items():
+        gain = (1 - duration / reference) * 100 if reference else 0
+        print(f"{mode:<36}{duration:<12.2f}{duration / nb_coups:<14.2f}{gain:+.0f} %")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare les modes d'exécution du Dobot sur une partie complète.")
+    parser.add_argument("--palets", type=int, default=3, help="Nombre de palets de la tour de départ")
+    parser.add_argument("--simulation", action="store_true", help="Utilise le Dobot simulé au lieu du bras réel")
+    parser.add_argument("--time-scale", type=float, default=None,
+                        help="Vitesse de la simulation (1 = temps réel) ; par défaut, temps virtuel instantané")
+    parser.add_argument("--profils", action="store_true",
+                        help="Compare chaque mode sans puis avec les profils de vitesse par phase")
+    args = parser.parse_args()
+
+    device = SimulatedDobot(time_scale=args.time_scale) if args.simulation else None
+    robot = DobotControl(device=device)
+    if args.profils:
+        results = benchmark_profils(robot, args.palets)
+    else:
+        results = benchmark_modes(robot, args.palets)
+    afficher_resultats(results, 2 ** args.palets - 1)
+    robot.return_to_home()
+    robot.disconnect()
@@ -1,5 +1,8 @@
+import logging
 from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel
 
+LOGGER = logging.getLogger(__name__)
+
 class DobotCalibrator(QWidget):
     def __init__(self, robot):
         """
@@ -85,10 +88,11 @@ class DobotCalibrator(QWidget):
     
     def save_values(self):
         """
-        Enregistre les valeurs de calibration dans l'objet robot.
+        Enregistre les valeurs de calibration dans l'objet robot (DobotControl.calibrer_manuellement
+        les sauvegarde ensuite dans le fichier de calibration).
         """
-        self.robot.CALIB_X = self.robot.x + self.dx
-        self.robot.CALIB_Y = self.robot.y + self.dy
-        self.robot.CALIB_Z = self.robot.z + self.dz
-        print(f"✅ Calibration enregistrée: Y={self.robot.CALIB_Y}, Z={self.robot.CALIB_Z}")
+        self.robot.CALIB_X = self.x
+        self.robot.CALIB_Y = self.y
+        self.robot.CALIB_Z = self.z
+        LOGGER.info("✅ Calibration enregistrée : Y=%s, Z=%s", self.robot.CALIB_Y, self.robot.CALIB_Z)
         self.close()
\ No newline at end of file
@@ -2,27 +2,96 @@
 
 import time
 import threading
-from serial.tools import list_ports
-import pydobot
-from pydobot.message import Message
-from pydobot.enums.CommunicationProtocolIDs import CommunicationProtocolIDs
+import json
+import os
+import queue
 import sys
-from BlocAlgo.HanoiIterative import HanoiIterative
-from BlocRobot.Filter_pydobot import FilterPydobotLogs
-import BlocRobot.DobotCalibrate as DobotCalibrator
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel
-
-H_PALET0   = -82
-H_PALET1   = -55 
-H_PALET2   = -30 
-H_PALET3   = -5 
-H_PALET4   = 20 
-H_PALET5   = 45
+import logging
+from BlocRobot.DobotQueue import DobotCommandQueue, queued_index, PTP_JUMP_XYZ, PTP_MOVL_XYZ
+from BlocRobot.StackHeightModel import StackHeightModel
+from BlocRobot.MotionProfiles import (
+    charger_profils, PROFILE_BY_PHASE, PROFILE_TRAVEL, PROFILE_APPROACH, PROFILE_LIFT, DEFAULT_SPEED
+)
+from BlocRobot.MoveTelemetry import PHASE_PICK, PHASE_PLACE
+from BlocRobot.PoseVerification import PoseVerificationPolicy, POINT_GRASP, POINT_RELEASE
+from BlocRobot.RobotLogging import pydobot_verbose, configurer_logs
+from BlocCommun.RunProfiler import mesurer
+from BlocCommun.Calibration import lire_calibration, ecrire_calibration, CALIBRATION_PATH
+
+LOGGER = logging.getLogger(__name__)
+
 AXE_DROITE = 150
 AXE_GAUCHE = -150
 AXE_CENTRE = 0
 H_BRAS_LEVE = 155
+H_LEVAGE = 150
 DIST_COLONNES = 220
+COLONNES = {1: AXE_GAUCHE, 2: AXE_CENTRE, 3: AXE_DROITE}  # axe_id -> coordonnée y nominale
+PHOTO_POSE = (230, -90, 155)  # Position du bras pour photographier la tour de départ
+
+# Fichiers d'état du robot conservés entre deux lancements
+ROBOT_STATE_DIR = os.path.join(os.path.expanduser("~"), ".hanoi")
+PORT_CACHE_PATH = os.path.join(ROBOT_STATE_DIR, "dobot_port.json")
+HOME_STATE_PATH = os.path.join(ROBOT_STATE_DIR, "dobot_home.json")
+CONNECT_TIMEOUT = 5    # Durée maximale (s) d'une tentative de connexion
+PREFERRED_PORT_GRACE = 1.0  # Attente (s) du dernier port valide après une connexion réussie sur un autre port
+
+# Prise d'origine (homing)
+HOME_TIMEOUT = 25            # Durée maximale (s) de la prise d'origine
+HOME_POLL_INTERVAL = 0.2     # Intervalle (s) entre deux vérifications de fin de prise d'origine
+HOME_MIN_DURATION = 2        # Durée minimale (s) avant de conclure sur une position stable
+HOME_MAX_AGE = 8 * 3600      # Âge maximal (s) d'une prise d'origine réutilisable
+HOME_POSE_TOLERANCE = 2      # Écart maximal (mm) entre la position mémorisée et la position lue
+
+# Modes d'exécution des déplacements
+EXECUTION_BLOCKING = "blocking"   # Chaque commande attend la fin du mouvement
+EXECUTION_PIPELINE = "pipeline"   # Les commandes sont empilées dans la file du Dobot
+
+# Modes de trajectoire pour la saisie et la dépose
+MOTION_SEGMENTS = "segments"      # Montée, translation et descente en commandes séparées
+MOTION_JUMP = "jump"              # Une seule commande PTP JUMP (montée, translation, descente)
+
+
+def lire_etat(path):
+    """
+    Lit un fichier d'état JSON du robot. Retourne un dictionnaire vide s'il est absent ou illisible.
+    """
+    if path is None:
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as state_file:
+            state = json.load(state_file)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def ecrire_etat(path, state):
+    """
+    Écrit un fichier d'état JSON du robot (rien n'est écrit si path vaut None).
+    """
+    if path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as state_file:
+            json.dump(state, state_file)
+    except OSError as e:
+        LOGGER.warning("⚠️ Impossible d'écrire l'état du robot dans %s : %s", path, e)
+
+
+def lire_port_cache(path=PORT_CACHE_PATH):
+    """
+    Retourne le dernier port sur lequel le Dobot a répondu, ou None.
+    """
+    return lire_etat(path).get("port")
+
+
+def ecrire_port_cache(port, path=PORT_CACHE_PATH):
+    """
+    Mémorise le port sur lequel le Dobot a répondu.
+    """
+    ecrire_etat(path, {"port": port, "timestamp": time.time()})
 
 
 class DobotControl:
@@ -30,46 +99,80 @@ class DobotControl:
     Classe pour contrôler le robot Dobot.
     """
     
-    def __init__(self, home_x=220, home_y=-7, home_z=100):
+    def __init__(self, home_x=220, home_y=-7, home_z=100, execution_mode=EXECUTION_BLOCKING,
+                 verification=None, motion_mode=MOTION_SEGMENTS, port=None, skip_recent_home=False,
+                 device=None, hauteurs=None, telemetry=None, profils=None, journal=None, calibration=None,
+                 calibration_path=None, home_state_path=None, port_cache_path=None):
         """
         Initialise le DobotControl avec les coordonnées de la position de départ.
         :param home_x: Coordonnée x de la position de départ.
         :param home_y: Coordonnée y de la position de départ.
         :param home_z: Coordonnée z de la position de départ.
+        :param execution_mode: EXECUTION_BLOCKING ou EXECUTION_PIPELINE.
+        :param verification: PoseVerificationPolicy appliquée par move_to_and_check
+                             (vérification systématique par défaut).
+        :param motion_mode: MOTION_SEGMENTS ou MOTION_JUMP.
+        :param port: Port série à utiliser ; None pour rechercher le Dobot sur tous les ports.
+        :param skip_recent_home: True pour ne pas refaire la prise d'origine si une prise récente
+                                 est mémorisée et que la position actuelle du bras la confirme.
+        :param device: Instance compatible pydobot.Dobot déjà connectée (ex. SimulatedDobot) ;
+                       aucun port n'est alors recherché et aucun état n'est écrit sur disque.
+        :param hauteurs: StackHeightModel des hauteurs de pile (modèle par défaut si None).
+        :param telemetry: MoveTelemetry mesurant les phases de chaque déplacement (None pour ne rien mesurer).
+        :param profils: Dictionnaire nom -> (vitesse, accélération) des profils de mouvement
+                        (par défaut, profils de l'installation, voir MotionProfiles.charger_profils).
+        :param journal: ExecutionJournal où sont enregistrés les coups terminés (None pour ne rien enregistrer).
+        :param calibration: Dictionnaire de calibration (par défaut, fichier de calibration de l'installation
+                            pour un Dobot réel, valeurs nominales pour un Dobot injecté).
+        :param calibration_path: Fichier de calibration lu au démarrage et mis à jour par la calibration
+                                 manuelle (par défaut, CALIBRATION_PATH pour un Dobot réel, aucun pour
+                                 un Dobot injecté).
+        :param home_state_path: Fichier mémorisant la dernière prise d'origine (par défaut, HOME_STATE_PATH
+                                pour un Dobot réel, aucun pour un Dobot injecté).
+        :param port_cache_path: Fichier mémorisant le dernier port valide (par défaut, PORT_CACHE_PATH).
+                                Plusieurs Dobots pilotés en parallèle ont chacun leurs fichiers d'état.
         """
         self.connected = False
         self.device = None
+        self.execution_mode = execution_mode
+        self.motion_mode = motion_mode
+        self.nb_palets_total = None     # Nombre total de palets de la partie (hauteurs de passage)
+        if calibration_path is None and device is None:
+            calibration_path = CALIBRATION_PATH
+        self.calibration_path = calibration_path
+        if calibration is None:
+            calibration = lire_calibration(self.calibration_path)
+        self.calibration = calibration
+        self.colonnes = self.positions_colonnes(calibration)  # axe_id -> (x, y)
+        self.hauteurs = hauteurs if hauteurs is not None else StackHeightModel.from_calibration(calibration)
+        self._table_hauteurs = self.hauteurs.heights  # Table précalculée pour la boucle d'exécution
+        self._jump_params = None        # Derniers paramètres de saut envoyés
+        self.profils = profils if profils is not None else charger_profils()
+        self._speed = DEFAULT_SPEED     # Vitesse et accélération actuellement réglées sur le Dobot
+        self.verification = verification if verification is not None else PoseVerificationPolicy()
+        self.telemetry = telemetry
+        self.journal = journal
+        self._coup = None               # Coup en cours : (numéro, origine, destination)
+        self._deposes_en_attente = []   # Coups dont la dépose est empilée : (index de file, coup)
+        self.command_queue = None
+        self._pending_milestone = None  # Index de la dernière ventouse empilée non encore attendue
+        self._jalons = []               # Mode pipeline, télémétrie : ventouses empilées (index, saisie, coup, début)
+        self._debut_coup = None         # Empilement du premier mouvement du coup en cours
+        self._fin_dernier_coup = None   # Exécution de la dernière dépose mesurée
         self.ERROR_NOT_CONNECTED = "Le Dobot n'est pas connecte."
         self.ERROR_INVALID_PALLET_COUNT = "Nombre de palets invalide"
-        available_ports = list_ports.comports()
-        if not available_ports:
-            raise RuntimeError("Aucun port disponible pour connecter le Dobot.")
-        print(f'available ports: {[x.device for x in available_ports]}')
-
-        self.port = None
-        timeout = 5  # Timeout de 10 secondes pour la connexion
-        for port in available_ports:
-            try:
-                print(f"Test de connexion au port : {port.device}")
-                # Essayez d'initialiser le Dobot sur ce port
-                test_device = self.try_connect_dobot(port, timeout=timeout)
-                test_device.close()  # Si la connexion réussit, fermez-la immédiatement
-                self.port = port.device
-                print(f"✅ Port valide trouvé : {self.port}")
-                break
-            except RuntimeError as e:
-                print(f"❌ Échec de connexion au port {port.device}: Timeout dépassé")  # Timeout atteint pour ce port
-            except Exception as e:
-                print(f"❌ Échec de connexion au port {port.device}")
-
-        if self.port is None:
-            raise RuntimeError("Aucun port USB série valide trouvé pour le Dobot.")
+        if home_state_path is None and device is None:
+            home_state_path = HOME_STATE_PATH
+        self.home_state_path = home_state_path
+        self.port_cache_path = port_cache_path if port_cache_path is not None else PORT_CACHE_PATH
+        if device is not None:
+            self.port = getattr(device, "port", "simulation")
         else:
-            # Initialisez le Dobot avec le port trouvé
-            sys.stdout = FilterPydobotLogs(sys.stdout)
-            self.device = pydobot.Dobot(port=self.port, verbose=True)
-            self.connected = True
-            time.sleep(1) # Attendre que le Dobot soit prêt
+            device = self._connecter(port)
+        self.device = device
+        self.command_queue = DobotCommandQueue(self.device)
+        self.connected = True
+
         # Cible initiale
         self.home_x = home_x
         self.home_y = home_y
@@ -77,53 +180,160 @@ class DobotControl:
         self.cible_x = DIST_COLONNES
         self.cible_y = 0
         self.cible_z = 0
-        self.CALIB_Y = 0
-        self.CALIB_Z = 0
+        manuel = calibration.get("manuel", {})
+        self.CALIB_Y = manuel.get("y", 0)
+        self.CALIB_Z = manuel.get("z", 0)
 
         # Patch si la méthode n'existe pas
         if not hasattr(self.device, 'home'):
-            print("Ajout de la méthode home au Dobot")
+            LOGGER.info("Ajout de la méthode home au Dobot")
             self._patch_home()
         
-        # Va à la position home
-        print("Déplacement vers la position home...")
-        self.device.home()
-        
+        # Va à la position home (sauf prise d'origine récente vérifiée)
+        if skip_recent_home and self.home_recent_valide():
+            LOGGER.info("Prise d'origine récente confirmée par la position du bras : homing ignoré.")
+        else:
+            LOGGER.info("Déplacement vers la position home...")
+            self.device.home()
+            ecrire_etat(self.home_state_path, {"port": self.port, "homed_at": time.time()})
+
         # Se repositionner à home après calibration
-        print("Repositionnement à la position home...")
+        LOGGER.info("Repositionnement à la position home...")
         self.move_to_and_check(self.home_x, self.home_y, self.home_z)
-        self.device.move_to(home_x, home_y, home_z, 0, True)
+        self.memoriser_pose()
 
-    def try_connect_dobot(self, port, timeout=5):
+    @mesurer
+    def _connecter(self, port=None):
         """
-        Tente de se connecter au Dobot sur un port donné avec un timeout.
-        :param port: Port série à tester.
-        :param timeout: Durée maximale en secondes pour la tentative.
-        :return: Instance Dobot si la connexion réussit, sinon lève une exception.
+        Recherche le Dobot sur les ports série et retourne l'instance connectée.
+        :param port: Port imposé, ou None pour essayer tous les ports.
         """
-        result = [None]  # Utilisation d'une liste mutable pour stocker le résultat dans le thread
-        exception = [None]
+        from serial.tools import list_ports
 
-        def connect():
-            try:
-                result[0] = pydobot.Dobot(port=port.device, verbose=False)
-            except Exception as e:
-                exception[0] = e
+        available_ports = list_ports.comports()
+        if not available_ports:
+            raise RuntimeError("Aucun port disponible pour connecter le Dobot.")
+        LOGGER.info("Ports disponibles : %s", [x.device for x in available_ports])
 
-        # Lancer la connexion dans un thread séparé
-        thread = threading.Thread(target=connect)
-        thread.start()
-        thread.join(timeout)  # Attendre jusqu'à ce que le thread termine ou que le timeout soit atteint
+        if port is not None:
+            available_ports = [p for p in available_ports if p.device == port]
+        self.port, device = self.decouvrir_dobot(available_ports, timeout=CONNECT_TIMEOUT)
 
-        if thread.is_alive():
-            # Si le thread est toujours actif après le timeout, on lève une exception
-            raise RuntimeError(f"⏳ Timeout atteint pour la connexion au port {port.device}.")
-        if exception[0]:
-            # Si une exception a été levée dans le thread, on la relance
-            raise exception[0]
+        if self.port is None:
+            raise RuntimeError("Aucun port USB série valide trouvé pour le Dobot.")
+        # La connexion de test est conservée : pas de seconde ouverture du port
+        LOGGER.info("✅ Port valide trouvé : %s", self.port)
+        ecrire_port_cache(self.port, self.port_cache_path)
+        time.sleep(1) # Attendre que le Dobot soit prêt
+        return device
 
-        thread.join()  # Assurez-vous que le thread est terminé avant de continuer
-        return result[0]
+    def horloge(self):
+        """
+        Heure courante (s) du robot : horloge simulée pour un Dobot simulé, monotone sinon.
+        """
+        now = getattr(self.device, "now", None)
+        return now() if now is not None else time.monotonic()
+
+    def pause(self, seconds):
+        """
+        Attend seconds secondes (temps simulé pour un Dobot simulé).
+        """
+        sleep = getattr(self.device, "sleep", None)
+        (sleep or time.sleep)(seconds)
+
+    def decouvrir_dobot(self, available_ports, timeout=CONNECT_TIMEOUT):
+        """
+        Recherche le Dobot parmi les ports disponibles : tous les ports sont sondés en parallèle,
+        le dernier port valide (mémorisé sur disque) étant retenu en priorité s'il répond.
+        Un cache obsolète ne retarde donc pas la recherche.
+        :return: Tuple (nom du port, instance Dobot connectée) ou (None, None).
+        """
+        port_names = [port.device for port in available_ports]
+        cached = lire_port_cache(self.port_cache_path)
+        if cached in port_names:
+            LOGGER.info("Dernier port valide sondé en priorité : %s", cached)
+        else:
+            cached = None
+        return self.sonder_ports(port_names, timeout=timeout, prefer=cached)
+
+    @staticmethod
+    def sonder_ports(port_names, timeout=CONNECT_TIMEOUT, prefer=None, factory=None, grace=PREFERRED_PORT_GRACE):
+        """
+        Sonde plusieurs ports en parallèle et conserve une seule connexion Dobot : celle du port
+        prefer s'il répond au plus grace secondes après la première connexion réussie, sinon la
+        première réussie. Toutes les autres connexions, y compris celles qui aboutissent après
+        le choix ou après le timeout, sont refermées.
+        :param prefer: Port à retenir en priorité (dernier port valide), ou None.
+        :param factory: Crée l'instance Dobot d'un port (par défaut pydobot.Dobot).
+        :return: Tuple (nom du port, instance Dobot connectée) ou (None, None).
+        """
+        if not port_names:
+            return None, None
+        if factory is None:
+            import pydobot
+
+            def factory(port_name):
+                return pydobot.Dobot(port=port_name, verbose=pydobot_verbose())
+
+        results = queue.Queue()
+        lock = threading.Lock()
+        closed = threading.Event()  # Choix effectué : les connexions suivantes sont refermées
+
+        def probe(port_name):
+            try:
+                device = factory(port_name)
+            except Exception as e:
+                results.put((port_name, None, e))
+                return
+            with lock:
+                if not closed.is_set():
+                    results.put((port_name, device, None))
+                    return
+            device.close()  # Connexion aboutie après le choix
+
+        LOGGER.info("Test de connexion en parallèle aux ports : %s", port_names)
+        for port_name in port_names:
+            threading.Thread(target=probe, args=(port_name,), daemon=True).start()
+
+        deadline = time.monotonic() + timeout
+        pending = set(port_names)
+        chosen = None      # Connexion retenue : (port, instance)
+        candidate = None   # Première connexion réussie sur un autre port que prefer
+        while pending and chosen is None:
+            if candidate is not None and prefer not in pending:
+                break  # Le port prioritaire a échoué
+            limit = deadline if candidate is None else min(deadline, candidate_at + grace)
+            remaining = limit - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                port_name, device, error = results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.discard(port_name)
+            if device is None:
+                LOGGER.debug("❌ Échec de connexion au port %s : %s", port_name, error)
+            elif port_name == prefer or prefer is None:
+                chosen = (port_name, device)
+            elif candidate is None:
+                candidate, candidate_at = (port_name, device), time.monotonic()
+            else:
+                device.close()  # Une autre connexion attend déjà le port prioritaire
+
+        with lock:
+            closed.set()
+        if chosen is None:
+            chosen = candidate
+        elif candidate is not None:
+            candidate[1].close()
+        while not results.empty():
+            _, device, _ = results.get_nowait()
+            if device is not None:
+                device.close()
+        if chosen is None:
+            LOGGER.warning("⏳ Timeout atteint pour la connexion aux ports.")
+            return None, None
+        return chosen
 
     def execute_init(self):
         
@@ -135,13 +345,13 @@ class DobotControl:
                 if(index == 0):
                     self.deplacer_vers_colonne_gauche()
                     self.grab_pallet(5, grab=True)
-                    time.sleep(1)
+                    self.pause(1)
                     self.grab_pallet(4, grab=False)
                 if(index == 1):
                     self.deplacer_vers_colonne_centre()
                     # Activer la ventouse pour ramasser
                     self.activate_ventouse(True)
-                    time.sleep(1)
+                    self.pause(1)
                     # Désactiver la ventouse pour déposer
                     self.activate_ventouse(False)
 
@@ -149,31 +359,45 @@ class DobotControl:
                     self.deplacer_vers_colonne_droite()
                     # Activer la ventouse pour ramasser
                     self.activate_ventouse(True)
-                    time.sleep(1)
+                    self.pause(1)
                     # Désactiver la ventouse pour déposer
                     self.activate_ventouse(False)
 
             # Retour au point de départ
-            print("Retour au point de départ.")
+            LOGGER.info("Retour au point de départ.")
             self.return_to_home()
 
         except Exception as e:
-            print(f"Une erreur s'est produite : {e}")
+            LOGGER.error("Une erreur s'est produite : %s", e)
             self.device.close()
             self.connected = False
 
-    def move_to_and_check(self, x, y, z, r=0, wait=True):
+    @mesurer
+    def move_to_and_check(self, x, y, z, r=0, wait=True, point=None):
         """
-        Déplace le Dobot et vérifie la position.
+        Déplace le Dobot et vérifie la position selon la politique de vérification.
+        :param point: POINT_GRASP, POINT_RELEASE ou None pour un déplacement ordinaire.
+        :return: False si un écart a été détecté, True sinon (y compris sans vérification).
         """
         self.device.move_to(x, y, z, r, wait)
-        time.sleep(0.3)
-        
-        pose = self.get_pose()
-        if abs(pose[0] - x) > 2 or abs(pose[1] - y) > 2 or abs(pose[2] - z) > 2:
-            print(f"Déplacement incorrect : attendu ({x}, {y}, {z}), obtenu ({pose[0]}, {pose[1]}, {pose[2]})")
-        else:
-            print("Position correcte.")
+        self.cible_x, self.cible_y, self.cible_z = x, y, z
+        return self._verifier_position(x, y, z, point)
+
+    def _verifier_position(self, x, y, z, point=None):
+        """
+        Vérifie la position atteinte si la politique de vérification le demande.
+        :return: False si un écart a été détecté, True sinon.
+        """
+        if not self.verification.should_verify(point):
+            return True
+
+        self.verification.settle(self.pause)
+        pose = self.device.pose()
+        if not self.verification.check((x, y, z), pose):
+            LOGGER.warning("Déplacement incorrect : attendu (%s, %s, %s), obtenu (%s, %s, %s)",
+                           x, y, z, pose[0], pose[1], pose[2])
+            return False
+        return True
 
     def get_pose(self):
         """
@@ -190,14 +414,14 @@ class DobotControl:
         :param r: Angle de rotation.
         :param wait: Attendre la fin du mouvement.
         """
-        self.cible_x = DIST_COLONNES
-        self.cible_y = AXE_GAUCHE
+        self.cible_x, self.cible_y = self.colonnes[1]
             
         if not self.connected:
             raise RuntimeError(self.ERROR_NOT_CONNECTED)
 
-        print(f"Déplacement vers x={self.cible_x}, y={AXE_GAUCHE}, z={self.cible_z}, r={r}")
-        self.device.move_to(self.cible_x, self.cible_y, H_BRAS_LEVE, r, wait)
+        LOGGER.debug("Déplacement vers x=%s, y=%s, r=%s", self.cible_x, self.cible_y, r)
+        self.appliquer_profil(PROFILE_TRAVEL)
+        self.device.move_to(self.cible_x, self.cible_y, self.hauteur_transport(), r, wait)
 
     def deplacer_vers_colonne_centre(self, r=0, wait=True):
         """
@@ -205,14 +429,14 @@ class DobotControl:
         :param r: Angle de rotation.
         :param wait: Attendre la fin du mouvement.
         """
-        self.cible_x = DIST_COLONNES
-        self.cible_y = AXE_CENTRE
+        self.cible_x, self.cible_y = self.colonnes[2]
             
         if not self.connected:
             raise RuntimeError(self.ERROR_NOT_CONNECTED)
 
-        print(f"Déplacement vers x={self.cible_x}, y={AXE_CENTRE}, z={self.cible_z}, r={r}")
-        self.device.move_to(self.cible_x, self.cible_y, H_BRAS_LEVE, r, wait)
+        LOGGER.debug("Déplacement vers x=%s, y=%s, r=%s", self.cible_x, self.cible_y, r)
+        self.appliquer_profil(PROFILE_TRAVEL)
+        self.device.move_to(self.cible_x, self.cible_y, self.hauteur_transport(), r, wait)
     
     def deplacer_vers_colonne_droite(self, r=0, wait=True):
         """
@@ -220,14 +444,14 @@ class DobotControl:
         :param r: Angle de rotation.
         :param wait: Attendre la fin du mouvement.
         """
-        self.cible_x = DIST_COLONNES 
-        self.cible_y = AXE_DROITE 
+        self.cible_x, self.cible_y = self.colonnes[3]
         
         if not self.connected:
             raise RuntimeError(self.ERROR_NOT_CONNECTED)
 
-        print(f"Déplacement vers x={self.cible_x}, y={AXE_DROITE}, z={self.cible_z}, r={r}")
-        self.device.move_to(self.cible_x, self.cible_y, H_BRAS_LEVE, r, wait)
+        LOGGER.debug("Déplacement vers x=%s, y=%s, r=%s", self.cible_x, self.cible_y, r)
+        self.appliquer_profil(PROFILE_TRAVEL)
+        self.device.move_to(self.cible_x, self.cible_y, self.hauteur_transport(), r, wait)
 
     def grab_pallet(self, nb_palet, r=0, wait=True, grab=True):
 
@@ -238,24 +462,30 @@ class DobotControl:
         :param wait: Attendre la fin du mouvement.
         :param grab: True pour saisir, False pour déposer.
         """
-        print(f"Nombre de palets à saisir : {nb_palet}")
+        LOGGER.debug("Nombre de palets à saisir : %s", nb_palet)
 
         #Saisir un palet.
         if(grab == False):
             nb_palet += 1;  # Ajout du palet à déposer
         self.move_vertical_switch(nb_palet)
+        self._phase("descend")
+        self.appliquer_profil(PROFILE_APPROACH)
 
-        print(f"Position actuelle : x={self.cible_x}, y={self.cible_y}, z={self.cible_z}, r={r}")
+        LOGGER.debug("Position cible : x=%s, y=%s, z=%s, r=%s", self.cible_x, self.cible_y, self.cible_z, r)
 
         if not self.connected:
             raise RuntimeError(self.ERROR_NOT_CONNECTED)
-        self.move_to_and_check(self.cible_x, self.cible_y, self.cible_z, r, wait)
+        self.move_to_and_check(self.cible_x, self.cible_y, self.cible_z, r, wait,
+                               point=POINT_GRASP if grab else POINT_RELEASE)
+        self._phase("suction" if grab else "release")
         self.activate_ventouse(grab)
         if grab:
-            print("Palet saisi")
+            LOGGER.debug("Palet saisi")
         else:
-            print("Palet déposé")
-        self.move_to_and_check(self.cible_x, self.cible_y, 150, r, wait)
+            LOGGER.debug("Palet déposé")
+        self._phase("lift")
+        self.appliquer_profil(PROFILE_LIFT)
+        self.move_to_and_check(self.cible_x, self.cible_y, self.hauteur_levage(), r, wait)
 
     def activate_ventouse(self, activate=True):
         #Activer ou désactiver la ventouse.
@@ -263,7 +493,7 @@ class DobotControl:
             raise RuntimeError(self.ERROR_NOT_CONNECTED)
 
         self.device.suck(activate)
-        print("Ventouse activee" if activate else "Ventouse désactivee")
+        LOGGER.debug("Ventouse activée" if activate else "Ventouse désactivée")
 
     def get_pose(self):
         #Obtenir la position actuelle du Dobot.
@@ -271,18 +501,28 @@ class DobotControl:
             raise RuntimeError(self.ERROR_NOT_CONNECTED)
 
         pose = self.device.pose()
-        print(f"Position actuelle: x={pose[0]}, y={pose[1]}, z={pose[2]}, r={pose[3]}")
+        LOGGER.debug("Position actuelle : x=%s, y=%s, z=%s, r=%s", pose[0], pose[1], pose[2], pose[3])
         return pose
 
+    @mesurer
     def return_to_home(self):
         #Retour a la position initiale (home).
-        print(f"Retour à la position de depart : x={self.home_x}, y={self.home_y}, z={self.home_z}")
+        self.attendre_fin_mouvements()
+        self.appliquer_profil(PROFILE_TRAVEL)
+        levage = self.hauteur_levage()
+        if self.cible_z < levage:
+            # Après un saut, le bras est resté au niveau des piles : remontée verticale d'abord
+            self.device.move_to(self.cible_x, self.cible_y, levage, r=0, wait=True)
+            self.cible_z = levage
+        LOGGER.info("Retour à la position de départ : x=%s, y=%s, z=%s", self.home_x, self.home_y, self.home_z)
         self.device.move_to(self.home_x, AXE_CENTRE, self.home_z, r=0, wait=True) #axe_centre anciennement 0
 
     def disconnect(self):
         #Deconnexion propre du Dobot.
         if self.connected:
-            print("Deconnexion du Dobot.")
+            self.attendre_fin_mouvements()
+            self.memoriser_pose()
+            LOGGER.info("Déconnexion du Dobot.")
             self.device.close()
             self.connected = False
 
@@ -290,7 +530,7 @@ class DobotControl:
         """Destructeur pour deconnecter proprement."""
         if threading.current_thread() is not threading.main_thread():
             threading.currentThread().join()
-            print("Destruction de l'objet DobotControl.")
+            LOGGER.debug("Destruction de l'objet DobotControl.")
         self.connected = False
         self.disconnect()
 
@@ -307,82 +547,364 @@ class DobotControl:
             case 3:
                 self.deplacer_vers_colonne_droite()
             case _:
-                print(f"Erreur axe_id")
+                LOGGER.error("Erreur axe_id : %s", axe_id)
         
             
-    def realiser_deplacement(self, origine , destination, palets_origin_before, palets_destination_before):
+    @mesurer
+    def realiser_deplacement(self, origine , destination, palets_origin_before, palets_destination_before,
+                             coup=None):
         """
         Réalise le déplacement entre deux axes.
+        En mode pipeline, la méthode rend la main dès que les commandes sont empilées.
+        :param coup: Numéro du coup, enregistré dans le journal une fois la dépose exécutée.
+        """
+        self._coup = (coup, origine, destination)
+        # En mode pipeline, le coup est mesuré à l'exécution de ses jalons (_mesurer_jalons)
+        mesure_directe = self.telemetry is not None and self.execution_mode != EXECUTION_PIPELINE
+        if mesure_directe:
+            self.telemetry.start_move(origine, destination, coup)
+        elif self.telemetry is not None:
+            self._debut_coup = self.telemetry.clock()
+        if self.execution_mode == EXECUTION_BLOCKING and self.motion_mode == MOTION_SEGMENTS:
+            self._phase("travel")
+            self.deplacer_vers_axe(origine)
+            self.grab_pallet(palets_origin_before, grab=True)
+            self._phase("travel")
+            self.deplacer_vers_axe(destination)
+            self.grab_pallet(palets_destination_before, grab=False)
+            self._journaliser(self._coup)  # La remontée bloquante garantit que la dépose est faite
+        else:
+            plan = self.planifier_deplacement(origine, destination, palets_origin_before, palets_destination_before)
+            self._executer_plan(plan)
+        if mesure_directe:
+            self.telemetry.end_move()
+
+    def _journaliser(self, coup):
+        """
+        Enregistre un coup terminé dans le journal d'exécution.
+        """
+        if self.journal is not None and coup[0] is not None:
+            self.journal.enregistrer(*coup)
+
+    def _confirmer_deposes(self, index=None):
+        """
+        Journalise les coups dont la dépose a été exécutée par le Dobot.
+        :param index: Dernier index de file atteint (None : toutes les commandes empilées sont exécutées).
+        """
+        while self._deposes_en_attente and (index is None or self._deposes_en_attente[0][0] <= index):
+            self._journaliser(self._deposes_en_attente.pop(0)[1])
+
+    def _mesurer_jalons(self, index=None):
+        """
+        Mode pipeline : date les coups d'après l'exécution de leurs jalons de ventouse.
+        Un coup commence quand le bras est libre (dépose précédente exécutée, ou empilement
+        de son premier mouvement si celui-ci est plus tardif) ; l'exécution de la saisie
+        termine PHASE_PICK et celle de la dépose termine PHASE_PLACE et le coup.
+        :param index: Dernier index de file atteint (None : tous les jalons empilés sont exécutés).
+        """
+        while self._jalons and (index is None or self._jalons[0][0] <= index):
+            _, saisie, (coup, origine, destination), debut = self._jalons.pop(0)
+            if self.telemetry is None:
+                continue
+            if saisie:
+                if self._fin_dernier_coup is not None:
+                    debut = max(debut, self._fin_dernier_coup)
+                self.telemetry.start_move(origine, destination, coup, at=debut)
+                self.telemetry.phase(PHASE_PICK, at=debut)
+                self.telemetry.phase(PHASE_PLACE)
+            else:
+                self._fin_dernier_coup = self.telemetry.clock()
+                self.telemetry.end_move(at=self._fin_dernier_coup)
+
+    def _phase(self, name):
+        """
+        Signale le début d'une phase du déplacement en cours à la télémétrie.
+        """
+        if self.telemetry is not None:
+            self.telemetry.phase(name)
+
+    @staticmethod
+    def positions_colonnes(calibration):
+        """
+        Retourne les coordonnées (x, y) de chaque colonne : valeurs calibrées si présentes,
+        valeurs nominales (DIST_COLONNES, AXE_*) sinon.
+        """
+        calibrees = calibration.get("colonnes", {})
+        positions = {}
+        for axe_id, y in COLONNES.items():
+            x, y = calibrees.get(str(axe_id), (DIST_COLONNES, y))
+            positions[axe_id] = (float(x), float(y))
+        return positions
+
+    def definir_nb_palets(self, nb_palets):
         """
-        self.deplacer_vers_axe(origine)
-        self.grab_pallet(palets_origin_before, grab=True)
-        self.deplacer_vers_axe(destination)
-        self.grab_pallet(palets_destination_before, grab=False)
+        Indique le nombre total de palets de la partie. Il fixe les hauteurs de transport
+        et la hauteur de la troisième pile lors du calcul des sauts.
+        """
+        if nb_palets > self.hauteurs.max_discs:
+            raise ValueError(f"{self.ERROR_INVALID_PALLET_COUNT} : {nb_palets} (maximum {self.hauteurs.max_discs})")
+        self.nb_palets_total = nb_palets
+
+    def hauteur_transport(self):
+        """
+        Hauteur de translation entre colonnes : hauteur bras levé, relevée si la plus haute
+        pile possible l'impose.
+        """
+        if self.nb_palets_total is None:
+            return H_BRAS_LEVE
+        return max(H_BRAS_LEVE, self.hauteurs.clearance(self.nb_palets_total))
+
+    def hauteur_levage(self):
+        """
+        Hauteur de remontée après une saisie ou une dépose.
+        """
+        if self.nb_palets_total is None:
+            return H_LEVAGE
+        return max(H_LEVAGE, self.hauteurs.clearance(self.nb_palets_total))
+
+    def hauteur_passage(self, piles):
+        """
+        Hauteur minimale de passage d'un palet porté au-dessus des piles données
+        (nombres de palets).
+        """
+        return self.hauteurs.clearance(max(piles))
+
+    def planifier_deplacement(self, origine, destination, palets_origin_before, palets_destination_before):
+        """
+        Décompose un déplacement en étapes élémentaires.
+        :return: Liste de tuples (phase, action, argument) où action vaut
+                 "move" (argument = (x, y, z)),
+                 "jump" (argument = (x, y, z, hauteur de saut, hauteur limite))
+                 ou "suck" (argument = booléen).
+        """
+        if origine not in COLONNES or destination not in COLONNES:
+            raise ValueError("Erreur axe_id")
+        x_origine, y_origine = self.colonnes[origine]
+        x_destination, y_destination = self.colonnes[destination]
+        z_saisie = self.hauteur_palet(palets_origin_before)
+        z_depose = self.hauteur_palet(palets_destination_before + 1)
+
+        if self.motion_mode == MOTION_JUMP:
+            if self.nb_palets_total is None:
+                passage = H_BRAS_LEVE  # Troisième pile inconnue : hauteur de passage historique
+            else:
+                autre = self.nb_palets_total - palets_origin_before - palets_destination_before
+                passage = self.hauteur_passage([palets_origin_before, palets_destination_before, autre])
+            return [
+                ("travel", "jump", (x_origine, y_origine, z_saisie,
+                                    passage - min(self.cible_z, z_saisie), passage)),
+                ("suction", "suck", True),
+                ("travel", "jump", (x_destination, y_destination, z_depose,
+                                    passage - min(z_saisie, z_depose), passage)),
+                ("release", "suck", False),
+            ]
+
+        transport = self.hauteur_transport()
+        levage = self.hauteur_levage()
+        return [
+            ("travel", "move", (x_origine, y_origine, transport)),
+            ("descend", "move", (x_origine, y_origine, z_saisie)),
+            ("suction", "suck", True),
+            ("lift", "move", (x_origine, y_origine, levage)),
+            ("travel", "move", (x_destination, y_destination, transport)),
+            ("descend", "move", (x_destination, y_destination, z_depose)),
+            ("release", "suck", False),
+            ("lift", "move", (x_destination, y_destination, levage)),
+        ]
+
+    def _executer_plan(self, plan):
+        """
+        Exécute un plan issu de planifier_deplacement.
+        En mode pipeline, tout est empilé dans la file du Dobot et les seules attentes
+        portent sur les jalons de ventouse, avec un jalon d'avance, de sorte que les
+        mouvements s'enchaînent sans arrêt du bras.
+        """
+        if not self.connected:
+            raise RuntimeError(self.ERROR_NOT_CONNECTED)
+        pipeline = self.execution_mode == EXECUTION_PIPELINE
+        for step, (phase, action, argument) in enumerate(plan):
+            if not pipeline:
+                self._phase(phase)
+            if action == "suck":
+                # Ventouse mise en file : le mouvement suivant (ou attendre_fin_mouvements) l'attend
+                index = self.command_queue.push_suck(argument)
+                if not argument:
+                    self._deposes_en_attente.append((index, self._coup))
+                if pipeline:
+                    if self.telemetry is not None:
+                        self._jalons.append((index, argument, self._coup, self._debut_coup))
+                    if self._pending_milestone is not None:
+                        self.command_queue.wait_for(self._pending_milestone)
+                        self._confirmer_deposes(self._pending_milestone)
+                        self._mesurer_jalons(self._pending_milestone)
+                    self._pending_milestone = index
+                continue
+
+            self.appliquer_profil(PROFILE_BY_PHASE[phase])
+            if action == "jump":
+                x, y, z, jump, limit = argument
+                self._regler_saut(jump, limit)
+                mode = PTP_JUMP_XYZ
+            else:
+                x, y, z = argument
+                mode = PTP_MOVL_XYZ
+            self.cible_x, self.cible_y, self.cible_z = x, y, z
+            if pipeline:
+                self.command_queue.push_move(x, y, z, mode=mode)
+                continue
+            self.device._set_ptp_cmd(x, y, z, 0, mode=self.command_queue.ptp_mode(mode), wait=True)
+            self._confirmer_deposes()  # Toutes les commandes empilées avant ce mouvement sont exécutées
+            following = plan[step + 1] if step + 1 < len(plan) else None
+            point = None
+            if following is not None and following[1] == "suck":
+                point = POINT_GRASP if following[2] else POINT_RELEASE
+            self._verifier_position(x, y, z, point)
+
+    def appliquer_profil(self, name):
+        """
+        Règle la vitesse et l'accélération du profil de mouvement name (commande mise en file,
+        envoyée seulement si le réglage change).
+        """
+        speed = self.profils.get(name)
+        if speed is None or speed == self._speed:
+            return
+        self.command_queue.push_speed(*speed)
+        self._speed = speed
+
+    def _regler_saut(self, jump, limit):
+        """
+        Envoie les paramètres de saut (mis en file) s'ils ont changé.
+        """
+        params = (round(jump, 1), round(limit, 1))
+        if params != self._jump_params:
+            self.command_queue.push_jump_params(*params)
+            self._jump_params = params
+
+    @mesurer
+    def attendre_fin_mouvements(self):
+        """
+        Attend que toutes les commandes empilées dans la file du Dobot soient exécutées.
+        Les jalons encore mesurés sont attendus un à un pour dater leur exécution.
+        """
+        if self.command_queue is not None:
+            while self._jalons:
+                self.command_queue.wait_for(self._jalons[0][0])
+                self._mesurer_jalons(self._jalons[0][0])
+            self.command_queue.wait_idle()
+        self._pending_milestone = None
+        self._confirmer_deposes()
+
+    def hauteur_palet(self, nb_palet):
+        """
+        Retourne la hauteur de la ventouse pour une pile de nb_palet palets.
+        """
+        if 0 <= nb_palet < len(self._table_hauteurs):
+            return self._table_hauteurs[nb_palet]
+        raise ValueError(self.ERROR_INVALID_PALLET_COUNT)
 
     def move_vertical_switch(self, nb_palet):
         """
         Déplace le robot verticalement en fonction du nombre de palets.
         """
-        match nb_palet:
-            case 0:
-                print(f"H= {H_PALET0}")
-                self.cible_z = H_PALET0
-            case 1:
-                print(f"H= {H_PALET1}")
-                self.cible_z = H_PALET1
-            case 2:
-                print(f"H= {H_PALET2}")
-                self.cible_z = H_PALET2
-            case 3:
-                print(f"H= {H_PALET3}")
-                self.cible_z = H_PALET3
-            case 4:
-                print(f"H= {H_PALET4}")
-                self.cible_z = H_PALET4
-            case 5:
-                print(f"H= {H_PALET5}")
-                self.cible_z = H_PALET5
-            case _:
-                raise ValueError(self.ERROR_INVALID_PALLET_COUNT)
-            
+        self.cible_z = self.hauteur_palet(nb_palet)
+        LOGGER.debug("H= %s", self.cible_z)
+
     def calibrer_manuellement(self):
         """
         Lance la calibration manuelle du robot.
         """
+        from PyQt6.QtWidgets import QApplication
+        from BlocRobot.DobotCalibrate import DobotCalibrator
+
         app = QApplication(sys.argv)
         window = DobotCalibrator(self)
         window.show()
-        self.CALIB_Y = self.cible_y
-        self.CALIB_Z = self.cible_z
-        sys.exit(app.exec())
+        app.exec()
+        self.calibration["manuel"] = {"y": self.CALIB_Y, "z": self.CALIB_Z}
+        if self.calibration_path is not None:
+            ecrire_calibration({"manuel": self.calibration["manuel"]}, self.calibration_path)
+
+    def home_recent_valide(self, max_age=HOME_MAX_AGE, tolerance=HOME_POSE_TOLERANCE):
+        """
+        Indique si la dernière prise d'origine mémorisée peut être réutilisée :
+        même port, assez récente, et position actuelle identique à la dernière position mémorisée.
+        """
+        state = lire_etat(self.home_state_path)
+        if state.get("port") != self.port or "pose" not in state:
+            return False
+        if time.time() - state.get("homed_at", 0) > max_age:
+            return False
+        pose = self.device.pose()
+        return all(abs(pose[i] - state["pose"][i]) <= tolerance for i in range(3))
+
+    def memoriser_pose(self):
+        """
+        Mémorise la position actuelle avec la dernière prise d'origine, pour vérifier
+        au prochain lancement que le bras n'a pas bougé entre-temps.
+        """
+        state = lire_etat(self.home_state_path)
+        if state.get("port") != self.port:
+            return
+        try:
+            state["pose"] = list(self.device.pose()[:4])
+        except Exception as e:
+            LOGGER.warning("⚠️ Position non mémorisée : %s", e)
+            return
+        ecrire_etat(self.home_state_path, state)
 
     def _patch_home(self):
         """
-        Ajoute une méthode home à l'instance pydobot.Dobot, avec attente de fin de mouvement.
+        Ajoute une méthode home à l'instance pydobot.Dobot, qui rend la main dès la fin du mouvement.
         """
-        def dobot_home(_self, timeout=25):
+        from pydobot.message import Message
+        from pydobot.enums.CommunicationProtocolIDs import CommunicationProtocolIDs
+        from pydobot.enums.ControlValues import ControlValues
+
+        def dobot_home(_self, timeout=HOME_TIMEOUT):
             """
             Déplace le robot à la position home et attend la fin du mouvement.
+            La fin est détectée par l'index de file de la commande, ou à défaut
+            par la stabilisation de la position.
             :param timeout: Temps d'attente maximum pour le mouvement.
+            :return: True si la prise d'origine est terminée, False si le timeout est atteint.
             """
-            print("🏠 Exécution de la commande Home (code SET_HOME_CMD)...")
+            LOGGER.info("🏠 Exécution de la commande Home (code SET_HOME_CMD)...")
             msg = Message()
             msg.id = CommunicationProtocolIDs.SET_HOME_CMD
-            _self._send_command(msg)
-
-            # Attente active que le robot ait terminé (polling)
-            start_time = time.time()
-            while True:
-                if time.time() - start_time > timeout:
-                    print("⚠️ Timeout atteint.")
-                    break
-                time.sleep(0.2)  # petite pause pour éviter de spammer le port série
+            msg.ctrl = ControlValues.THREE  # Commande mise en file : la réponse contient son index
+            msg.params = bytearray([0, 0, 0, 0])
+            response = _self._send_command(msg)
+            try:
+                index = queued_index(response)
+            except Exception:
+                index = None
+
+            start_time = time.monotonic()
+            last_pose = None
+            while time.monotonic() - start_time < timeout:
+                time.sleep(HOME_POLL_INTERVAL)  # petite pause pour éviter de spammer le port série
+                if index is not None:
+                    if _self._get_queued_cmd_current_index() >= index:
+                        LOGGER.info("🏠 Home terminé en %.1f s", time.monotonic() - start_time)
+                        return True
+                    continue
+                pose = _self.pose()[:3]
+                if (last_pose is not None and time.monotonic() - start_time > HOME_MIN_DURATION
+                        and all(abs(pose[i] - last_pose[i]) < 0.5 for i in range(3))):
+                    LOGGER.info("🏠 Home terminé (position stable) en %.1f s", time.monotonic() - start_time)
+                    return True
+                last_pose = pose
+            LOGGER.warning("⚠️ Timeout atteint.")
+            return False
 
         self.device.home = dobot_home.__get__(self.device)
 
 
 
 if __name__ == "__main__":
+    from BlocAlgo.HanoiIterative import HanoiIterative
+
+    configurer_logs()
     robot = DobotControl()
     print("Phase d'initialisation du robot...")
     robot.execute_init()
@@ -0,0 +1,101 @@
+import struct
+import time
+
+QUEUE_POLL_INTERVAL = 0.02  # Intervalle (s) entre deux lectures de l'index de la file
+QUEUE_TIMEOUT = 30          # Attente maximale (s) d'un jalon de la file
+
+# Modes PTP (mêmes valeurs que pydobot.enums.PTPMode)
+PTP_JUMP_XYZ = 0
+PTP_MOVL_XYZ = 2
+
+
+def queued_index(response):
+    """
+    Extrait l'index de file retourné par le Dobot pour une commande mise en file.
+    """
+    params = bytes(response.params)
+    if len(params) >= 8:
+        return struct.unpack_from("<Q", params, 0)[0]
+    return struct.unpack_from("<I", params, 0)[0]
+
+
+class DobotCommandQueue:
+    """
+    Pilote la file de commandes embarquée du Dobot : les commandes sont empilées
+    sans attendre leur exécution, et seuls certains jalons (index de file) sont attendus.
+    """
+    def __init__(self, device):
+        """
+        :param device: Instance pydobot.Dobot (ou compatible).
+        """
+        self.device = device
+        self.last_index = None  # Index de la dernière commande empilée
+        # pydobot attend une énumération PTPMode : importée seulement pour un Dobot réel
+        self._ptp_enum = None
+        if type(device).__module__.startswith("pydobot"):
+            from pydobot.enums import PTPMode
+            self._ptp_enum = PTPMode
+        # Horloge et attente du Dobot s'il les fournit (temps simulé), sinon temps réel
+        self._now = getattr(device, "now", time.monotonic)
+        self._sleep = getattr(device, "sleep", time.sleep)
+
+    def ptp_mode(self, mode):
+        """
+        Convertit un mode PTP (PTP_JUMP_XYZ, PTP_MOVL_XYZ) dans le type attendu par le Dobot.
+        """
+        return self._ptp_enum(mode) if self._ptp_enum is not None else mode
+
+    def push_move(self, x, y, z, r=0, mode=PTP_MOVL_XYZ):
+        """
+        Empile un déplacement PTP et retourne son index de file.
+        """
+        response = self.device._set_ptp_cmd(x, y, z, r, mode=self.ptp_mode(mode), wait=False)
+        return self._record(response)
+
+    def push_jump_params(self, jump, limit):
+        """
+        Empile les paramètres de saut (hauteur de saut, hauteur limite) et retourne leur index de file.
+        """
+        response = self.device._set_ptp_jump_params(jump, limit)
+        return self._record(response)
+
+    def push_speed(self, velocity, acceleration):
+        """
+        Empile la vitesse et l'accélération cartésiennes et retourne leur index de file.
+        """
+        response = self.device._set_ptp_coordinate_params(velocity, acceleration)
+        return self._record(response)
+
+    def push_suck(self, enable):
+        """
+        Empile l'activation ou la désactivation de la ventouse et retourne son index de file.
+        """
+        response = self.device._set_end_effector_suction_cup(enable)
+        return self._record(response)
+
+    def current_index(self):
+        """
+        Retourne l'index de la dernière commande exécutée par le Dobot.
+        """
+        return self.device._get_queued_cmd_current_index()
+
+    def wait_for(self, index, timeout=QUEUE_TIMEOUT):
+        """
+        Attend que la commande d'index donné soit exécutée.
+        """
+        start = self._now()
+        while self.current_index() < index:
+            if self._now() - start > timeout:
+                raise TimeoutError(f"Index de file {index} non atteint après {timeout} s")
+            self._sleep(QUEUE_POLL_INTERVAL)
+
+    def wait_idle(self, timeout=QUEUE_TIMEOUT):
+        """
+        Attend que toutes les commandes empilées soient exécutées.
+        """
+        if self.last_index is not None:
+            self.wait_for(self.last_index, timeout)
+
+    def _record(self, response):
+        self.last_index = queued_index(response)
+        return self.last_index
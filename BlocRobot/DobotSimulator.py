@@ -0,0 +1,239 @@
+import math
+import struct
+import time
+
+# Identifiants des commandes du protocole Dobot utilisées par DobotControl
+# (mêmes valeurs que pydobot.enums.CommunicationProtocolIDs)
+CMD_SET_HOME = 31
+CMD_SUCTION_CUP = 62
+CMD_PTP_COORDINATE_PARAMS = 81
+CMD_PTP_JUMP_PARAMS = 82
+CMD_PTP_COMMON_PARAMS = 83
+CMD_PTP = 84
+CMD_QUEUED_CURRENT_INDEX = 246
+
+# Modes PTP (mêmes valeurs que pydobot.enums.PTPMode)
+PTP_JUMP_XYZ = 0
+PTP_MOVJ_XYZ = 1
+PTP_MOVL_XYZ = 2
+
+# Modèle cinématique par défaut (valeurs fixées par pydobot à la connexion)
+DEFAULT_VELOCITY = 200       # Vitesse cartésienne (mm/s)
+DEFAULT_ACCELERATION = 200   # Accélération cartésienne (mm/s²)
+DEFAULT_JUMP = (10, 200)     # Hauteur de saut, hauteur limite (mm)
+SERIAL_LATENCY = 0.008       # Aller-retour d'une commande sur la liaison série (s)
+SUCTION_TIME = 0.1           # Durée d'activation / désactivation de la ventouse (s)
+HOME_TIME = 12.0             # Durée d'une prise d'origine (s)
+HOME_POSE = (250.0, 0.0, 50.0, 0.0)
+
+
+def segment_duration(distance, velocity, acceleration):
+    """
+    Durée d'un déplacement à profil de vitesse trapézoïdal (triangulaire si trop court
+    pour atteindre la vitesse de croisière), départ et arrivée à l'arrêt.
+    """
+    if distance <= 0:
+        return 0.0
+    if distance >= velocity ** 2 / acceleration:
+        return distance / velocity + velocity / acceleration
+    return 2 * math.sqrt(distance / acceleration)
+
+
+class SimulatedResponse:
+    """
+    Réponse du Dobot simulé : params contient l'index de file (uint64) pour les commandes en file.
+    """
+    def __init__(self, index=None, params=None):
+        if params is None:
+            params = struct.pack("<Q", index) if index is not None else b""
+        self.params = bytearray(params)
+
+
+class SimulatedDobot:
+    """
+    Dobot simulé en mémoire, compatible avec le sous-ensemble de l'API pydobot.Dobot
+    utilisé par DobotControl. Les commandes passent par une file dont l'exécution suit
+    un modèle cinématique (distance, vitesse, accélération).
+    Avec time_scale=None, le temps est virtuel (exécution instantanée, horloge simulée) ;
+    sinon l'horloge suit le temps réel multiplié par time_scale (1 = temps réel).
+    """
+    def __init__(self, port="simulation", time_scale=None, serial_latency=SERIAL_LATENCY):
+        self.port = port
+        self.time_scale = time_scale
+        self.serial_latency = serial_latency
+        self.velocity = DEFAULT_VELOCITY
+        self.acceleration = DEFAULT_ACCELERATION
+        self.velocity_ratio = 100
+        self.acceleration_ratio = 100
+        self.jump_height, self.jump_limit = DEFAULT_JUMP
+        self.suction = False
+        self.closed = False
+        self.commands_sent = 0           # Nombre de commandes reçues sur la "liaison série"
+        self.events = []                 # Historique (fin, type, cible) des commandes exécutées
+        self._clock = 0.0
+        self._t0 = time.monotonic()
+        self._index = 0                  # Dernier index de file attribué
+        self._queue = []                 # Commandes en file : (index, début, fin, départ, arrivée)
+        self._start_pose = HOME_POSE     # Position de départ de la commande en cours
+        self._target_pose = HOME_POSE    # Position finale de la dernière commande en file
+        self._busy_until = 0.0
+        self._done_index = 0
+        self._done_pose = HOME_POSE
+
+    # ----- Horloge -----
+
+    def now(self):
+        """
+        Heure de la simulation (s).
+        """
+        if self.time_scale:
+            return (time.monotonic() - self._t0) * self.time_scale
+        return self._clock
+
+    def sleep(self, seconds):
+        """
+        Attend seconds secondes de temps simulé.
+        """
+        if seconds <= 0:
+            return
+        if self.time_scale:
+            time.sleep(seconds / self.time_scale)
+        else:
+            self._clock += seconds
+
+    # ----- API pydobot -----
+
+    def move_to(self, x, y, z, r, wait=False):
+        self._set_ptp_cmd(x, y, z, r, mode=PTP_MOVL_XYZ, wait=wait)
+
+    def pose(self):
+        x, y, z, r = self._current_pose()
+        return x, y, z, r, 0.0, 0.0, 0.0, 0.0
+
+    def suck(self, enable):
+        self._set_end_effector_suction_cup(enable)
+
+    def speed(self, velocity=100., acceleration=100.):
+        self._set_ptp_common_params(velocity, acceleration)
+        self._set_ptp_coordinate_params(velocity, acceleration)
+
+    def home(self):
+        response = self._enqueue("home", HOME_POSE, HOME_TIME)
+        self._wait_index(struct.unpack_from("<Q", response.params)[0])
+
+    def close(self):
+        self.closed = True
+
+    def _set_ptp_cmd(self, x, y, z, r, mode, wait):
+        target = (float(x), float(y), float(z), float(r))
+        mode = getattr(mode, "value", mode)  # Accepte aussi l'énumération pydobot
+        duration = self._motion_duration(self._target_pose, target, mode)
+        response = self._enqueue("jump" if mode == PTP_JUMP_XYZ else "move", target, duration)
+        if wait:
+            self._wait_index(struct.unpack_from("<Q", response.params)[0])
+        return response
+
+    def _set_end_effector_suction_cup(self, enable=False):
+        return self._enqueue("suck", bool(enable), SUCTION_TIME)
+
+    def _set_ptp_jump_params(self, jump, limit):
+        self.jump_height, self.jump_limit = float(jump), float(limit)
+        return self._enqueue("params", None, 0.0)
+
+    def _set_ptp_common_params(self, velocity, acceleration):
+        self.velocity_ratio, self.acceleration_ratio = float(velocity), float(acceleration)
+        return self._enqueue("params", None, 0.0)
+
+    def _set_ptp_coordinate_params(self, velocity, acceleration):
+        self.velocity, self.acceleration = float(velocity), float(acceleration)
+        return self._enqueue("params", None, 0.0)
+
+    def _get_queued_cmd_current_index(self):
+        self._serial_round_trip()
+        self._update()
+        return self._done_index
+
+    def _send_command(self, msg, wait=False):
+        """
+        Traite un message brut (utilisé par le patch home et les requêtes de file).
+        """
+        if msg.id == CMD_QUEUED_CURRENT_INDEX:
+            return SimulatedResponse(self._get_queued_cmd_current_index())
+        if msg.id == CMD_SET_HOME:
+            response = self._enqueue("home", HOME_POSE, HOME_TIME)
+        else:
+            raise ValueError(f"Commande Dobot non prise en charge par le simulateur : id {msg.id}")
+        if wait:
+            self._wait_index(struct.unpack_from("<Q", response.params)[0])
+        return response
+
+    # ----- Modèle -----
+
+    def _effective_velocity(self):
+        return self.velocity * self.velocity_ratio / 100, self.acceleration * self.acceleration_ratio / 100
+
+    def _motion_duration(self, start, target, mode):
+        """
+        Durée d'un mouvement PTP. Un saut (JUMP) monte, translate et descend
+        en un seul profil de vitesse, sans arrêt intermédiaire.
+        """
+        velocity, acceleration = self._effective_velocity()
+        if mode == PTP_JUMP_XYZ:
+            top = min(max(start[2], target[2]) + self.jump_height, max(self.jump_limit, start[2], target[2]))
+            horizontal = math.dist(start[:2], target[:2])
+            distance = (top - start[2]) + horizontal + (top - target[2])
+        else:
+            distance = math.dist(start[:3], target[:3])
+        return segment_duration(distance, velocity, acceleration)
+
+    def _serial_round_trip(self):
+        self.commands_sent += 1
+        self.sleep(self.serial_latency)
+
+    def _enqueue(self, kind, target, duration):
+        self._serial_round_trip()
+        self._update()
+        self._index += 1
+        start = max(self.now(), self._busy_until)
+        end = start + duration
+        self._busy_until = end
+        pose_target = target if kind in ("move", "jump", "home") else self._target_pose
+        self._queue.append((self._index, start, end, self._target_pose, pose_target, kind, target))
+        self._target_pose = pose_target
+        return SimulatedResponse(self._index)
+
+    def _update(self):
+        """
+        Retire de la file les commandes terminées à l'heure courante.
+        """
+        now = self.now()
+        while self._queue and self._queue[0][2] <= now:
+            index, _, end, _, pose_target, kind, target = self._queue.pop(0)
+            self._done_index = index
+            self._done_pose = pose_target
+            if kind == "suck":
+                self.suction = target
+            if kind != "params":
+                self.events.append((end, kind, target))
+
+    def _wait_index(self, index):
+        while self._done_index < index:
+            pending = [entry for entry in self._queue if entry[0] <= index]
+            if pending:
+                self.sleep(max(pending[-1][2] - self.now(), 0))
+            self._update()
+
+    def _current_pose(self):
+        """
+        Position à l'heure courante, interpolée linéairement sur la commande en cours.
+        """
+        self._serial_round_trip()
+        self._update()
+        if not self._queue:
+            return self._done_pose
+        _, start, end, origin, target, _, _ = self._queue[0]
+        now = self.now()
+        if now <= start or end <= start:
+            return origin
+        ratio = min((now - start) / (end - start), 1.0)
+        return tuple(o + (t - o) * ratio for o, t in zip(origin, target))
@@ -0,0 +1,131 @@
+import json
+import logging
+import os
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".hanoi", "execution_journal.jsonl")
+
+
+def lire_journal(path=JOURNAL_PATH):
+    """
+    Lit le journal d'exécution et retourne l'état de la dernière partie, ou None si
+    aucun journal n'existe. Une dernière ligne tronquée (coupure pendant l'écriture) est ignorée.
+    :return: Dictionnaire {"nb_palets", "total_moves", "completed", "done", "started"} où
+             completed est le nombre de coups consécutifs terminés depuis le premier.
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    header = None
+    completed = 0
+    done = False
+    try:
+        with open(path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if "nb_palets" in entry:
+                    header = entry
+                elif entry.get("done"):
+                    done = True
+                elif entry.get("move") == completed + 1:
+                    completed += 1
+    except OSError as e:
+        LOGGER.warning("⚠️ Journal d'exécution illisible (%s) : %s", path, e)
+        return None
+    if header is None:
+        return None
+    return {
+        "nb_palets": header["nb_palets"],
+        "total_moves": header["total_moves"],
+        "started": header.get("started"),
+        "completed": completed,
+        "done": done or completed >= header["total_moves"],
+    }
+
+
+def partie_a_reprendre(path=JOURNAL_PATH):
+    """
+    Retourne l'état de la dernière partie si elle a été interrompue après au moins un coup, sinon None.
+    """
+    etat = lire_journal(path)
+    if etat is None or etat["done"] or etat["completed"] == 0:
+        return None
+    return etat
+
+
+class ExecutionJournal:
+    """
+    Journal des coups terminés par le robot, en ajout seul : chaque ligne est écrite
+    puis forcée sur disque (fsync) avant de passer au coup suivant, de sorte qu'une
+    interruption (Ctrl + C, erreur série, coupure de courant) ne perd aucun coup terminé.
+    """
+    def __init__(self, path=JOURNAL_PATH):
+        """
+        :param path: Fichier du journal (JSON Lines).
+        """
+        self.path = path
+        self._file = None
+
+    def commencer(self, nb_palets, total_moves):
+        """
+        Démarre une nouvelle partie : le journal précédent est remplacé.
+        """
+        self.close()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._ecrire({"nb_palets": nb_palets, "total_moves": total_moves, "started": time.time()})
+        self._synchroniser_dossier(directory)
+
+    def reprendre(self):
+        """
+        Rouvre le journal de la partie interrompue pour y ajouter les coups suivants.
+        """
+        self.close()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def enregistrer(self, coup, origine, destination):
+        """
+        Enregistre un coup terminé.
+        """
+        self._ecrire({"move": coup, "origin": origine, "destination": destination, "t": time.time()})
+
+    def terminer(self):
+        """
+        Marque la partie comme terminée et ferme le journal.
+        """
+        self._ecrire({"done": True, "t": time.time()})
+        self.close()
+
+    def close(self):
+        """
+        Ferme le fichier du journal.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _ecrire(self, entry):
+        if self._file is None:
+            raise RuntimeError("Journal d'exécution non ouvert")
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    @staticmethod
+    def _synchroniser_dossier(directory):
+        """
+        Force l'écriture de l'entrée du fichier dans le dossier (POSIX uniquement).
+        """
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
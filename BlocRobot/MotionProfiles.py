@@ -0,0 +1,53 @@
+import json
+import logging
+import os
+
+LOGGER = logging.getLogger(__name__)
+
+# Profils de mouvement nommés : (vitesse cartésienne mm/s, accélération cartésienne mm/s²)
+PROFILE_TRAVEL = "travel"      # Translations entre colonnes, bras levé
+PROFILE_APPROACH = "approach"  # Descente finale sur un palet ou une pile
+PROFILE_LIFT = "lift"          # Remontée après saisie ou dépose
+
+DEFAULT_SPEED = (200, 200)     # Réglage appliqué par pydobot à la connexion
+
+DEFAULT_PROFILES = {
+    PROFILE_TRAVEL: (320, 400),
+    PROFILE_APPROACH: (160, 300),
+    PROFILE_LIFT: (250, 400),
+}
+
+# Profil appliqué à chaque phase d'un déplacement (un saut est une translation)
+PROFILE_BY_PHASE = {
+    "travel": PROFILE_TRAVEL,
+    "descend": PROFILE_APPROACH,
+    "lift": PROFILE_LIFT,
+}
+
+PROFILES_PATH = os.path.join(os.path.expanduser("~"), ".hanoi", "motion_profiles.json")
+
+
+def charger_profils(path=PROFILES_PATH, defaults=DEFAULT_PROFILES):
+    """
+    Retourne les profils de mouvement : valeurs par défaut, remplacées par celles du fichier
+    JSON de l'installation s'il existe ({"travel": [vitesse, accélération], ...}).
+    """
+    profils = dict(defaults)
+    if path is None or not os.path.exists(path):
+        return profils
+    try:
+        with open(path, "r", encoding="utf-8") as profiles_file:
+            overrides = json.load(profiles_file)
+        for name, (velocity, acceleration) in overrides.items():
+            profils[name] = (float(velocity), float(acceleration))
+    except (OSError, ValueError, TypeError) as e:
+        LOGGER.warning("⚠️ Profils de mouvement illisibles dans %s, valeurs par défaut utilisées : %s", path, e)
+        return dict(defaults)
+    return profils
+
+
+def profils_uniformes(speed=DEFAULT_SPEED):
+    """
+    Retourne des profils identiques pour toutes les phases (comportement sans profils).
+    """
+    return {name: speed for name in DEFAULT_PROFILES}
@@ -0,0 +1,156 @@
+import json
+import os
+import time
+
+DEFAULT_TELEMETRY_PATH = os.path.join("telemetry", "moves.jsonl")  # Journal des durées par coup
+
+# Phases mesurées sur les jalons de ventouse de la file du Dobot (mode pipeline, pilote asynchrone)
+PHASE_PICK = "pick"     # Jusqu'à l'exécution de la saisie
+PHASE_PLACE = "place"   # Jusqu'à l'exécution de la dépose
+
+
+class MoveTelemetry:
+    """
+    Mesure la durée de chaque phase d'un déplacement (travel, descend, suction, lift,
+    release) sur une horloge monotone, écrit un enregistrement JSONL par coup et tient
+    à jour une estimation du temps restant (durées moyennes mesurées x coups restants).
+    Quand les commandes sont empilées dans la file du Dobot (mode pipeline, pilote asynchrone),
+    l'empilement ne dit rien du mouvement du bras : les phases sont alors délimitées par
+    l'exécution des jalons de ventouse (PHASE_PICK, PHASE_PLACE), datés par l'appelant (at).
+    """
+    def __init__(self, path=None, callback=None, total_moves=None, clock=time.monotonic, initial_done=0):
+        """
+        :param path: Fichier JSONL de sortie (None pour ne rien écrire).
+        :param callback: Fonction appelée avec l'enregistrement de chaque coup terminé.
+        :param total_moves: Nombre total de coups de la partie (pour l'ETA).
+        :param clock: Horloge monotone (ex. DobotControl.horloge pour le temps simulé).
+        :param initial_done: Coups déjà joués avant cette mesure (reprise d'une partie interrompue).
+        """
+        self.path = path
+        self.callback = callback
+        self.total_moves = total_moves
+        self.clock = clock
+        self.initial_done = initial_done
+        self.moves_done = 0      # Coups mesurés depuis la création (hors coups déjà joués)
+        self.phase_totals = {}   # Phase -> durée cumulée (s)
+        self.phase_counts = {}   # Phase -> nombre de coups où la phase apparaît
+        self.started_at = None   # Début du premier coup mesuré
+        self._file = None
+        self._move = None        # Coup en cours : (numéro, origine, destination, début)
+        self._phases = []        # Phases du coup en cours : [nom, début, durée]
+
+    def start_move(self, origine, destination, coup=None, at=None):
+        """
+        Démarre la mesure d'un coup.
+        :param coup: Numéro du coup (par défaut, compteur interne).
+        :param at: Date du début du coup (par défaut, maintenant).
+        """
+        now = self.clock() if at is None else at
+        if self.started_at is None:
+            self.started_at = now
+        if coup is None:
+            coup = self.initial_done + self.moves_done + 1
+        self._move = (coup, origine, destination, now)
+        self._phases = []
+
+    def phase(self, name, at=None):
+        """
+        Termine la phase en cours et démarre la phase name.
+        :param at: Date du changement de phase (par défaut, maintenant).
+        """
+        if self._move is None:
+            return
+        now = self.clock() if at is None else at
+        if self._phases:
+            self._phases[-1][2] = now - self._phases[-1][1]
+        self._phases.append([name, now, None])
+
+    def end_move(self, at=None):
+        """
+        Termine le coup en cours, met à jour les moyennes, écrit l'enregistrement et appelle le callback.
+        :param at: Date de fin du coup (par défaut, maintenant).
+        :return: L'enregistrement du coup (dictionnaire), ou None si aucun coup n'était en cours.
+        """
+        if self._move is None:
+            return None
+        now = self.clock() if at is None else at
+        if self._phases:
+            self._phases[-1][2] = now - self._phases[-1][1]
+        coup, origine, destination, start = self._move
+        self._move = None
+        self.moves_done += 1
+
+        # Durée par phase du coup (une phase peut apparaître deux fois, ex. travel)
+        durations = {}
+        for name, _, duration in self._phases:
+            durations[name] = durations.get(name, 0.0) + duration
+        for name, duration in durations.items():
+            self.phase_totals[name] = self.phase_totals.get(name, 0.0) + duration
+            self.phase_counts[name] = self.phase_counts.get(name, 0) + 1
+
+        record = {
+            "move": coup,
+            "origin": origine,
+            "destination": destination,
+            "start": start,
+            "duration": now - start,
+            "phases": [{"phase": name, "start": begin, "duration": duration}
+                       for name, begin, duration in self._phases],
+            "elapsed": now - self.started_at,
+            "remaining_moves": self.remaining_moves(),
+            "eta": self.eta(),
+        }
+        self._write(record)
+        if self.callback is not None:
+            self.callback(record)
+        return record
+
+    def mean_move_duration(self):
+        """
+        Durée moyenne d'un coup, somme des durées moyennes de chaque phase.
+        """
+        return sum(self.phase_totals[name] / self.phase_counts[name] for name in self.phase_totals)
+
+    def remaining_moves(self):
+        """
+        Nombre de coups restants, ou None si le nombre total est inconnu.
+        """
+        if self.total_moves is None:
+            return None
+        return max(self.total_moves - self.initial_done - self.moves_done, 0)
+
+    def eta(self):
+        """
+        Temps restant estimé (s), ou None tant qu'aucun coup n'a été mesuré ou que le total est inconnu.
+        """
+        remaining = self.remaining_moves()
+        if remaining is None or not self.moves_done:
+            return None
+        return self.mean_move_duration() * remaining
+
+    def summary(self):
+        """
+        Retourne la durée moyenne de chaque phase et d'un coup.
+        """
+        phases = {name: self.phase_totals[name] / self.phase_counts[name] for name in self.phase_totals}
+        return {"moves": self.moves_done, "mean_move": self.mean_move_duration() if phases else 0.0,
+                "phases": phases}
+
+    def close(self):
+        """
+        Ferme le fichier JSONL.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, record):
+        if self.path is None:
+            return
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
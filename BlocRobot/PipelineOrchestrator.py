@@ -0,0 +1,246 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from BlocAlgo.HanoiIterative import HanoiIterative
+from BlocRobot.DobotControl import PHOTO_POSE
+from BlocRobot.ExecutionJournal import ExecutionJournal, partie_a_reprendre, JOURNAL_PATH
+from BlocRobot.MoveTelemetry import MoveTelemetry
+from BlocCommun.RunProfiler import span
+
+LOGGER = logging.getLogger(__name__)
+
+PLAN_QUEUE_SIZE = 64   # Nombre maximal de mouvements générés d'avance
+
+# Étapes chronométrées d'une partie
+STAGE_CONNECT = "connect"          # Connexion série et prise d'origine
+STAGE_CAMERA = "camera_warmup"     # Ouverture et préchauffage de la caméra
+STAGE_TRAVEL = "travel"            # Déplacement du bras vers la position de photo
+STAGE_DETECT = "detect"            # Capture et comptage des palets
+STAGE_PLAN = "plan"                # Génération de tous les mouvements
+STAGE_EXECUTE = "execute"          # Exécution des mouvements par le robot
+STAGE_HOME = "home"                # Retour à la position de départ
+FIRST_MOVE = "first_move"          # Jalon : début du premier mouvement
+
+
+class MoveStream:
+    """
+    Génère les mouvements dans un thread producteur et les met à disposition dans une file
+    bornée : le robot commence le premier coup pendant que les suivants sont calculés.
+    """
+    def __init__(self, nb_palets, depart=0, maxsize=PLAN_QUEUE_SIZE, on_done=None):
+        """
+        :param nb_palets: Nombre de palets.
+        :param depart: Nombre de coups déjà joués (reprise).
+        :param on_done: Appelé dans le thread producteur une fois le dernier mouvement généré.
+        """
+        self.nb_palets = nb_palets
+        self.depart = depart
+        self.on_done = on_done
+        self._moves = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produire, name="plan-producer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Interrompt la génération (partie abandonnée).
+        """
+        self._stop.set()
+
+    def _produire(self):
+        try:
+            moves = HanoiIterative.iterer_mouvements(self.nb_palets, self.depart)
+            while True:
+                with span("BlocAlgo.iterer_mouvements"):  # Génération seule, hors attente de la file
+                    move = next(moves, None)
+                if move is None:
+                    break
+                if not self._put(move):
+                    return
+            if self.on_done is not None:
+                self.on_done()
+            self._put(None)
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._moves.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self):
+        while True:
+            item = self._moves.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+class PipelineOrchestrator:
+    """
+    Déroule une partie en recouvrant les étapes indépendantes : la caméra préchauffe pendant
+    la connexion et la prise d'origine, le plan est calculé pendant que le bras se déplace,
+    et l'exécution commence dès le premier mouvement généré. La durée de chaque étape et
+    le délai entre le lancement et le premier mouvement sont mesurés.
+    """
+    def __init__(self, robot_factory, processor_factory=None, detector=None, nb_palets=None,
+                 reprendre=False, journal_path=JOURNAL_PATH, telemetry_path=None,
+                 progress_callback=None, clock=time.perf_counter):
+        """
+        :param robot_factory: Crée et connecte le DobotControl.
+        :param processor_factory: Crée le CameraProcessor (nécessaire si nb_palets est None).
+        :param detector: Compte les palets à partir du CameraProcessor préchauffé.
+        :param nb_palets: Nombre de palets imposé, ou None pour le détecter.
+        :param reprendre: Reprend la partie interrompue du journal s'il y en a une.
+        :param progress_callback: Appelé avec chaque enregistrement de coup terminé (MoveTelemetry).
+        :param clock: Horloge des étapes (temps réel).
+        """
+        self.robot_factory = robot_factory
+        self.processor_factory = processor_factory
+        self.detector = detector
+        self.nb_palets = nb_palets
+        self.reprendre = reprendre
+        self.journal_path = journal_path
+        self.telemetry_path = telemetry_path
+        self.progress_callback = progress_callback
+        self.clock = clock
+        self.robot = None
+        self.timings = {}      # étape -> (début, fin) en secondes depuis le lancement
+        self._lock = threading.Lock()
+        self._launch = None
+
+    def run(self):
+        """
+        Joue la partie complète.
+        :return: Durée (s) de l'exécution des mouvements, sur l'horloge du robot.
+        """
+        self._launch = self.clock()
+        etat = partie_a_reprendre(self.journal_path) if self.reprendre else None
+        nb_palets, coups_faits = (etat["nb_palets"], etat["completed"]) if etat else (self.nb_palets, 0)
+        if nb_palets is None and (self.processor_factory is None or self.detector is None):
+            raise ValueError("Nombre de palets requis sans caméra")
+
+        processor = None
+        stream = None
+        if nb_palets is not None:
+            stream = self._planifier(nb_palets, coups_faits)  # Plan lancé avant la connexion : recouvrement garanti
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipeline") as pool:
+            robot_future = pool.submit(self._stage, STAGE_CONNECT, self.robot_factory)
+            camera_future = None
+            if nb_palets is None:
+                camera_future = pool.submit(self._stage, STAGE_CAMERA, self._prechauffer)
+            try:
+                self.robot = robot_future.result()
+                if camera_future is not None:
+                    self._stage(STAGE_TRAVEL, self.robot.move_to_and_check, *PHOTO_POSE)
+                    processor = camera_future.result()
+                    nb_palets = self._stage(STAGE_DETECT, self.detector, processor)
+                    if not nb_palets:
+                        raise RuntimeError("Aucun palet détecté")
+                    stream = self._planifier(nb_palets, coups_faits)
+                return self._executer(nb_palets, coups_faits, stream)
+            except BaseException:
+                if stream is not None:
+                    stream.stop()
+                if camera_future is not None and processor is None and camera_future.exception() is None:
+                    processor = camera_future.result()  # Caméra préchauffée mais inutilisée
+                raise
+            finally:
+                if processor is not None:
+                    processor.release_camera()
+                if self.robot is not None:
+                    self.robot.disconnect()
+
+    def _prechauffer(self):
+        processor = self.processor_factory()
+        if processor.open_camera():
+            processor.warm_up()
+        return processor
+
+    def _planifier(self, nb_palets, coups_faits):
+        start = self._elapsed()
+        return MoveStream(nb_palets, coups_faits,
+                          on_done=lambda: self._record(STAGE_PLAN, start, self._elapsed())).start()
+
+    def _executer(self, nb_palets, coups_faits, stream):
+        robot = self.robot
+        total_moves = 2 ** nb_palets - 1
+        robot.definir_nb_palets(nb_palets)
+        robot.telemetry = MoveTelemetry(self.telemetry_path, callback=self.progress_callback,
+                                        total_moves=total_moves, clock=robot.horloge, initial_done=coups_faits)
+        journal = ExecutionJournal(self.journal_path)
+        if coups_faits:
+            print(f"Reprise au coup {coups_faits + 1} : état des tours {HanoiIterative.etat_tours(nb_palets, coups_faits)}")
+            journal.reprendre()
+        else:
+            journal.commencer(nb_palets, total_moves)
+        robot.journal = journal
+
+        start = self._elapsed()
+        robot_start = robot.horloge()
+        for coup, origine, destination, palets_origin_before, palets_destination_before in stream:
+            if FIRST_MOVE not in self.timings:
+                now = self._elapsed()
+                self._record(FIRST_MOVE, now, now)
+            robot.realiser_deplacement(origine, destination, palets_origin_before, palets_destination_before, coup)
+        robot.attendre_fin_mouvements()
+        journal.terminer()
+        duration = robot.horloge() - robot_start
+        self._record(STAGE_EXECUTE, start, self._elapsed())
+        self._stage(STAGE_HOME, robot.return_to_home)
+        return duration
+
+    def _stage(self, name, func, *args):
+        """
+        Exécute une étape en la chronométrant.
+        """
+        start = self._elapsed()
+        try:
+            return func(*args)
+        finally:
+            self._record(name, start, self._elapsed())
+
+    def _elapsed(self):
+        return self.clock() - self._launch
+
+    def _record(self, name, start, end):
+        with self._lock:
+            self.timings[name] = (start, end)
+        LOGGER.debug("Étape %s : %.3f -> %.3f s", name, start, end)
+
+    def first_move_delay(self):
+        """
+        Délai (s) entre le lancement et le début du premier mouvement, ou None.
+        """
+        first = self.timings.get(FIRST_MOVE)
+        return first[0] if first is not None else None
+
+    def rapport(self):
+        """
+        Retourne les étapes chronométrées triées par début : liste de (étape, début, fin, durée).
+        """
+        with self._lock:
+            stages = sorted(self.timings.items(), key=lambda item: item[1][0])
+        return [(name, start, end, end - start) for name, (start, end) in stages]
+
+    def afficher_rapport(self):
+        """
+        Affiche le chronogramme des étapes (les étapes qui se recouvrent se chevauchent dans le temps).
+        """
+        print(f"\n{'Étape':<16}{'Début (s)':>10}{'Fin (s)':>10}{'Durée (s)':>11}")
+        for name, start, end, duration in self.rapport():
+            print(f"{name:<16}{start:>10.3f}{end:>10.3f}{duration:>11.3f}")
+        delay = self.first_move_delay()
+        if delay is not None:
+            print(f"Lancement -> premier mouvement : {delay:.3f} s")
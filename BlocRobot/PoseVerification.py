@@ -0,0 +1,95 @@
+import time
+
+# Modes de vérification de la position après un déplacement
+VERIFY_ALWAYS = "always"                # Après chaque déplacement
+VERIFY_GRASP_RELEASE = "grasp_release"  # Uniquement aux points de saisie et de dépose
+VERIFY_EVERY_N = "every_n"              # Un déplacement sur N
+VERIFY_NEVER = "never"                  # Jamais
+
+POINT_GRASP = "grasp"      # Descente sur un palet à saisir
+POINT_RELEASE = "release"  # Descente pour déposer un palet
+
+DEFAULT_TOLERANCE = 2      # Écart toléré (mm) sur chaque axe
+DEFAULT_SETTLE_TIME = 0.3  # Pause (s) avant lecture de la position
+
+
+class PoseVerificationPolicy:
+    """
+    Politique de vérification de la position du Dobot après un déplacement,
+    avec compteurs des vérifications effectuées et des écarts détectés.
+    """
+    def __init__(self, mode=VERIFY_ALWAYS, every_n=5, tolerance=DEFAULT_TOLERANCE,
+                 settle_time=DEFAULT_SETTLE_TIME):
+        """
+        :param mode: VERIFY_ALWAYS, VERIFY_GRASP_RELEASE, VERIFY_EVERY_N ou VERIFY_NEVER.
+        :param every_n: Période de vérification en mode VERIFY_EVERY_N.
+        :param tolerance: Écart maximal (mm) accepté sur chaque axe.
+        :param settle_time: Pause (s) avant la lecture de la position.
+        """
+        if mode not in (VERIFY_ALWAYS, VERIFY_GRASP_RELEASE, VERIFY_EVERY_N, VERIFY_NEVER):
+            raise ValueError(f"Mode de vérification inconnu : {mode}")
+        if mode == VERIFY_EVERY_N and every_n < 1:
+            raise ValueError("every_n doit être supérieur ou égal à 1")
+        self.mode = mode
+        self.every_n = every_n
+        self.tolerance = tolerance
+        self.settle_time = settle_time
+        self.reset_counters()
+
+    def reset_counters(self):
+        """
+        Remet à zéro les compteurs.
+        """
+        self.moves = 0          # Déplacements soumis à la politique
+        self.checks = 0         # Vérifications effectuées
+        self.deviations = 0     # Vérifications ayant détecté un écart
+        self.max_deviation = 0  # Plus grand écart mesuré (mm)
+
+    def should_verify(self, point=None):
+        """
+        Enregistre un déplacement et indique s'il doit être vérifié.
+        :param point: POINT_GRASP, POINT_RELEASE ou None pour un déplacement ordinaire.
+        """
+        self.moves += 1
+        if self.mode == VERIFY_ALWAYS:
+            return True
+        if self.mode == VERIFY_GRASP_RELEASE:
+            return point in (POINT_GRASP, POINT_RELEASE)
+        if self.mode == VERIFY_EVERY_N:
+            return self.moves % self.every_n == 0
+        return False
+
+    def check(self, target, pose):
+        """
+        Compare la position mesurée à la cible et met à jour les compteurs.
+        :param target: Tuple (x, y, z) attendu.
+        :param pose: Position retournée par le Dobot (x, y, z, ...).
+        :return: True si la position est dans la tolérance.
+        """
+        self.checks += 1
+        deviation = max(abs(pose[i] - target[i]) for i in range(3))
+        self.max_deviation = max(self.max_deviation, deviation)
+        if deviation > self.tolerance:
+            self.deviations += 1
+            return False
+        return True
+
+    def settle(self, sleep=time.sleep):
+        """
+        Laisse le bras se stabiliser avant la lecture de la position.
+        :param sleep: Fonction d'attente (permet le temps simulé).
+        """
+        if self.settle_time > 0:
+            sleep(self.settle_time)
+
+    def stats(self):
+        """
+        Retourne les compteurs sous forme de dictionnaire.
+        """
+        return {
+            "mode": self.mode,
+            "moves": self.moves,
+            "checks": self.checks,
+            "deviations": self.deviations,
+            "max_deviation": self.max_deviation,
+        }
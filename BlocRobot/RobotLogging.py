@@ -0,0 +1,115 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+# Niveaux par défaut par module : la trace de pydobot est désactivée
+DEFAULT_LEVEL = logging.INFO
+DEFAULT_LEVELS = {
+    "pydobot": logging.WARNING,
+}
+LOG_ENV_VAR = "HANOI_LOG"   # Ex. HANOI_LOG="INFO,BlocRobot.DobotControl=DEBUG,pydobot=DEBUG"
+CONSOLE_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formate chaque enregistrement en une ligne JSON (horodatage, niveau, module, message).
+    """
+    def format(self, record):
+        entry = {
+            "t": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def lire_niveaux(spec):
+    """
+    Interprète une spécification de niveaux "NIVEAU,module=NIVEAU,...".
+    :return: Tuple (niveau global ou None, dictionnaire module -> niveau).
+    """
+    niveau_global = None
+    niveaux = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, level = item.rpartition("=")
+        level = logging.getLevelName(level.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Niveau de log inconnu : {item}")
+        if name:
+            niveaux[name.strip()] = level
+        else:
+            niveau_global = level
+    return niveau_global, niveaux
+
+
+def pydobot_verbose():
+    """
+    Indique si la trace de pydobot (paramètre verbose) doit être activée.
+    """
+    return logging.getLogger("pydobot").isEnabledFor(logging.DEBUG)
+
+
+def configurer_logs(level=DEFAULT_LEVEL, levels=None, log_file=None):
+    """
+    Configure la journalisation de l'application : les modules écrivent dans une file
+    (QueueHandler), un thread dédié (QueueListener) formate et écrit sur la console et,
+    en option, dans un fichier JSON Lines. Les appels de log ne bloquent donc jamais
+    la boucle de pilotage du robot.
+    :param level: Niveau global.
+    :param levels: Dictionnaire module -> niveau (complète DEFAULT_LEVELS).
+    :param log_file: Fichier JSON Lines optionnel.
+    La variable d'environnement HANOI_LOG remplace ces valeurs.
+    """
+    global _listener
+    arreter_logs()
+
+    niveaux = dict(DEFAULT_LEVELS)
+    niveaux.update(levels or {})
+    env_level, env_levels = lire_niveaux(os.environ.get(LOG_ENV_VAR))
+    if env_level is not None:
+        level = env_level
+    niveaux.update(env_levels)
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT, datefmt="%H:%M:%S"))
+    handlers = [console]
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    for name, module_level in niveaux.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(arreter_logs)
+    return _listener
+
+
+def arreter_logs():
+    """
+    Vide la file de journalisation et arrête le thread d'écriture.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,66 @@
+# Valeurs par défaut, issues des hauteurs mesurées sur le plateau (palets imprimés en 3D)
+H_TABLE = -82            # Hauteur de la ventouse sur une colonne vide
+H_PALET_BASE = -55       # Hauteur de la ventouse sur une pile d'un palet
+PAS_PALET = 25           # Épaisseur d'un palet (écart entre deux hauteurs de pile)
+MARGE_PASSAGE = 15       # Marge au-dessus d'une pile lors du passage d'un palet porté
+Z_MAX_ATTEIGNABLE = 160  # Hauteur maximale atteignable par la ventouse au-dessus des colonnes
+
+
+class StackHeightModel:
+    """
+    Modèle des hauteurs de pile : hauteur de la ventouse pour une pile de n palets,
+    calculée à partir d'une hauteur de base et d'un pas (épaisseur de palet).
+    Les hauteurs sont précalculées dans des tables pour la boucle d'exécution.
+    """
+    def __init__(self, base_height=H_PALET_BASE, pitch=PAS_PALET, table_height=H_TABLE,
+                 max_height=Z_MAX_ATTEIGNABLE, margin=MARGE_PASSAGE):
+        """
+        :param base_height: Hauteur de la ventouse sur une pile d'un palet.
+        :param pitch: Épaisseur d'un palet.
+        :param table_height: Hauteur de la ventouse sur une colonne vide.
+        :param max_height: Hauteur maximale atteignable (limite le nombre de palets).
+        :param margin: Marge de passage au-dessus d'une pile avec un palet porté.
+        """
+        if pitch <= 0:
+            raise ValueError("Le pas entre palets doit être positif")
+        self.base_height = base_height
+        self.pitch = pitch
+        self.table_height = table_height
+        self.max_height = max_height
+        self.margin = margin
+
+        # Nombre maximal de palets : un palet porté doit encore pouvoir passer au-dessus de la pile
+        self.max_discs = max(int((max_height - margin - pitch - base_height) // pitch) + 1, 0)
+        self.heights = (table_height,) + tuple(
+            base_height + (n - 1) * pitch for n in range(1, self.max_discs + 1))
+        self.clearances = tuple(h + pitch + margin for h in self.heights)
+
+    @classmethod
+    def from_calibration(cls, calibration):
+        """
+        Construit le modèle à partir d'un dictionnaire de calibration
+        (clés facultatives : h_palet_base, pas_palet, h_table, z_max).
+        """
+        return cls(
+            base_height=calibration.get("h_palet_base", H_PALET_BASE),
+            pitch=calibration.get("pas_palet", PAS_PALET),
+            table_height=calibration.get("h_table", H_TABLE),
+            max_height=calibration.get("z_max", Z_MAX_ATTEIGNABLE),
+        )
+
+    def height(self, nb_palets):
+        """
+        Hauteur de la ventouse au sommet d'une pile de nb_palets palets.
+        """
+        if not 0 <= nb_palets <= self.max_discs:
+            raise ValueError(f"Nombre de palets invalide : {nb_palets} (maximum {self.max_discs})")
+        return self.heights[nb_palets]
+
+    def clearance(self, nb_palets):
+        """
+        Hauteur minimale de la ventouse pour faire passer un palet porté
+        au-dessus d'une pile de nb_palets palets.
+        """
+        if not 0 <= nb_palets <= self.max_discs:
+            raise ValueError(f"Nombre de palets invalide : {nb_palets} (maximum {self.max_discs})")
+        return self.clearances[nb_palets]
@@ -0,0 +1,318 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from BlocAlgo.HanoiIterative import HanoiIterative
+from BlocCommun.Calibration import lire_calibration, CALIBRATION_PATH
+from BlocRobot.DobotControl import (
+    DobotControl, ROBOT_STATE_DIR, CONNECT_TIMEOUT, PHOTO_POSE,
+    EXECUTION_BLOCKING, EXECUTION_PIPELINE, MOTION_SEGMENTS, MOTION_JUMP
+)
+from BlocRobot.ExecutionJournal import ExecutionJournal
+from BlocRobot.MoveTelemetry import MoveTelemetry
+from BlocRobot.RobotLogging import configurer_logs, pydobot_verbose
+
+LOGGER = logging.getLogger(__name__)
+
+MAX_CAMERAS = 4            # Index de caméra maximal sondé
+STATUS_REFRESH = 1.0       # Intervalle (s) maximal entre deux affichages du statut
+
+# États d'une station
+STATE_STARTING = "starting"
+STATE_DETECTING = "detecting"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_ERROR = "error"
+
+
+class Station:
+    """
+    Poste de jeu : un Dobot (port série) associé à une caméra.
+    """
+    def __init__(self, name, port=None, camera_index=None, simulation=False, state_dir=ROBOT_STATE_DIR):
+        """
+        :param name: Nom de la station (affichage et journal).
+        :param port: Port série du Dobot (None pour un Dobot simulé).
+        :param camera_index: Index de la caméra (None : nombre de palets imposé).
+        :param simulation: True pour utiliser un Dobot simulé.
+        :param state_dir: Dossier des fichiers d'état de la station (journal, prise d'origine,
+                          port, calibration).
+        """
+        self.name = name
+        self.port = port
+        self.camera_index = camera_index
+        self.simulation = simulation
+        self.state_dir = state_dir
+
+    def _state_file(self, prefix, extension):
+        return os.path.join(self.state_dir, f"{prefix}_{re.sub(r'[^A-Za-z0-9]+', '_', self.name)}{extension}")
+
+    def journal_path(self):
+        """
+        Journal d'exécution propre à la station.
+        """
+        return self._state_file("execution_journal", ".jsonl")
+
+    def home_state_path(self):
+        """
+        Dernière prise d'origine du Dobot de la station : une station ne réutilise jamais
+        la prise d'origine d'une autre.
+        """
+        return self._state_file("dobot_home", ".json")
+
+    def port_cache_path(self):
+        """
+        Dernier port valide du Dobot de la station.
+        """
+        return self._state_file("dobot_port", ".json")
+
+    def calibration_path(self):
+        """
+        Calibration propre à la station (python -m BlocVision.ColumnCalibration --output ...).
+        """
+        return self._state_file("calibration", ".json")
+
+    def lire_calibration(self, default_path=CALIBRATION_PATH):
+        """
+        Lit la calibration de la station, ou à défaut celle de l'installation.
+        :param default_path: Calibration utilisée si la station n'a pas de fichier propre.
+        """
+        path = self.calibration_path()
+        return lire_calibration(path if os.path.exists(path) else default_path)
+
+    def __repr__(self):
+        return f"Station({self.name!r}, port={self.port!r}, camera={self.camera_index!r})"
+
+
+def decouvrir_dobots(timeout=CONNECT_TIMEOUT):
+    """
+    Sonde tous les ports série en parallèle et retourne ceux où un Dobot répond.
+    Les connexions de test sont refermées : chaque station rouvre son port dans son processus.
+    """
+    import pydobot
+    from serial.tools import list_ports
+
+    port_names = [port.device for port in list_ports.comports()]
+    found = []
+    lock = threading.Lock()
+
+    def probe(port_name):
+        try:
+            device = pydobot.Dobot(port=port_name, verbose=pydobot_verbose())
+        except Exception:
+            return
+        device.close()
+        with lock:
+            found.append(port_name)
+
+    threads = [threading.Thread(target=probe, args=(name,), daemon=True) for name in port_names]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(deadline - time.monotonic(), 0))
+    with lock:
+        return sorted(found)
+
+
+def decouvrir_cameras(max_index=MAX_CAMERAS):
+    """
+    Retourne les index des caméras qui fournissent une image.
+    """
+    import cv2
+
+    cameras = []
+    for index in range(max_index):
+        cap = cv2.VideoCapture(index)
+        try:
+            if cap.isOpened() and cap.read()[0]:
+                cameras.append(index)
+        finally:
+            cap.release()
+    return cameras
+
+
+def associer_stations(ports, cameras):
+    """
+    Associe dans l'ordre chaque Dobot à une caméra. Les Dobots sans caméra restent utilisables
+    avec un nombre de palets imposé.
+    """
+    stations = []
+    for i, port in enumerate(ports):
+        camera_index = cameras[i] if i < len(cameras) else None
+        stations.append(Station(port, port=port, camera_index=camera_index))
+    return stations
+
+
+def obtenir_plan(plan_cache, nb_palets):
+    """
+    Retourne la liste des mouvements pour nb_palets palets depuis le cache partagé entre
+    les stations, en la calculant au premier besoin.
+    """
+    plan = plan_cache.get(nb_palets)
+    if plan is None:
+        plan = HanoiIterative(nb_palets).get_move_matrix()
+        plan_cache[nb_palets] = plan
+    return plan
+
+
+def detecter_palets(camera_index):
+    """
+    Compte les palets de la tour de départ avec la caméra de la station (sans validation manuelle).
+    """
+    from BlocVision.CameraProcessor import CameraProcessor
+
+    processor = CameraProcessor(camera_index=camera_index)
+    frame = processor.capture_image()
+    if frame is None:
+        raise RuntimeError(f"Aucune image de la caméra {camera_index}")
+    num_discs, _ = processor.detect_discs(frame, int(time.time()))
+    return num_discs
+
+
+def executer_station(station, nb_palets, plan_cache, status_queue, execution_mode, motion_mode):
+    """
+    Processus d'une station : connexion, détection, partie complète et retour à home.
+    Chaque étape est publiée dans status_queue sous forme de dictionnaire.
+    """
+    configurer_logs(level=logging.WARNING)
+
+    def publier(state, **values):
+        values.update(station=station.name, state=state, t=time.time())
+        status_queue.put(values)
+
+    robot = None
+    try:
+        publier(STATE_STARTING)
+        device = None
+        if station.simulation:
+            from BlocRobot.DobotSimulator import SimulatedDobot
+            device = SimulatedDobot(port=station.name)
+        robot = DobotControl(port=station.port, device=device, skip_recent_home=True,
+                             execution_mode=execution_mode, motion_mode=motion_mode,
+                             home_state_path=station.home_state_path(), port_cache_path=station.port_cache_path(),
+                             calibration=station.lire_calibration(), calibration_path=station.calibration_path())
+
+        if nb_palets is None:
+            publier(STATE_DETECTING)
+            robot.move_to_and_check(*PHOTO_POSE)  # Bras hors du champ de la caméra
+            nb_palets = detecter_palets(station.camera_index)
+        movements = obtenir_plan(plan_cache, nb_palets)
+        robot.definir_nb_palets(nb_palets)
+
+        def progression(record):
+            publier(STATE_RUNNING, nb_palets=nb_palets, move=record["move"], total=len(movements),
+                    eta=record["eta"], elapsed=record["elapsed"])
+
+        robot.telemetry = MoveTelemetry(callback=progression, total_moves=len(movements), clock=robot.horloge)
+        robot.journal = ExecutionJournal(station.journal_path())
+        robot.journal.commencer(nb_palets, len(movements))
+        publier(STATE_RUNNING, nb_palets=nb_palets, move=0, total=len(movements))
+        start = robot.horloge()
+        for coup, origine, destination, nb_origine, nb_destination in movements:
+            robot.realiser_deplacement(origine, destination, nb_origine, nb_destination, coup)
+        robot.attendre_fin_mouvements()
+        robot.journal.terminer()
+        robot.return_to_home()
+        publier(STATE_DONE, nb_palets=nb_palets, move=len(movements), total=len(movements),
+                duration=robot.horloge() - start)
+    except Exception as e:
+        publier(STATE_ERROR, error=str(e))
+    finally:
+        if robot is not None:
+            robot.disconnect()
+
+
+class StationManager:
+    """
+    Pilote plusieurs stations en parallèle depuis un processus de contrôle : un processus
+    de travail par station, un cache de plans partagé et une vue de statut agrégée.
+    """
+    def __init__(self, stations, nb_palets=None, execution_mode=EXECUTION_PIPELINE, motion_mode=MOTION_JUMP):
+        """
+        :param stations: Liste de Station.
+        :param nb_palets: Nombre de palets imposé (None : détection par la caméra de chaque station).
+        """
+        if not stations:
+            raise ValueError("Aucune station à piloter")
+        if nb_palets is None and any(station.camera_index is None for station in stations):
+            raise ValueError("Nombre de palets requis pour les stations sans caméra")
+        self.stations = stations
+        self.nb_palets = nb_palets
+        self.execution_mode = execution_mode
+        self.motion_mode = motion_mode
+        self.status = {station.name: {"state": STATE_STARTING} for station in stations}
+
+    def run(self, afficher=True):
+        """
+        Lance toutes les stations et agrège leur statut jusqu'à la fin de toutes les parties.
+        :return: Dernier statut de chaque station.
+        """
+        context = multiprocessing.get_context("spawn")
+        with context.Manager() as manager:
+            plan_cache = manager.dict()
+            status_queue = context.Queue()
+            processes = [
+                context.Process(target=executer_station, name=f"station-{station.name}",
+                                args=(station, self.nb_palets, plan_cache, status_queue,
+                                      self.execution_mode, self.motion_mode))
+                for station in self.stations
+            ]
+            for process in processes:
+                process.start()
+            LOGGER.info("%d stations démarrées", len(processes))
+
+            last_display = 0.0
+            while any(process.is_alive() for process in processes) or not status_queue.empty():
+                try:
+                    self.mettre_a_jour(status_queue.get(timeout=STATUS_REFRESH))
+                except queue.Empty:
+                    pass
+                if afficher and time.monotonic() - last_display >= STATUS_REFRESH:
+                    self.afficher_statut()
+                    last_display = time.monotonic()
+            for process in processes:
+                process.join()
+        if afficher:
+            self.afficher_statut()
+        return self.status
+
+    def mettre_a_jour(self, message):
+        """
+        Intègre un message de statut d'une station.
+        """
+        self.status[message.pop("station")] = message
+
+    def afficher_statut(self):
+        """
+        Affiche une ligne de statut par station.
+        """
+        print(f"\n{'Station':<16}{'État':<12}{'Coup':<12}{'ETA (s)':<10}")
+        for name, status in self.status.items():
+            move = f"{status['move']}/{status['total']}" if "total" in status else "-"
+            eta = f"{status['eta']:.0f}" if status.get("eta") is not None else "-"
+            state = status["state"] if status["state"] != STATE_ERROR else f"erreur : {status['error']}"
+            print(f"{name:<16}{state:<12}{move:<12}{eta:<10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pilote plusieurs stations Dobot + caméra en parallèle.")
+    parser.add_argument("--palets", type=int, default=None,
+                        help="Nombre de palets imposé ; par défaut, détection par la caméra de chaque station")
+    parser.add_argument("--simulation", type=int, default=0, metavar="N",
+                        help="Utilise N Dobots simulés au lieu des bras connectés")
+    parser.add_argument("--execution", choices=(EXECUTION_BLOCKING, EXECUTION_PIPELINE), default=EXECUTION_PIPELINE)
+    parser.add_argument("--trajectoire", choices=(MOTION_SEGMENTS, MOTION_JUMP), default=MOTION_JUMP)
+    args = parser.parse_args()
+
+    configurer_logs()
+    if args.simulation:
+        stations = [Station(f"sim-{i + 1}", simulation=True) for i in range(args.simulation)]
+    else:
+        stations = associer_stations(decouvrir_dobots(), decouvrir_cameras())
+    print(f"Stations : {stations}")
+    StationManager(stations, args.palets, args.execution, args.trajectoire).run()
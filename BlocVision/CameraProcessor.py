@@ -1,30 +1,96 @@
 import cv2
 import numpy as np
 import time
-import os
+from BlocVision.DetectionArchive import DetectionArchive, RetentionPolicy, DEFAULT_ARCHIVE_PATH
+from BlocCommun.RunProfiler import mesurer
 
 # Seuils utilisés pour filtrer les contours détectés
 CIRCULARITY_MIN = 0.8  # Seuil de circularité minimum pour considérer un contour comme un disque
 AREA_MIN = 100         # Aire minimale d’un contour
 MIN_DISTANCE = 2       # Distance minimale entre deux disques pour éviter les doublons
 
+# Paramètres du préchauffage adaptatif de la caméra
+WARMUP_MAX_FRAMES = 60          # Nombre maximal d'images lues avant d'abandonner la convergence
+WARMUP_TIMEOUT = 3.0            # Durée maximale (s) du préchauffage
+WARMUP_BRIGHTNESS_TOL = 0.01    # Variation relative de luminosité tolérée entre deux images
+WARMUP_SHARPNESS_TOL = 0.05     # Variation relative de netteté tolérée entre deux images
+WARMUP_STABLE_FRAMES = 2        # Nombre d'images consécutives stables requises
+WARMUP_MIN_BRIGHTNESS = 1.0     # Luminosité moyenne minimale : des images noires au démarrage ne convergent pas
+
+# Rétention par défaut de l'archive des détections
+ARCHIVE_MAX_RUNS = 500
+
+class DetectionSteps:
+    """
+    Étapes visuelles d'une détection, produites à la demande : seules les images
+    intermédiaires du traitement (niveaux de gris) sont conservées, et la version couleur
+    d'une étape n'est rendue que lorsqu'elle est consultée.
+    S'utilise comme une liste de tuples (titre, image BGR).
+    """
+    TITLES = ("Image brute", "Gris", "Flou", "Seuillage", "Fermeture morphologique",
+              "Contours initiaux", "Contours validés")
+
+    def __init__(self, frame, gray, blurred, thresholded, closed, contours, filtered):
+        self.frame = frame
+        self.gray_steps = {1: gray, 2: blurred, 3: thresholded, 4: closed}
+        self.contours = contours
+        self.filtered = filtered  # Liste de (centre, rayon, contour) retenus
+
+    def __len__(self):
+        return len(self.TITLES)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        index %= len(self)
+        return self.TITLES[index], self.image(index)
+
+    def image(self, index):
+        """
+        Rend l'image BGR d'une étape. L'image brute est retournée sans copie : ne pas la modifier.
+        """
+        if index == 0:
+            return self.frame
+        if index in self.gray_steps:
+            return cv2.cvtColor(self.gray_steps[index], cv2.COLOR_GRAY2BGR)
+        if index == 5:
+            contour_frame = self.frame.copy()
+            cv2.drawContours(contour_frame, self.contours, -1, (0, 255, 0), 2)
+            return contour_frame
+        final_frame = self.frame.copy()
+        for center, radius, contour in self.filtered:
+            cv2.drawContours(final_frame, [contour], -1, (0, 255, 0), 2)
+            cv2.circle(final_frame, center, 5, (255, 0, 0), -1)
+            cv2.putText(final_frame, f"R: {radius}", (center[0]+10, center[1]),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+        return final_frame
+
+
 class CameraProcessor:
     """
     Classe responsable de capturer ou charger des images,
     puis d'effectuer le traitement pour détecter les disques (palets).
     """
-    def __init__(self, camera_index=0, save_images=False, show_images=False):
+    def __init__(self, camera_index=0, save_images=False, show_images=False,
+                 save_intermediates=True, archive_path=DEFAULT_ARCHIVE_PATH):
         self.camera_index = camera_index      # Index de la caméra à utiliser
-        self.save_images = save_images        # Indique si les étapes doivent être sauvegardées en PNG
+        self.save_images = save_images        # Indique si les détections doivent être archivées
+        self.save_intermediates = save_intermediates  # Archive aussi les étapes intermédiaires
+        self.archive_path = archive_path      # Fichier d'archive des détections
+        self.archive = None                   # DetectionArchive ouverte à la première sauvegarde
         self.show_images = show_images        # Indique si les étapes doivent être affichées (option future)
         self.cap = None                       # Objet VideoCapture de OpenCV
+        self.warmup_duration = None           # Durée (s) du dernier préchauffage
+        self.warmup_frames = 0                # Nombre d'images lues lors du dernier préchauffage
+        self.warmed = False                   # Caméra ouverte et préchauffée : capture sans nouveau préchauffage
 
     def __del__(self):
         """
         Libère automatiquement la caméra si elle est encore ouverte.
         """
-        if self.cap is not None and self.cap.isOpened():
-            self.cap.release()
+        cap = getattr(self, "cap", None)  # __init__ peut ne pas être allé à son terme
+        if cap is not None and cap.isOpened():
+            cap.release()
             print("Ressource caméra libérée via __del__")
 
     def load_image_from_file(self, path):
@@ -37,77 +103,154 @@ class CameraProcessor:
             return None
         return frame
 
-    def capture_image(self):
+    def open_camera(self):
         """
-        Capture une image depuis la caméra après un court délai.
-        Retourne un frame valide ou None en cas d'échec.
+        Ouvre la caméra si elle ne l'est pas déjà.
+        Retourne True si la caméra est disponible.
+        """
+        if self.cap is None or not self.cap.isOpened():
+            self.cap = cv2.VideoCapture(self.camera_index)
+            self.warmed = False
+        return self.cap.isOpened()
+
+    def release_camera(self):
+        """
+        Libère la caméra si elle est ouverte.
+        """
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.warmed = False
+
+    @staticmethod
+    def frame_metrics(frame):
+        """
+        Calcule la luminosité moyenne et la netteté (variance du laplacien) d'une image.
         """
-        self.cap = cv2.VideoCapture(self.camera_index)
-        time.sleep(1)  # Laisse le temps à la caméra de démarrer
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        brightness = float(gray.mean())
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+        return brightness, sharpness
 
+    @mesurer
+    def warm_up(self, max_frames=WARMUP_MAX_FRAMES, timeout=WARMUP_TIMEOUT):
+        """
+        Lit des images jusqu'à ce que la luminosité et la netteté se stabilisent.
+        S'arrête au plus tard après max_frames images ou timeout secondes.
+        Retourne la dernière image lue, ou None en cas d'échec de lecture.
+        La durée réelle est conservée dans self.warmup_duration.
+        """
+        start = time.perf_counter()
+        previous = None
+        stable = 0
         frame = None
-        for _ in range(5):  # Prend quelques frames pour laisser le capteur se stabiliser
+        self.warmup_frames = 0
+
+        while self.warmup_frames < max_frames:
             ret, frame = self.cap.read()
             if not ret or frame is None:
-                print("Erreur : Impossible de capturer une image valide.")
-                self.cap.release()
-                self.cap = None
-                return None
+                frame = None
+                break
+            self.warmup_frames += 1
+
+            metrics = self.frame_metrics(frame)
+            if previous is not None and self._metrics_converged(previous, metrics):
+                stable += 1
+                if stable >= WARMUP_STABLE_FRAMES:
+                    break
+            else:
+                stable = 0
+            previous = metrics
+
+            if time.perf_counter() - start > timeout:
+                print("⚠️ Préchauffage caméra : délai maximal atteint sans convergence.")
+                break
+
+        self.warmup_duration = time.perf_counter() - start
+        self.warmed = frame is not None
+        print(f"Préchauffage caméra : {self.warmup_frames} images en {self.warmup_duration * 1000:.0f} ms")
+        return frame
+
+    @staticmethod
+    def _metrics_converged(previous, current):
+        """
+        Indique si la luminosité et la netteté ont cessé de varier entre deux images.
+        Une image noire (capteur pas encore actif) ne compte jamais comme stable.
+        """
+        (b0, s0), (b1, s1) = previous, current
+        if b1 < WARMUP_MIN_BRIGHTNESS:
+            return False
+        brightness_ok = abs(b1 - b0) <= WARMUP_BRIGHTNESS_TOL * max(b0, 1.0)
+        sharpness_ok = abs(s1 - s0) <= WARMUP_SHARPNESS_TOL * max(s0, 1.0)
+        return brightness_ok and sharpness_ok
 
-        self.cap.release()
-        self.cap = None
+    @mesurer
+    def capture_image(self, keep_open=False):
+        """
+        Capture une image depuis la caméra une fois le capteur stabilisé. Une caméra laissée
+        ouverte après un préchauffage (warm_up, keep_open=True) est lue directement.
+        :param keep_open: True pour laisser la caméra ouverte (capture suivante plus rapide).
+        Retourne un frame valide ou None en cas d'échec.
+        """
+        if not self.open_camera():
+            print("Erreur : Impossible d'ouvrir la caméra.")
+            self.release_camera()
+            return None
+
+        if self.warmed:
+            ret, frame = self.cap.read()
+            frame = frame if ret else None
+        else:
+            frame = self.warm_up()
+        if frame is None:
+            print("Erreur : Impossible de capturer une image valide.")
+            self.release_camera()
+            return None
+
+        if not keep_open:
+            self.release_camera()
         return frame if np.any(frame) else None
 
+    @mesurer
     def detect_discs(self, frame, detection_id):
         """
         Applique plusieurs étapes de traitement d’image pour détecter les palets circulaires.
-        Retourne le nombre de disques détectés et une liste des étapes visuelles.
+        Retourne le nombre de disques détectés et les étapes visuelles (DetectionSteps),
+        rendues en couleur seulement quand elles sont consultées.
         """
-        folder_name = f"detections/detection_{detection_id}"
-        os.makedirs(folder_name, exist_ok=True)
-
-        steps_to_display = []
+        archived = []  # Images encodées à archiver : (nom, octets PNG)
+        intermediates = self.save_images and self.save_intermediates
 
         # Étape 0 : Image brute
         if self.save_images:
-            cv2.imwrite(os.path.join(folder_name, "step_0_raw.png"), frame)
-        steps_to_display.append(("Image brute", frame.copy()))
+            archived.append(("step_0_raw", self._encode_png(frame)))
 
         # Étape 1 : Conversion en niveaux de gris
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        if self.save_images:
-            cv2.imwrite(os.path.join(folder_name, "step_1_gray.png"), gray)
-        steps_to_display.append(("Gris", cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)))
+        if intermediates:
+            archived.append(("step_1_gray", self._encode_png(gray)))
 
         # Étape 2 : Flou gaussien pour réduire le bruit
         blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        if self.save_images:
-            cv2.imwrite(os.path.join(folder_name, "step_2_blur.png"), blurred)
-        steps_to_display.append(("Flou", cv2.cvtColor(blurred, cv2.COLOR_GRAY2BGR)))
+        if intermediates:
+            archived.append(("step_2_blur", self._encode_png(blurred)))
 
         # Étape 3 : Seuillage adaptatif
         thresholded = cv2.adaptiveThreshold(
             blurred, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
             cv2.THRESH_BINARY_INV, 21, 10
         )
-        if self.save_images:
-            cv2.imwrite(os.path.join(folder_name, "step_3_threshold.png"), thresholded)
-        steps_to_display.append(("Seuillage", cv2.cvtColor(thresholded, cv2.COLOR_GRAY2BGR)))
+        if intermediates:
+            archived.append(("step_3_threshold", self._encode_png(thresholded)))
 
         # Étape 4 : Fermeture morphologique (combler les trous)
         kernel = np.ones((5, 5), np.uint8)
         closed = cv2.morphologyEx(thresholded, cv2.MORPH_CLOSE, kernel)
-        if self.save_images:
-            cv2.imwrite(os.path.join(folder_name, "step_4_closed.png"), closed)
-        steps_to_display.append(("Fermeture morphologique", cv2.cvtColor(closed, cv2.COLOR_GRAY2BGR)))
+        if intermediates:
+            archived.append(("step_4_closed", self._encode_png(closed)))
 
         # Étape 5 : Détection des contours
         contours, _ = cv2.findContours(closed, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
-        contour_frame = frame.copy()
-        cv2.drawContours(contour_frame, contours, -1, (0, 255, 0), 2)
-        if self.save_images:
-            cv2.imwrite(os.path.join(folder_name, "step_5_contours.png"), contour_frame)
-        steps_to_display.append(("Contours initiaux", contour_frame.copy()))
 
         # Étape 6 : Filtrage des contours selon circularité et surface
         valid_contours = []
@@ -128,23 +271,51 @@ class CameraProcessor:
             if not too_close:
                 filtered.append((center_i, radius_i, contour_i))
 
-        # Étape 8 : Affichage final
-        final_frame = frame.copy()
-        palets = []
-        for center, radius, contour in filtered:
-            palets.append((radius, center))
-            cv2.drawContours(final_frame, [contour], -1, (0, 255, 0), 2)
-            cv2.circle(final_frame, center, 5, (255, 0, 0), -1)
-            cv2.putText(final_frame, f"R: {radius}", (center[0]+10, center[1]),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+        # Étape 8 : Affichage final (rendu à la demande)
+        steps = DetectionSteps(frame, gray, blurred, thresholded, closed, contours, filtered)
+        if intermediates:
+            archived.append(("step_5_contours", self._encode_png(steps.image(5))))
+            archived.append(("step_6_validated_contours", self._encode_png(steps.image(6))))
+
+        # Trie les disques du plus petit au plus grand rayon
+        palets = sorted(((radius, center) for center, radius, _ in filtered), key=lambda d: d[0])
 
         if self.save_images:
-            cv2.imwrite(os.path.join(folder_name, "step_6_validated_contours.png"), final_frame)
-        steps_to_display.append(("Contours validés", final_frame.copy()))
+            metadata = {
+                "detection_id": detection_id,
+                "num_discs": len(palets),
+                "palets": [[radius, list(center)] for radius, center in palets],
+                "shape": list(frame.shape),
+            }
+            self.get_archive().append_run(detection_id, archived, metadata)
+        return len(palets), steps
 
-        # Trie les disques du plus petit au plus grand rayon
-        palets = sorted(palets, key=lambda d: d[0])
-        return len(palets), steps_to_display
+    def get_archive(self):
+        """
+        Ouvre (au premier appel) et retourne l'archive des détections.
+        """
+        if self.archive is None:
+            self.archive = DetectionArchive(self.archive_path, RetentionPolicy(max_runs=ARCHIVE_MAX_RUNS))
+        return self.archive
+
+    def load_archived_image(self, detection_id, name="step_0_raw"):
+        """
+        Relit une image archivée d'une détection, ou None si absente.
+        """
+        data = self.get_archive().read_image(detection_id, name)
+        if data is None:
+            return None
+        return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+
+    @staticmethod
+    def _encode_png(image):
+        """
+        Encode une image en PNG pour l'archive.
+        """
+        ok, buffer = cv2.imencode(".png", image)
+        if not ok:
+            raise ValueError("Encodage PNG impossible")
+        return buffer.tobytes()
 
     def classify_contour(self, contour):
         """
@@ -157,16 +328,6 @@ class CameraProcessor:
         circularity = (4 * np.pi * area) / (perimeter ** 2)
         return circularity > CIRCULARITY_MIN
 
-    def __del__(self):
-        """
-        Libère la caméra si elle est ouverte.
-        """
-        if self.cap is not None and self.cap.isOpened():
-            self.cap.release()
-            print("Ressource caméra libérée via __del__")
-        # Terminer le prgogramme et la commande du terminal
-        os.system("pkill -f 'python -m PyQt6'")
-
 
 # Si ce fichier est exécuté directement, il lance une détection simple à partir d'une image disque
 if __name__ == "__main__":
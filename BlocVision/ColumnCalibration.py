@@ -0,0 +1,192 @@
+import argparse
+import logging
+import math
+import time
+from BlocCommun.Calibration import lire_calibration, ecrire_calibration, CALIBRATION_PATH
+
+LOGGER = logging.getLogger(__name__)
+
+# Marqueurs ArUco (dictionnaire 4x4) : des marqueurs de référence à position connue dans le
+# repère du robot, et un marqueur au pied de chaque colonne
+ARUCO_DICTIONARY = "DICT_4X4_50"
+MARKER_SIZE = 30.0               # Côté imprimé des marqueurs (mm)
+REFERENCE_MARKERS = {            # identifiant -> centre (x, y) dans le repère robot (mm), angle (rad)
+    0: (150.0, 0.0, 0.0),
+    4: (280.0, -150.0, 0.0),
+    5: (280.0, 150.0, 0.0),
+}
+MIN_REFERENCE_MARKERS = 2        # Références détectées requises (pas d'extrapolation depuis un seul marqueur)
+COLUMN_MARKER_IDS = {1: 1, 2: 2, 3: 3}   # axe_id -> identifiant du marqueur
+MAX_REPROJECTION_ERROR = 2.0     # Écart maximal (mm) entre les coins de référence reprojetés et leur position
+MAX_SPACING_ERROR = 15.0         # Écart maximal (mm) entre l'espacement mesuré et l'espacement nominal
+NOMINAL_SPACING = 150.0          # Espacement nominal entre deux colonnes (mm)
+
+
+def _normalisation(points):
+    """
+    Similitude qui centre les points et ramène leur distance moyenne au centre à √2
+    (conditionnement de l'estimation). Retourne (matrice, inverse).
+    """
+    cx = sum(x for x, _ in points) / len(points)
+    cy = sum(y for _, y in points) / len(points)
+    distance = sum(math.dist((x, y), (cx, cy)) for x, y in points) / len(points) or 1.0
+    scale = math.sqrt(2) / distance
+    return ([[scale, 0, -scale * cx], [0, scale, -scale * cy], [0, 0, 1]],
+            [[1 / scale, 0, cx], [0, 1 / scale, cy], [0, 0, 1]])
+
+
+def _produit(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+
+
+def homographie(src, dst):
+    """
+    Calcule l'homographie 3x3 qui envoie les points src sur les points dst : exacte pour
+    4 points, au sens des moindres carrés au-delà (points normalisés, h33 = 1).
+    """
+    if len(src) < 4 or len(src) != len(dst):
+        raise ValueError("Au moins 4 paires de points sont nécessaires")
+    src_norm, _ = _normalisation(src)
+    dst_norm, dst_inverse = _normalisation(dst)
+    rows = []
+    for p, q in zip(src, dst):
+        x, y = appliquer_homographie(src_norm, p)
+        u, v = appliquer_homographie(dst_norm, q)
+        rows.append([x, y, 1, 0, 0, 0, -u * x, -u * y, u])
+        rows.append([0, 0, 0, x, y, 1, -v * x, -v * y, v])
+    # Équations normales (AᵀA) h = Aᵀb
+    n = 8
+    system = [[sum(row[i] * row[j] for row in rows) for j in range(n + 1)] for i in range(n)]
+    # Élimination de Gauss avec pivot partiel
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(system[r][col]))
+        if abs(system[pivot][col]) < 1e-12:
+            raise ValueError("Points dégénérés : homographie impossible")
+        system[col], system[pivot] = system[pivot], system[col]
+        for r in range(n):
+            if r != col:
+                factor = system[r][col] / system[col][col]
+                system[r] = [a - factor * b for a, b in zip(system[r], system[col])]
+    h = [system[i][n] / system[i][i] for i in range(n)] + [1.0]
+    matrix = _produit(_produit(dst_inverse, [h[0:3], h[3:6], h[6:9]]), src_norm)
+    return [[value / matrix[2][2] for value in row] for row in matrix]
+
+
+def appliquer_homographie(matrix, point):
+    """
+    Transforme un point (x, y) par une homographie.
+    """
+    x, y = point
+    w = matrix[2][0] * x + matrix[2][1] * y + matrix[2][2]
+    return ((matrix[0][0] * x + matrix[0][1] * y + matrix[0][2]) / w,
+            (matrix[1][0] * x + matrix[1][1] * y + matrix[1][2]) / w)
+
+
+def coins_marqueur(size=MARKER_SIZE):
+    """
+    Coins d'un marqueur dans son propre repère (mm), dans l'ordre ArUco :
+    haut-gauche, haut-droit, bas-droit, bas-gauche.
+    """
+    half = size / 2
+    return [(-half, half), (half, half), (half, -half), (-half, -half)]
+
+
+def coins_reference(pose, size=MARKER_SIZE):
+    """
+    Coins d'un marqueur de référence dans le repère du robot (mm).
+    :param pose: Centre (x, y) du marqueur et angle (rad).
+    """
+    x0, y0, theta = pose
+    cos_t, sin_t = math.cos(theta), math.sin(theta)
+    return [(x0 + cos_t * cx - sin_t * cy, y0 + sin_t * cx + cos_t * cy) for cx, cy in coins_marqueur(size)]
+
+
+def calculer_calibration(markers, marker_size=MARKER_SIZE, reference_markers=REFERENCE_MARKERS,
+                         column_ids=COLUMN_MARKER_IDS, min_references=MIN_REFERENCE_MARKERS):
+    """
+    Calcule la position des colonnes dans le repère du robot à partir des marqueurs détectés.
+    L'homographie image -> table (repère robot, mm) est ajustée sur les coins de tous les
+    marqueurs de référence détectés, puis les coins de chaque marqueur de colonne sont
+    ramenés dans le repère du robot.
+    :param markers: Dictionnaire identifiant -> 4 coins (x, y) en pixels, ordre ArUco.
+    :return: Dictionnaire de calibration ({"colonnes": {axe_id: [x, y]}, "dist_colonnes", ...}).
+    """
+    references = {marker_id: pose for marker_id, pose in reference_markers.items() if marker_id in markers}
+    if len(references) < min_references:
+        raise ValueError(f"Marqueurs de référence détectés : {sorted(references)} "
+                         f"(au moins {min_references} parmi {sorted(reference_markers)})")
+    missing = [marker_id for marker_id in column_ids.values() if marker_id not in markers]
+    if missing:
+        raise ValueError(f"Marqueurs non détectés : {missing}")
+
+    image_points, table_points = [], []
+    for marker_id, pose in references.items():
+        image_points += markers[marker_id]
+        table_points += coins_reference(pose, marker_size)
+    image_to_table = homographie(image_points, table_points)
+    error = max(math.dist(appliquer_homographie(image_to_table, p), q) for p, q in zip(image_points, table_points))
+    if error > MAX_REPROJECTION_ERROR:
+        raise ValueError(f"Marqueurs de référence incohérents : erreur de reprojection {error:.1f} mm")
+    LOGGER.info("Homographie ajustée sur %d marqueurs de référence (erreur %.2f mm)", len(references), error)
+
+    colonnes = {}
+    for axe_id, marker_id in column_ids.items():
+        corners = [appliquer_homographie(image_to_table, corner) for corner in markers[marker_id]]
+        colonnes[axe_id] = [round(sum(x for x, _ in corners) / 4, 1), round(sum(y for _, y in corners) / 4, 1)]
+
+    ordered = [colonnes[axe_id] for axe_id in sorted(colonnes)]
+    for (xa, ya), (xb, yb) in zip(ordered, ordered[1:]):
+        spacing = math.dist((xa, ya), (xb, yb))
+        if abs(spacing - NOMINAL_SPACING) > MAX_SPACING_ERROR:
+            raise ValueError(f"Espacement entre colonnes incohérent : {spacing:.1f} mm")
+
+    return {
+        "colonnes": {str(axe_id): position for axe_id, position in colonnes.items()},
+        "dist_colonnes": round(sum(x for x, _ in ordered) / len(ordered), 1),
+        "method": "aruco",
+        "references": sorted(references),
+        "reprojection_error": round(error, 2),
+        "calibrated_at": time.time(),
+    }
+
+
+def detecter_marqueurs(frame, dictionary=ARUCO_DICTIONARY):
+    """
+    Détecte les marqueurs ArUco d'une image.
+    :return: Dictionnaire identifiant -> 4 coins (x, y) en pixels.
+    """
+    import cv2
+
+    aruco = cv2.aruco
+    aruco_dict = aruco.getPredefinedDictionary(getattr(aruco, dictionary))
+    if hasattr(aruco, "ArucoDetector"):  # OpenCV >= 4.7
+        corners, ids, _ = aruco.ArucoDetector(aruco_dict, aruco.DetectorParameters()).detectMarkers(frame)
+    else:
+        corners, ids, _ = aruco.detectMarkers(frame, aruco_dict, parameters=aruco.DetectorParameters_create())
+    if ids is None:
+        return {}
+    return {int(marker_id): [tuple(map(float, point)) for point in corner.reshape(4, 2)]
+            for marker_id, corner in zip(ids.flatten(), corners)}
+
+
+def calibrer_depuis_camera(camera_index=0, path=CALIBRATION_PATH):
+    """
+    Capture une image, localise les marqueurs des colonnes et enregistre la calibration.
+    """
+    from BlocVision.CameraProcessor import CameraProcessor
+
+    processor = CameraProcessor(camera_index=camera_index)
+    frame = processor.capture_image()
+    if frame is None:
+        raise RuntimeError(f"Aucune image de la caméra {camera_index}")
+    calibration = calculer_calibration(detecter_marqueurs(frame))
+    return ecrire_calibration(calibration, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibration automatique des colonnes par marqueurs ArUco.")
+    parser.add_argument("--camera", type=int, default=0, help="Index de la caméra")
+    parser.add_argument("--output", default=CALIBRATION_PATH, help="Fichier de calibration")
+    args = parser.parse_args()
+    result = calibrer_depuis_camera(args.camera, args.output)
+    print(f"✅ Calibration enregistrée dans {args.output} : {result['colonnes']}")
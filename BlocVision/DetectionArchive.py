@@ -0,0 +1,451 @@
+import bisect
+import contextlib
+import json
+import os
+import struct
+import time
+import zlib
+
+try:
+    import fcntl  # Verrou inter-processus (POSIX)
+except ImportError:  # Windows : pas de verrou, un seul processus doit écrire l'archive
+    fcntl = None
+
+# Format de l'archive : un en-tête de fichier puis une suite de blocs (chunks).
+# Chaque bloc : en-tête fixe, nom (utf-8), charge utile, CRC32 de la charge utile.
+ARCHIVE_MAGIC = b"HDA1"
+DEFAULT_ARCHIVE_PATH = os.path.join("detections", "archive.hda")
+INDEX_SUFFIX = ".idx"
+LOCK_SUFFIX = ".lock"
+
+CHUNK_HEADER = struct.Struct("<4sQdHI")  # type, run_id, timestamp, taille du nom, taille de la charge
+CHUNK_CRC = struct.Struct("<I")
+KIND_IMAGE = b"IMG "                      # Image encodée (PNG) d'une étape de détection
+KIND_META = b"META"                       # Métadonnées JSON d'une détection (clôture le run)
+
+LEGACY_FOLDER_PREFIX = "detection_"
+
+
+class RetentionPolicy:
+    """
+    Politique de rétention de l'archive : nombre de runs, âge et taille maximums.
+    Une valeur None désactive le critère correspondant.
+    """
+    def __init__(self, max_runs=None, max_age_s=None, max_bytes=None, slack=0.25):
+        self.max_runs = max_runs      # Nombre maximal de runs conservés
+        self.max_age_s = max_age_s    # Âge maximal (s) d'un run
+        self.max_bytes = max_bytes    # Taille maximale (octets) de l'archive
+        self.slack = slack            # Marge tolérée avant compactage (évite de réécrire à chaque ajout)
+
+    def needs_compaction(self, runs, size, now):
+        """
+        Indique si l'archive dépasse la politique au-delà de la marge tolérée.
+        """
+        factor = 1 + self.slack
+        if self.max_runs is not None and len(runs) > self.max_runs * factor:
+            return True
+        if self.max_bytes is not None and size > self.max_bytes * factor:
+            return True
+        if self.max_age_s is not None and runs and now - runs[0]["timestamp"] > self.max_age_s * factor:
+            return True
+        return False
+
+    def select(self, runs, now):
+        """
+        Retourne les runs à conserver (triés par date) selon la politique.
+        """
+        kept = list(runs)
+        if self.max_age_s is not None:
+            kept = [run for run in kept if now - run["timestamp"] <= self.max_age_s]
+        if self.max_runs is not None:
+            kept = kept[-self.max_runs:] if self.max_runs > 0 else []
+        if self.max_bytes is not None:
+            total = 0
+            selected = []
+            for run in reversed(kept):
+                total += run["size"]
+                if total > self.max_bytes:
+                    break
+                selected.append(run)
+            kept = list(reversed(selected))
+        return kept
+
+
+class DetectionArchive:
+    """
+    Archive en ajout seul regroupant les détections (image brute, étapes
+    intermédiaires facultatives, métadonnées) dans un unique fichier par blocs.
+    Un index annexe (<archive>.idx, une ligne JSON par run, en ajout seul) permet l'accès
+    direct par identifiant ou par date. Plusieurs instances (tableau de bord, commande detect,
+    stations) peuvent écrire la même archive : chaque écriture se fait sous un verrou exclusif,
+    après relecture des runs ajoutés par les autres.
+    """
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH, retention=None):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.lock_path = path + LOCK_SUFFIX
+        self.retention = retention
+        self.runs = []          # Runs triés par date : dicts {run_id, timestamp, offset, size, chunks, meta}
+        self.by_id = {}         # run_id -> position du dernier run portant cet identifiant
+        self.end_offset = 0     # Fin de la dernière donnée valide du fichier
+        self._inode = None      # Identité du fichier indexé (change après un compactage)
+        self._load()
+
+    # ----- Ecriture -----
+
+    def append_run(self, run_id, images, metadata, timestamp=None):
+        """
+        Ajoute un run à la fin de l'archive et met à jour l'index.
+        :param run_id: Identifiant entier du run (ex. detection_id).
+        :param images: Liste de tuples (nom, octets encodés), l'image brute en premier.
+        :param metadata: Dictionnaire sérialisable en JSON.
+        :param timestamp: Date du run (time.time() par défaut).
+        """
+        timestamp = time.time() if timestamp is None else float(timestamp)
+        with self._verrou():
+            self._ensure_file()
+            self._synchroniser()  # Runs ajoutés ou compactage effectué par une autre instance
+            payload = bytearray()
+            chunks = {}
+            base = self.end_offset
+            for name, data in images:
+                chunks[name] = self._encode_chunk(payload, base, KIND_IMAGE, run_id, timestamp, name, data)
+            meta_bytes = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+            meta = self._encode_chunk(payload, base, KIND_META, run_id, timestamp, "meta", meta_bytes)
+
+            with open(self.path, "r+b") as archive:
+                archive.truncate(base)  # Élimine un éventuel bloc incomplet laissé par un crash
+                archive.seek(base)
+                archive.write(payload)
+                archive.flush()
+                os.fsync(archive.fileno())
+
+            run = {"run_id": int(run_id), "timestamp": timestamp, "offset": base,
+                   "size": len(payload), "chunks": chunks, "meta": meta}
+            self._insert_run(run)
+            self.end_offset = base + len(payload)
+            self._append_index(run)
+
+            if self.retention is not None and self.retention.needs_compaction(self.runs, self.end_offset, time.time()):
+                self._compacter(self.retention)
+        return run
+
+    def compact(self, policy):
+        """
+        Réécrit l'archive en ne conservant que les runs retenus par la politique.
+        Retourne le nombre de runs supprimés.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        with self._verrou():
+            self._synchroniser()
+            return self._compacter(policy)
+
+    def _compacter(self, policy):
+        kept = policy.select(self.runs, time.time())
+        removed = len(self.runs) - len(kept)
+        if removed == 0:
+            return 0
+
+        tmp_path = self.path + ".tmp"
+        with open(self.path, "rb") as source, open(tmp_path, "wb") as target:
+            target.write(ARCHIVE_MAGIC)
+            for run in kept:
+                source.seek(run["offset"])
+                target.write(source.read(run["size"]))
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(tmp_path, self.path)
+        self._lire()  # Nouvel inode : l'ancien index est écarté et reconstruit
+        return removed
+
+    # ----- Lecture -----
+
+    def __len__(self):
+        return len(self.runs)
+
+    def get_run(self, run_id):
+        """
+        Retourne l'entrée d'index du run, ou None s'il est absent.
+        """
+        position = self.by_id.get(int(run_id))
+        return None if position is None else self.runs[position]
+
+    def latest(self):
+        """
+        Retourne l'entrée d'index du run le plus récent, ou None si l'archive est vide.
+        """
+        return self.runs[-1] if self.runs else None
+
+    def find_runs(self, start=None, end=None):
+        """
+        Retourne les runs dont la date est comprise dans [start, end].
+        """
+        timestamps = [run["timestamp"] for run in self.runs]
+        lo = 0 if start is None else bisect.bisect_left(timestamps, start)
+        hi = len(self.runs) if end is None else bisect.bisect_right(timestamps, end)
+        return self.runs[lo:hi]
+
+    def nearest_run(self, timestamp):
+        """
+        Retourne le run dont la date est la plus proche de timestamp.
+        """
+        if not self.runs:
+            return None
+        timestamps = [run["timestamp"] for run in self.runs]
+        pos = bisect.bisect_left(timestamps, timestamp)
+        candidates = self.runs[max(pos - 1, 0):pos + 1]
+        return min(candidates, key=lambda run: abs(run["timestamp"] - timestamp))
+
+    def read_image(self, run_id, name):
+        """
+        Retourne les octets encodés de l'image name du run, ou None si absente.
+        """
+        return self._lire_bloc(run_id, name)
+
+    def read_metadata(self, run_id):
+        """
+        Retourne les métadonnées du run, ou None s'il est absent.
+        """
+        payload = self._lire_bloc(run_id)
+        return None if payload is None else json.loads(payload.decode("utf-8"))
+
+    # ----- Interne -----
+
+    @staticmethod
+    def _encode_chunk(buffer, base, kind, run_id, timestamp, name, data):
+        """
+        Ajoute un bloc au buffer et retourne (offset, taille) de sa charge utile dans le fichier.
+        """
+        name_bytes = name.encode("utf-8")
+        buffer += CHUNK_HEADER.pack(kind, int(run_id), timestamp, len(name_bytes), len(data))
+        buffer += name_bytes
+        data_offset = base + len(buffer)
+        buffer += data
+        buffer += CHUNK_CRC.pack(zlib.crc32(data))
+        return [data_offset, len(data)]
+
+    def _lire_bloc(self, run_id, name=None):
+        """
+        Lit la charge utile d'un bloc du run (ses métadonnées si name est None) sous verrou,
+        après relecture des modifications des autres instances (ajout, compactage).
+        Retourne None si le run ou le bloc est absent.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with self._verrou():
+            self._synchroniser()
+            run = self.get_run(run_id)
+            if run is None or (name is not None and name not in run["chunks"]):
+                return None
+            return self._read_payload(run["meta"] if name is None else run["chunks"][name])
+
+    def _read_payload(self, location):
+        """
+        Lit une charge utile et vérifie son CRC32.
+        """
+        offset, length = location
+        with open(self.path, "rb") as archive:
+            archive.seek(offset)
+            data = archive.read(length)
+            crc = archive.read(CHUNK_CRC.size)
+        if len(data) < length or len(crc) < CHUNK_CRC.size or CHUNK_CRC.unpack(crc)[0] != zlib.crc32(data):
+            raise ValueError(f"Bloc corrompu dans l'archive {self.path} (offset {offset})")
+        return data
+
+    @contextlib.contextmanager
+    def _verrou(self):
+        """
+        Verrou exclusif inter-processus sur l'archive (fichier <archive>.lock).
+        """
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(self.lock_path, "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _ensure_file(self):
+        if not os.path.exists(self.path):
+            with open(self.path, "wb") as archive:
+                archive.write(ARCHIVE_MAGIC)
+            self._lire()
+
+    def _synchroniser(self):
+        """
+        Met l'index en mémoire à jour avec le fichier (à appeler sous verrou).
+        """
+        stat = os.stat(self.path)
+        if stat.st_ino != self._inode:
+            self._lire()  # Archive remplacée par un compactage
+        elif stat.st_size > self.end_offset:
+            for run, _ in self._scan(self.end_offset):
+                self._insert_run(run)
+                self.end_offset = run["offset"] + run["size"]
+
+    def _insert_run(self, run):
+        if self.runs and run["timestamp"] < self.runs[-1]["timestamp"]:
+            timestamps = [r["timestamp"] for r in self.runs]
+            self.runs.insert(bisect.bisect_right(timestamps, run["timestamp"]), run)
+            self.by_id = {r["run_id"]: i for i, r in enumerate(self.runs)}
+        else:
+            self.runs.append(run)
+            self.by_id[run["run_id"]] = len(self.runs) - 1
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with self._verrou():
+            self._lire()
+
+    def _lire(self):
+        """
+        Charge l'index annexe puis indexe les blocs écrits après lui (ou tout le fichier).
+        """
+        with open(self.path, "rb") as archive:
+            if archive.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+                raise ValueError(f"Fichier d'archive invalide : {self.path}")
+        stat = os.stat(self.path)
+        self._inode = stat.st_ino
+        self.runs, self.by_id = [], {}
+        self.end_offset = len(ARCHIVE_MAGIC)
+
+        indexed = self._read_index(stat.st_size)
+        for run in indexed or []:
+            self._insert_run(run)
+            self.end_offset = max(self.end_offset, run["offset"] + run["size"])
+        missing = []
+        for run, _ in self._scan(self.end_offset):
+            self._insert_run(run)
+            self.end_offset = run["offset"] + run["size"]
+            missing.append(run)
+        if indexed is None:
+            self._write_index()  # Index absent, illisible, ancien format ou d'une archive remplacée
+        else:
+            for run in missing:
+                self._append_index(run)
+
+    def _read_index(self, file_size):
+        """
+        Lit l'index : une ligne d'en-tête (identité de l'archive) puis un run par ligne.
+        :return: Liste des runs indexés, ou None si l'index doit être reconstruit.
+        """
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                if json.loads(index_file.readline()).get("inode") != self._inode:
+                    return None
+                runs = {}
+                for line in index_file:
+                    run = json.loads(line)
+                    if run["offset"] + run["size"] > file_size:
+                        return None
+                    runs[run["offset"]] = run
+        except (OSError, ValueError, KeyError, AttributeError, TypeError):
+            return None
+        return sorted(runs.values(), key=lambda run: run["offset"])
+
+    def _scan(self, offset):
+        """
+        Parcourt les blocs à partir de offset et produit les runs complets et valides.
+        Un run incomplet ou corrompu en fin de fichier est ignoré.
+        """
+        current = None
+        with open(self.path, "rb") as archive:
+            archive.seek(offset)
+            position = offset
+            while True:
+                header = archive.read(CHUNK_HEADER.size)
+                if len(header) < CHUNK_HEADER.size:
+                    return
+                kind, run_id, timestamp, name_len, data_len = CHUNK_HEADER.unpack(header)
+                name = archive.read(name_len).decode("utf-8", errors="replace")
+                data_offset = position + CHUNK_HEADER.size + name_len
+                data = archive.read(data_len)
+                crc = archive.read(CHUNK_CRC.size)
+                if len(data) < data_len or len(crc) < CHUNK_CRC.size or CHUNK_CRC.unpack(crc)[0] != zlib.crc32(data):
+                    return
+                if current is None or current["run_id"] != run_id:
+                    current = {"run_id": run_id, "timestamp": timestamp, "offset": position,
+                               "size": 0, "chunks": {}, "meta": None}
+                location = [data_offset, data_len]
+                position = data_offset + data_len + CHUNK_CRC.size
+                if kind == KIND_META:
+                    current["meta"] = location
+                    current["size"] = position - current["offset"]
+                    yield current, position
+                    current = None
+                else:
+                    current["chunks"][name] = location
+
+    def _write_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            index_file.write(json.dumps({"inode": self._inode}) + "\n")
+            for run in sorted(self.runs, key=lambda run: run["offset"]):
+                index_file.write(json.dumps(run, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    def _append_index(self, run):
+        with open(self.index_path, "a", encoding="utf-8") as index_file:
+            index_file.write(json.dumps(run, separators=(",", ":")) + "\n")
+
+
+def import_legacy_folders(root="detections", archive=None, remove=False):
+    """
+    Convertit les anciens dossiers detections/<dossier>/step_*.png en runs d'archive.
+    Les dossiers detection_<timestamp> sont datés par leur timestamp, les autres par la date
+    de modification du dossier. Chaque run reçoit un identifiant libre (la date, incrémentée
+    en cas de collision) ; les dossiers déjà importés (même nom de source) sont ignorés.
+    :param remove: True pour supprimer les dossiers une fois importés.
+    :return: Nombre de dossiers importés.
+    """
+    if archive is None:
+        archive = DetectionArchive(os.path.join(root, os.path.basename(DEFAULT_ARCHIVE_PATH)))
+    folders = []
+    for entry in os.scandir(root):
+        if not entry.is_dir():
+            continue
+        suffix = entry.name[len(LEGACY_FOLDER_PREFIX):] if entry.name.startswith(LEGACY_FOLDER_PREFIX) else ""
+        if suffix.isdigit():
+            folders.append((int(suffix), 0, entry))
+        else:
+            folders.append((int(entry.stat().st_mtime), 1, entry))  # Après un dossier daté du même instant
+
+    imported_sources = set()
+    for run in archive.runs:
+        metadata = archive.read_metadata(run["run_id"]) or {}
+        if metadata.get("imported"):
+            imported_sources.add(metadata.get("source"))
+
+    imported = 0
+    for timestamp, _, entry in sorted(folders, key=lambda item: (item[0], item[1], item[2].name)):
+        if entry.name in imported_sources:
+            continue
+        run_id = timestamp
+        while archive.get_run(run_id) is not None:
+            run_id += 1
+        files = sorted(f for f in os.listdir(entry.path) if f.lower().endswith(".png"))
+        images = []
+        for filename in files:
+            with open(os.path.join(entry.path, filename), "rb") as image_file:
+                images.append((os.path.splitext(filename)[0], image_file.read()))
+        metadata = {"detection_id": run_id, "source": entry.name, "imported": True}
+        archive.append_run(run_id, images, metadata, timestamp=timestamp)
+        imported += 1
+        if remove:
+            for filename in files:
+                os.remove(os.path.join(entry.path, filename))
+            if not os.listdir(entry.path):
+                os.rmdir(entry.path)
+    return imported
+
+
+# Si ce fichier est exécuté directement, il importe les anciens dossiers de détection
+if __name__ == "__main__":
+    count = import_legacy_folders("detections")
+    print(f"{count} dossier(s) de détection importé(s) dans l'archive.")
@@ -67,5 +67,29 @@ class TestAlgo(unittest.TestCase):
         self.assertEqual(set(move_matrix[0].keys()), expected_keys,
                          "Les clés des dictionnaires sont incorrectes")
 
+    def test_etat_tours_direct(self):
+        """
+        Vérifie que l'état calculé directement après k coups correspond
+        à l'état obtenu en rejouant les k premiers mouvements.
+        """
+        for n in range(1, 7):
+            hanoi = HanoiIterative(n)
+            towers = {1: list(reversed(range(1, n + 1))), 2: [], 3: []}
+            self.assertEqual(HanoiIterative.etat_tours(n, 0), towers)
+            for k, (_, from_tower, to_tower, _, _) in enumerate(hanoi.movements, start=1):
+                towers[to_tower].append(towers[from_tower].pop())
+                self.assertEqual(HanoiIterative.etat_tours(n, k), towers, f"{n} palets, coup {k}")
+        with self.assertRaises(ValueError):
+            HanoiIterative.etat_tours(3, 8)
+
+    def test_iterer_mouvements_reprise(self):
+        """
+        Vérifie que le générateur reprend la solution à n'importe quel coup.
+        """
+        for n in range(1, 7):
+            matrix = HanoiIterative(n).get_move_matrix()
+            for k in range(len(matrix) + 1):
+                self.assertEqual(list(HanoiIterative.iterer_mouvements(n, k)), matrix[k:], f"{n} palets, coup {k}")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+from BlocAlgo.HanoiIterative import HanoiIterative
+from BlocRobot.AsyncDobotControl import AsyncDobotControl
+from BlocRobot.DobotControl import DobotControl, MOTION_JUMP
+from BlocRobot.DobotSimulator import SimulatedDobot
+from BlocRobot.MotionProfiles import DEFAULT_PROFILES
+from BlocRobot.MoveTelemetry import MoveTelemetry, PHASE_PICK, PHASE_PLACE
+
+
+class TestAsyncDobotControl(unittest.TestCase):
+    """
+    Pilote asynchrone sur le Dobot simulé (temps virtuel).
+    """
+
+    def creer(self, motion_mode=MOTION_JUMP):
+        device = SimulatedDobot()
+        robot = DobotControl(device=device, motion_mode=motion_mode, profils=DEFAULT_PROFILES)
+        robot.definir_nb_palets(3)
+        return AsyncDobotControl(robot), device
+
+    def test_partie_complete(self):
+        """Une partie complète donne une saisie et une dépose par coup."""
+        async def scenario():
+            driver, device = self.creer()
+            driver.start()
+            for coup, origine, destination, nb_origine, nb_destination in HanoiIterative(3).get_move_matrix():
+                await driver.realiser_deplacement(origine, destination, nb_origine, nb_destination, coup)
+            await driver.close()
+            return device
+        device = asyncio.run(scenario())
+        succions = [target for _, kind, target in device.events if kind == "suck"]
+        self.assertEqual(succions, [True, False] * 7)
+        self.assertTrue(device.closed)
+
+    def test_telemetrie_sur_jalons(self):
+        """Les phases mesurées couvrent l'exécution du coup par le bras, pas l'empilement des commandes."""
+        async def scenario():
+            driver, _ = self.creer()
+            robot = driver.robot
+            robot.telemetry = MoveTelemetry(clock=robot.horloge)
+            driver.start()
+            start = robot.horloge()
+            await driver.realiser_deplacement(1, 3, 3, 0)
+            duration = robot.horloge() - start
+            await driver.close()
+            return robot.telemetry.summary(), duration
+        summary, duration = asyncio.run(scenario())
+        self.assertEqual(set(summary["phases"]), {PHASE_PICK, PHASE_PLACE})
+        self.assertGreater(summary["phases"][PHASE_PICK], 1)
+        self.assertAlmostEqual(summary["mean_move"], duration, delta=0.1)
+
+    def test_autres_taches_pendant_mouvement(self):
+        """D'autres coroutines progressent pendant qu'un déplacement est en cours."""
+        async def scenario():
+            driver, _ = self.creer()
+            driver.start()
+            ticks = 0
+            done = asyncio.Event()
+
+            async def interface():
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            ui = asyncio.create_task(interface())
+            await driver.realiser_deplacement(1, 3, 3, 0)
+            done.set()
+            await ui
+            pose = await driver.pose()
+            await driver.close()
+            return ticks, pose
+        ticks, pose = asyncio.run(scenario())
+        self.assertGreater(ticks, 10)
+        self.assertEqual(pose[1], 150)
+
+    def test_move_to_et_suck(self):
+        """move_to et suck attendent l'exécution de leur commande."""
+        async def scenario():
+            driver, device = self.creer()
+            driver.start()
+            await driver.move_to(220, 0, 100)
+            await driver.suck(True)
+            pose = await driver.pose()
+            await driver.close(disconnect=False)
+            return device, pose
+        device, pose = asyncio.run(scenario())
+        self.assertEqual(tuple(pose[:3]), (220.0, 0.0, 100.0))
+        self.assertTrue(device.suction)
+
+
+if __name__ == "__main__":
+    unittest.main()
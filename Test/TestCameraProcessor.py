@@ -5,7 +5,7 @@ import os
 import shutil
 import time
 from unittest import mock
-from BlocVision.CameraProcessor import CameraProcessor
+from BlocVision.CameraProcessor import CameraProcessor, DetectionSteps
 
 class TestCameraProcessor(unittest.TestCase):
     def setUp(self):
@@ -61,24 +61,39 @@ class TestCameraProcessor(unittest.TestCase):
         num_discs, steps = self.processor.detect_discs(self.image, detection_id)
 
         self.assertGreaterEqual(num_discs, 2)  # On a bien dessiné 2 palets
-        self.assertIsInstance(steps, list)
+        self.assertIsInstance(steps, DetectionSteps)
         self.assertTrue(all(isinstance(step, tuple) and len(step) == 2 for step in steps))
 
+    def test_detection_steps_lazy(self):
+        # Les étapes couleur sont rendues à la demande, à la taille de l'image source
+        _, steps = self.processor.detect_discs(self.image, int(time.time()))
+        self.assertEqual(len(steps), 7)
+        title, final = steps[-1]
+        self.assertEqual(title, "Contours validés")
+        self.assertEqual(final.shape, self.image.shape)
+        self.assertIs(steps.image(0), self.image)
+        self.assertFalse((steps.image(6) == self.image).all())  # Contours dessinés sur une copie
+
     def test_detect_discs_save_images(self):
-        # Active l'enregistrement et vérifie que les fichiers sont bien créés
+        # Active l'enregistrement et vérifie que le run est bien archivé
         self.processor.save_images = True
+        self.processor.archive_path = os.path.join("detections", "test_archive.hda")
         detection_id = int(time.time())
         num_discs, _ = self.processor.detect_discs(self.image, detection_id)
 
-        folder_path = f"detections/detection_{detection_id}"
-        self.assertTrue(os.path.isdir(folder_path))
-        expected_files = [
-            "step_0_raw.png", "step_1_gray.png", "step_2_blur.png",
-            "step_3_threshold.png", "step_4_closed.png",
-            "step_5_contours.png", "step_6_validated_contours.png"
+        archive = self.processor.get_archive()
+        run = archive.get_run(detection_id)
+        self.assertIsNotNone(run)
+        expected_names = [
+            "step_0_raw", "step_1_gray", "step_2_blur",
+            "step_3_threshold", "step_4_closed",
+            "step_5_contours", "step_6_validated_contours"
         ]
-        for fname in expected_files:
-            self.assertTrue(os.path.isfile(os.path.join(folder_path, fname)))
+        self.assertEqual(list(run["chunks"].keys()), expected_names)
+        self.assertEqual(archive.read_metadata(detection_id)["num_discs"], num_discs)
+
+        raw = self.processor.load_archived_image(detection_id)
+        self.assertEqual(raw.shape, self.image.shape)
 
     @mock.patch('cv2.VideoCapture')
     def test_capture_image_mocked(self, mock_video_capture):
@@ -92,6 +107,61 @@ class TestCameraProcessor(unittest.TestCase):
         self.assertIsNotNone(frame)
         self.assertEqual(frame.shape, self.image.shape)
 
+    @mock.patch('cv2.VideoCapture')
+    def test_capture_image_warmup_converge(self, mock_video_capture):
+        # Image stable : le préchauffage s'arrête bien avant le plafond d'images
+        mock_cap = mock.Mock()
+        mock_video_capture.return_value = mock_cap
+        mock_cap.read.return_value = (True, self.image)
+        mock_cap.isOpened.return_value = True
+
+        frame = self.processor.capture_image()
+        self.assertIsNotNone(frame)
+        self.assertLess(self.processor.warmup_frames, 10)
+        self.assertIsNotNone(self.processor.warmup_duration)
+
+    def test_warm_up_ceiling(self):
+        # Luminosité qui ne se stabilise jamais : arrêt au plafond d'images
+        frames = [np.full((50, 50, 3), (i * 37) % 255, dtype=np.uint8) for i in range(100)]
+        mock_cap = mock.Mock()
+        mock_cap.read.side_effect = [(True, f) for f in frames]
+        self.processor.cap = mock_cap
+
+        frame = self.processor.warm_up(max_frames=8)
+        self.assertIsNotNone(frame)
+        self.assertEqual(self.processor.warmup_frames, 8)
+        self.processor.cap = None
+
+    def test_warm_up_images_noires(self):
+        # Images noires au démarrage du capteur : pas de convergence avant la première vraie image
+        frames = [np.zeros((50, 50, 3), dtype=np.uint8)] * 5 + [self.image] * 5
+        mock_cap = mock.Mock()
+        mock_cap.read.side_effect = [(True, f) for f in frames]
+        self.processor.cap = mock_cap
+
+        frame = self.processor.warm_up()
+        self.assertTrue(np.any(frame))
+        self.assertGreater(self.processor.warmup_frames, 5)
+        self.processor.cap = None
+
+    @mock.patch('cv2.VideoCapture')
+    def test_capture_camera_prechauffee(self, mock_video_capture):
+        # Caméra préchauffée laissée ouverte : la capture suivante lit une seule image
+        mock_cap = mock.Mock()
+        mock_video_capture.return_value = mock_cap
+        mock_cap.read.return_value = (True, self.image)
+        mock_cap.isOpened.return_value = True
+
+        self.assertTrue(self.processor.open_camera())
+        self.processor.warm_up()
+        reads = mock_cap.read.call_count
+        self.assertIsNotNone(self.processor.capture_image(keep_open=True))
+        self.assertEqual(mock_cap.read.call_count, reads + 1)
+        self.assertEqual(mock_video_capture.call_count, 1)
+
+        self.processor.release_camera()
+        self.assertFalse(self.processor.warmed)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+import math
+import os
+import tempfile
+import unittest
+from BlocVision.ColumnCalibration import (
+    calculer_calibration, homographie, appliquer_homographie, coins_marqueur,
+    lire_calibration, ecrire_calibration, REFERENCE_MARKERS
+)
+
+# Caméra simulée : homographie plan de la table (repère robot, mm) -> image (pixels)
+TABLE_TO_IMAGE = [[0.02, 2.1, 320.0], [-2.0, 0.05, 600.0], [0.00002, 0.0001, 1.0]]
+
+
+def projeter_marqueur(center, size=30.0):
+    """Coins image d'un marqueur carré centré en center (repère robot), axes alignés sur le robot."""
+    return [appliquer_homographie(TABLE_TO_IMAGE, (center[0] + dx, center[1] + dy)) for dx, dy in coins_marqueur(size)]
+
+
+class TestColumnCalibration(unittest.TestCase):
+
+    def test_homographie(self):
+        """Vérifie que l'homographie calculée envoie les 4 points sur leurs images."""
+        src = [(0, 0), (1, 0), (1, 1), (0, 1)]
+        dst = [(10, 20), (110, 25), (105, 130), (5, 120)]
+        matrix = homographie(src, dst)
+        for p, q in zip(src, dst):
+            for a, b in zip(appliquer_homographie(matrix, p), q):
+                self.assertAlmostEqual(a, b, places=6)
+
+    def marqueurs(self, colonnes, references=REFERENCE_MARKERS):
+        markers = {marker_id: projeter_marqueur(pose[:2]) for marker_id, pose in references.items()}
+        markers.update({axe_id: projeter_marqueur(position) for axe_id, position in colonnes.items()})
+        return markers
+
+    def test_homographie_moindres_carres(self):
+        """Au-delà de 4 points, l'homographie est ajustée au sens des moindres carrés."""
+        src = [(0, 0), (1, 0), (1, 1), (0, 1), (0.5, 0.5), (2, 1)]
+        dst = [appliquer_homographie(TABLE_TO_IMAGE, p) for p in src]
+        matrix = homographie(src, dst)
+        for p, q in zip(src, dst):
+            for a, b in zip(appliquer_homographie(matrix, p), q):
+                self.assertAlmostEqual(a, b, places=6)
+
+    def test_positions_colonnes(self):
+        """Retrouve la position des colonnes dans le repère du robot à partir de l'image."""
+        colonnes = {1: (222.0, -148.0), 2: (218.0, 3.0), 3: (221.0, 152.0)}
+        calibration = calculer_calibration(self.marqueurs(colonnes))
+        for axe_id, (x, y) in colonnes.items():
+            mx, my = calibration["colonnes"][str(axe_id)]
+            self.assertAlmostEqual(mx, x, delta=0.2)
+            self.assertAlmostEqual(my, y, delta=0.2)
+        self.assertAlmostEqual(calibration["dist_colonnes"], 220.3, delta=0.2)
+        self.assertEqual(calibration["references"], sorted(REFERENCE_MARKERS))
+
+    def test_bruit_de_detection(self):
+        """Une erreur d'un pixel sur les coins reste inférieure au millimètre aux colonnes."""
+        colonnes = {1: (220.0, -150.0), 2: (220.0, 0.0), 3: (220.0, 150.0)}
+        markers = self.marqueurs(colonnes)
+        signs = [(1, -1), (-1, 1), (1, 1), (-1, -1)]
+        markers = {marker_id: [(u + sx, v + sy) for (u, v), (sx, sy) in zip(corners, signs)]
+                   for marker_id, corners in markers.items()}
+        calibration = calculer_calibration(markers)
+        for axe_id, (x, y) in colonnes.items():
+            self.assertLess(math.dist(calibration["colonnes"][str(axe_id)], (x, y)), 1.0)
+
+    def test_marqueur_manquant(self):
+        """Une calibration sans tous les marqueurs est refusée."""
+        with self.assertRaises(ValueError):
+            calculer_calibration({0: projeter_marqueur(REFERENCE_MARKERS[0][:2])})
+
+    def test_reference_unique_refusee(self):
+        """Un seul marqueur de référence ne suffit pas (extrapolation jusqu'aux colonnes)."""
+        colonnes = {1: (220.0, -150.0), 2: (220.0, 0.0), 3: (220.0, 150.0)}
+        with self.assertRaises(ValueError):
+            calculer_calibration(self.marqueurs(colonnes, {0: REFERENCE_MARKERS[0]}))
+
+    def test_references_incoherentes(self):
+        """Un marqueur de référence déplacé est détecté par l'erreur de reprojection."""
+        colonnes = {1: (220.0, -150.0), 2: (220.0, 0.0), 3: (220.0, 150.0)}
+        markers = self.marqueurs(colonnes)
+        markers[4] = projeter_marqueur((REFERENCE_MARKERS[4][0] + 20, REFERENCE_MARKERS[4][1]))
+        with self.assertRaises(ValueError):
+            calculer_calibration(markers)
+
+    def test_fichier_de_calibration(self):
+        """L'écriture conserve les clés existantes et remplace les autres."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calibration.json")
+            self.assertEqual(lire_calibration(path), {})
+            ecrire_calibration({"manuel": {"y": 1, "z": 2}}, path)
+            ecrire_calibration({"colonnes": {"1": [220, -150]}}, path)
+            calibration = lire_calibration(path)
+        self.assertEqual(calibration["manuel"], {"y": 1, "z": 2})
+        self.assertEqual(calibration["colonnes"], {"1": [220, -150]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+import os
+import shutil
+import tempfile
+from BlocVision.DetectionArchive import DetectionArchive, RetentionPolicy, import_legacy_folders
+
+class TestDetectionArchive(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "archive.hda")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_append_and_read(self):
+        # Un run ajouté est relu à l'identique
+        archive = DetectionArchive(self.path)
+        archive.append_run(1, [("step_0_raw", b"raw"), ("step_1_gray", b"gray")], {"num_discs": 3}, timestamp=10)
+
+        self.assertEqual(archive.read_image(1, "step_0_raw"), b"raw")
+        self.assertEqual(archive.read_image(1, "step_1_gray"), b"gray")
+        self.assertIsNone(archive.read_image(1, "absent"))
+        self.assertEqual(archive.read_metadata(1), {"num_discs": 3})
+
+    def test_index_reload_and_rebuild(self):
+        # L'index est relu, ou reconstruit s'il a disparu
+        archive = DetectionArchive(self.path)
+        for run_id in range(5):
+            archive.append_run(run_id, [("step_0_raw", bytes([run_id]) * 10)], {"id": run_id}, timestamp=100 + run_id)
+
+        reopened = DetectionArchive(self.path)
+        self.assertEqual(len(reopened), 5)
+        self.assertEqual(reopened.read_image(3, "step_0_raw"), bytes([3]) * 10)
+
+        os.remove(self.path + ".idx")
+        rebuilt = DetectionArchive(self.path)
+        self.assertEqual(len(rebuilt), 5)
+        self.assertEqual(rebuilt.read_metadata(4), {"id": 4})
+
+    def test_truncated_run_ignored(self):
+        # Un run interrompu en cours d'écriture est ignoré puis écrasé
+        archive = DetectionArchive(self.path)
+        archive.append_run(1, [("step_0_raw", b"a" * 50)], {}, timestamp=1)
+        archive.append_run(2, [("step_0_raw", b"b" * 50)], {}, timestamp=2)
+        os.remove(self.path + ".idx")
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 5)
+
+        archive = DetectionArchive(self.path)
+        self.assertEqual(len(archive), 1)
+        archive.append_run(3, [("step_0_raw", b"c" * 50)], {}, timestamp=3)
+        self.assertEqual(len(DetectionArchive(self.path)), 2)
+
+    def test_find_runs_by_timestamp(self):
+        # Recherche par intervalle de dates et par date la plus proche
+        archive = DetectionArchive(self.path)
+        for run_id in range(10):
+            archive.append_run(run_id, [], {}, timestamp=run_id * 10)
+
+        self.assertEqual([r["run_id"] for r in archive.find_runs(20, 40)], [2, 3, 4])
+        self.assertEqual(archive.nearest_run(57)["run_id"], 6)
+        self.assertEqual(archive.latest()["run_id"], 9)
+
+    def test_retention_compaction(self):
+        # Au-delà de la marge, l'archive est compactée aux runs les plus récents
+        archive = DetectionArchive(self.path, RetentionPolicy(max_runs=4, slack=0.5))
+        for run_id in range(7):
+            archive.append_run(run_id, [("step_0_raw", b"x" * 100)], {}, timestamp=run_id)
+
+        self.assertEqual([r["run_id"] for r in archive.runs], [3, 4, 5, 6])
+        self.assertEqual(archive.read_image(6, "step_0_raw"), b"x" * 100)
+        self.assertEqual(len(DetectionArchive(self.path)), 4)
+
+    def test_deux_instances_meme_archive(self):
+        # Deux instances ouvertes sur la même archive (tableau de bord et commande detect) ne s'écrasent pas
+        first = DetectionArchive(self.path)
+        second = DetectionArchive(self.path)
+        first.append_run(1, [("step_0_raw", b"a")], {}, timestamp=1)
+        second.append_run(2, [("step_0_raw", b"b")], {}, timestamp=2)
+        first.append_run(3, [("step_0_raw", b"c")], {}, timestamp=3)
+
+        reopened = DetectionArchive(self.path)
+        self.assertEqual([r["run_id"] for r in reopened.runs], [1, 2, 3])
+        self.assertEqual(reopened.read_image(2, "step_0_raw"), b"b")
+        self.assertEqual(first.read_image(2, "step_0_raw"), b"b")
+
+    def test_compactage_par_autre_instance(self):
+        # Après un compactage par une autre instance, l'archive est relue avant d'écrire
+        first = DetectionArchive(self.path)
+        second = DetectionArchive(self.path)
+        for run_id in range(4):
+            first.append_run(run_id, [("step_0_raw", b"x" * 10)], {}, timestamp=run_id)
+        second.compact(RetentionPolicy(max_runs=2))
+        first.append_run(9, [("step_0_raw", b"y")], {}, timestamp=9)
+
+        reopened = DetectionArchive(self.path)
+        self.assertEqual([r["run_id"] for r in reopened.runs], [2, 3, 9])
+        self.assertEqual(reopened.read_image(9, "step_0_raw"), b"y")
+
+    def test_index_ajout_seul(self):
+        # Un ajout écrit une seule ligne à la fin de l'index, sans réécrire les précédentes
+        archive = DetectionArchive(self.path)
+        archive.append_run(1, [], {}, timestamp=1)
+        with open(self.path + ".idx", encoding="utf-8") as f:
+            before = f.read()
+        archive.append_run(2, [], {}, timestamp=2)
+        with open(self.path + ".idx", encoding="utf-8") as f:
+            after = f.read()
+        self.assertTrue(after.startswith(before))
+        self.assertEqual(after[len(before):].count("\n"), 1)
+
+    def test_import_legacy_folders(self):
+        # Les anciens dossiers detection_<timestamp> sont convertis une seule fois
+        for timestamp in (1742635465, 1742635484):
+            folder = os.path.join(self.folder, f"detection_{timestamp}")
+            os.makedirs(folder)
+            for name in ("step_0_raw.png", "step_1_gray.png"):
+                with open(os.path.join(folder, name), "wb") as f:
+                    f.write(name.encode())
+
+        archive = DetectionArchive(self.path)
+        self.assertEqual(import_legacy_folders(self.folder, archive), 2)
+        self.assertEqual(import_legacy_folders(self.folder, archive), 0)
+        self.assertEqual(archive.read_image(1742635465, "step_1_gray"), b"step_1_gray.png")
+        self.assertEqual(archive.read_metadata(1742635484)["source"], "detection_1742635484")
+
+    def test_import_dossiers_meme_date(self):
+        # Deux dossiers non datés modifiés au même instant reçoivent chacun leur identifiant
+        for name in ("comptex2", "palet etx"):
+            folder = os.path.join(self.folder, name)
+            os.makedirs(folder)
+            with open(os.path.join(folder, "step_0_raw.png"), "wb") as f:
+                f.write(name.encode())
+            os.utime(folder, (1749916016, 1749916016))
+
+        archive = DetectionArchive(self.path)
+        self.assertEqual(import_legacy_folders(self.folder, archive), 2)
+        self.assertEqual(import_legacy_folders(self.folder, archive), 0)
+        sources = {archive.read_metadata(r["run_id"])["source"]: r["run_id"] for r in archive.runs}
+        self.assertEqual(sources, {"comptex2": 1749916016, "palet etx": 1749916017})
+        self.assertEqual(archive.read_image(1749916017, "step_0_raw"), b"palet etx")
+
+    def test_lecture_apres_compactage_par_autre_instance(self):
+        # Une lecture relit l'archive compactée par une autre instance au lieu d'utiliser des offsets périmés
+        first = DetectionArchive(self.path)
+        for run_id in range(4):
+            first.append_run(run_id, [("step_0_raw", bytes([run_id]) * 10)], {"id": run_id}, timestamp=run_id)
+        DetectionArchive(self.path).compact(RetentionPolicy(max_runs=2))
+
+        self.assertEqual(first.read_image(3, "step_0_raw"), bytes([3]) * 10)
+        self.assertEqual(first.read_metadata(2), {"id": 2})
+        self.assertIsNone(first.read_image(0, "step_0_raw"))
+
+    def test_bloc_corrompu(self):
+        # Une charge utile dont le CRC ne correspond plus est signalée
+        archive = DetectionArchive(self.path)
+        archive.append_run(1, [("step_0_raw", b"abcdef")], {}, timestamp=1)
+        offset, _ = archive.get_run(1)["chunks"]["step_0_raw"]
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            f.write(b"X")
+        with self.assertRaises(ValueError):
+            archive.read_image(1, "step_0_raw")
+
+
+if __name__ == '__main__':
+    unittest.main()
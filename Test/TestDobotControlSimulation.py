@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from BlocAlgo.HanoiIterative import HanoiIterative
+from BlocRobot.BenchmarkMotion import executer_partie, mouvements_retour
+from BlocRobot.DobotControl import (
+    DobotControl, EXECUTION_BLOCKING, EXECUTION_PIPELINE, MOTION_SEGMENTS, MOTION_JUMP
+)
+from BlocRobot.DobotSimulator import SimulatedDobot
+from BlocRobot.MoveTelemetry import MoveTelemetry, PHASE_PICK, PHASE_PLACE
+from BlocRobot.MotionProfiles import DEFAULT_PROFILES, profils_uniformes
+from BlocRobot.ExecutionJournal import ExecutionJournal, lire_journal
+
+class TestDobotControlSimulation(unittest.TestCase):
+    """
+    Parties complètes jouées sur le Dobot simulé (temps virtuel, aucun matériel requis).
+    """
+
+    def jouer(self, execution_mode, motion_mode, nb_palets=3, profils=DEFAULT_PROFILES):
+        device = SimulatedDobot()
+        robot = DobotControl(device=device, execution_mode=execution_mode, motion_mode=motion_mode,
+                             profils=profils)
+        robot.definir_nb_palets(nb_palets)
+        duree = executer_partie(robot, HanoiIterative(nb_palets).get_move_matrix())
+        return robot, device, duree
+
+    def succions(self, device):
+        # Positions (y, z) des activations / désactivations de ventouse
+        return [(kind, target) for _, kind, target in device.events if kind == "suck"]
+
+    def test_partie_complete_tous_modes(self):
+        """
+        Chaque mode joue les 2^n - 1 coups avec une saisie et une dépose par coup.
+        """
+        for execution_mode in (EXECUTION_BLOCKING, EXECUTION_PIPELINE):
+            for motion_mode in (MOTION_SEGMENTS, MOTION_JUMP):
+                _, device, duree = self.jouer(execution_mode, motion_mode)
+                succions = self.succions(device)
+                self.assertEqual(len(succions), 2 * 7, f"{execution_mode}/{motion_mode}")
+                self.assertEqual([t for _, t in succions], [True, False] * 7)
+                self.assertGreater(duree, 0)
+
+    def test_pipeline_et_saut_plus_rapides(self):
+        """
+        Le mode pipeline et les sauts réduisent la durée d'une partie.
+        """
+        _, _, bloquant = self.jouer(EXECUTION_BLOCKING, MOTION_SEGMENTS)
+        _, _, pipeline = self.jouer(EXECUTION_PIPELINE, MOTION_SEGMENTS)
+        _, _, saut = self.jouer(EXECUTION_PIPELINE, MOTION_JUMP)
+        self.assertLess(pipeline, bloquant)
+        self.assertLess(saut, pipeline)
+
+    def test_aller_retour(self):
+        """
+        La partie retour ramène les palets sur la tour de départ.
+        """
+        robot, device, _ = self.jouer(EXECUTION_PIPELINE, MOTION_JUMP)
+        executer_partie(robot, mouvements_retour(HanoiIterative(3).get_move_matrix()))
+        self.assertEqual(len(self.succions(device)), 4 * 7)
+        self.assertFalse(device.suction)
+
+    def test_profils_plus_rapides(self):
+        """
+        Les profils de vitesse par phase réduisent la durée d'une partie.
+        """
+        for execution_mode, motion_mode in ((EXECUTION_BLOCKING, MOTION_SEGMENTS), (EXECUTION_PIPELINE, MOTION_JUMP)):
+            _, _, uniforme = self.jouer(execution_mode, motion_mode, profils=profils_uniformes())
+            _, _, profils = self.jouer(execution_mode, motion_mode)
+            self.assertLess(profils, uniforme, f"{execution_mode}/{motion_mode}")
+
+    def test_telemetrie(self):
+        """
+        La télémétrie mesure chaque coup sur l'horloge simulée.
+        """
+        device = SimulatedDobot()
+        robot = DobotControl(device=device, profils=DEFAULT_PROFILES)
+        robot.telemetry = MoveTelemetry(total_moves=7, clock=robot.horloge)
+        robot.definir_nb_palets(3)
+        duree = executer_partie(robot, HanoiIterative(3).get_move_matrix())
+        summary = robot.telemetry.summary()
+        self.assertEqual(summary["moves"], 7)
+        self.assertEqual(set(summary["phases"]), {"travel", "descend", "suction", "lift", "release"})
+        self.assertAlmostEqual(summary["mean_move"] * 7, duree, delta=0.5)
+
+    def test_telemetrie_pipeline(self):
+        """
+        En mode pipeline, les coups sont datés par l'exécution de leurs jalons, pas par leur empilement.
+        """
+        records = []
+        robot = DobotControl(device=SimulatedDobot(), execution_mode=EXECUTION_PIPELINE,
+                             motion_mode=MOTION_JUMP, profils=DEFAULT_PROFILES)
+        robot.telemetry = MoveTelemetry(total_moves=7, clock=robot.horloge, callback=records.append)
+        robot.definir_nb_palets(3)
+        duree = executer_partie(robot, HanoiIterative(3).get_move_matrix())
+        self.assertEqual([record["move"] for record in records], list(range(1, 8)))
+        self.assertEqual(set(robot.telemetry.summary()["phases"]), {PHASE_PICK, PHASE_PLACE})
+        self.assertAlmostEqual(sum(record["duration"] for record in records), duree, delta=0.1)
+        self.assertTrue(all(record["duration"] > 1 for record in records))
+
+    def test_journal_pipeline(self):
+        """
+        En mode pipeline, un coup n'est journalisé qu'une fois sa dépose exécutée.
+        """
+        movements = HanoiIterative(3).get_move_matrix()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "journal.jsonl")
+            robot = DobotControl(device=SimulatedDobot(), execution_mode=EXECUTION_PIPELINE,
+                                 motion_mode=MOTION_JUMP, profils=DEFAULT_PROFILES)
+            robot.definir_nb_palets(3)
+            robot.journal = ExecutionJournal(path)
+            robot.journal.commencer(3, len(movements))
+            for coup, origine, destination, nb_origine, nb_destination in movements[:4]:
+                robot.realiser_deplacement(origine, destination, nb_origine, nb_destination, coup)
+            self.assertLess(lire_journal(path)["completed"], 4)
+            robot.attendre_fin_mouvements()
+            self.assertEqual(lire_journal(path)["completed"], 4)
+            robot.journal.close()
+
+    def test_calibration_des_colonnes(self):
+        """
+        Les coordonnées calibrées des colonnes remplacent les valeurs nominales.
+        """
+        calibration = {"colonnes": {"1": [224.0, -147.0], "3": [218.0, 152.5]}}
+        robot = DobotControl(device=SimulatedDobot(), motion_mode=MOTION_JUMP, calibration=calibration)
+        robot.definir_nb_palets(3)
+        plan = robot.planifier_deplacement(1, 3, 3, 0)
+        self.assertEqual(plan[0][2][:2], (224.0, -147.0))
+        self.assertEqual(plan[2][2][:2], (218.0, 152.5))
+        self.assertEqual(robot.colonnes[2], (220.0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from types import SimpleNamespace
+from BlocRobot.DobotSimulator import SimulatedDobot, segment_duration, PTP_JUMP_XYZ, PTP_MOVL_XYZ
+
+class TestDobotSimulator(unittest.TestCase):
+
+    def test_segment_duration(self):
+        """
+        Vérifie le profil trapézoïdal (croisière atteinte) et triangulaire (segment court).
+        """
+        self.assertAlmostEqual(segment_duration(400, 200, 200), 400 / 200 + 200 / 200)
+        self.assertAlmostEqual(segment_duration(50, 200, 200), 2 * (50 / 200) ** 0.5)
+        self.assertEqual(segment_duration(0, 200, 200), 0)
+
+    def test_move_to_wait(self):
+        """
+        Un déplacement bloquant fait avancer l'horloge simulée de la durée du mouvement.
+        """
+        dobot = SimulatedDobot(serial_latency=0)
+        dobot.move_to(250, 0, 50, 0, wait=True)  # Déjà en position : durée nulle
+        start = dobot.now()
+        dobot.move_to(250, 300, 50, 0, wait=True)
+        self.assertAlmostEqual(dobot.now() - start, segment_duration(300, 200, 200))
+        self.assertEqual(dobot.pose()[:3], (250, 300, 50))
+
+    def test_file_de_commandes(self):
+        """
+        Les commandes non bloquantes s'exécutent à la suite, l'index courant progresse avec le temps.
+        """
+        dobot = SimulatedDobot(serial_latency=0)
+        first = dobot._set_ptp_cmd(250, 100, 50, 0, mode=PTP_MOVL_XYZ, wait=False)
+        dobot._set_end_effector_suction_cup(True)
+        self.assertEqual(dobot._get_queued_cmd_current_index(), 0)
+        dobot.sleep(10)
+        self.assertEqual(dobot._get_queued_cmd_current_index(), 2)
+        self.assertTrue(dobot.suction)
+        self.assertEqual(first.params[0], 1)
+
+    def test_commande_inconnue(self):
+        """
+        Une commande brute non simulée est refusée avec son identifiant.
+        """
+        dobot = SimulatedDobot(serial_latency=0)
+        with self.assertRaisesRegex(ValueError, "id 99"):
+            dobot._send_command(SimpleNamespace(id=99))
+
+    def test_saut_plus_rapide_que_segments(self):
+        """
+        Un saut (une seule commande) est plus court que montée + translation + descente séparées.
+        """
+        jump = SimulatedDobot(serial_latency=0)
+        jump.move_to(220, -150, -55, 0, wait=True)
+        start = jump.now()
+        jump._set_ptp_jump_params(60, 60)
+        jump._set_ptp_cmd(220, 150, -55, 0, mode=PTP_JUMP_XYZ, wait=True)
+        jump_time = jump.now() - start
+
+        segments = SimulatedDobot(serial_latency=0)
+        segments.move_to(220, -150, -55, 0, wait=True)
+        start = segments.now()
+        for y, z in ((-150, 5), (150, 5), (150, -55)):
+            segments.move_to(220, y, z, 0, wait=True)
+        self.assertLess(jump_time, segments.now() - start)
+
+    def test_vitesse(self):
+        """
+        Réduire la vitesse allonge les déplacements. Comme pydobot, speed() règle à la fois
+        la vitesse cartésienne et le ratio commun (en %) : 50 donne 50 * 50 % = 25 mm/s.
+        """
+        dobot = SimulatedDobot(serial_latency=0)
+        dobot.speed(50, 50)
+        start = dobot.now()
+        dobot.move_to(250, 300, 50, 0, wait=True)
+        self.assertAlmostEqual(dobot.now() - start, segment_duration(300, 25, 25))
+
+
+if __name__ == "__main__":
+    unittest.main()
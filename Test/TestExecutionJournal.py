@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from BlocRobot.ExecutionJournal import ExecutionJournal, lire_journal, partie_a_reprendre
+
+
+class TestExecutionJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "journal.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_partie_interrompue(self):
+        """Vérifie qu'une partie interrompue est proposée à la reprise après le dernier coup terminé."""
+        journal = ExecutionJournal(self.path)
+        journal.commencer(3, 7)
+        for coup in (1, 2, 3):
+            journal.enregistrer(coup, 1, 3)
+        journal.close()
+        etat = partie_a_reprendre(self.path)
+        self.assertEqual((etat["nb_palets"], etat["total_moves"], etat["completed"]), (3, 7, 3))
+
+    def test_ligne_tronquee(self):
+        """Vérifie qu'une dernière ligne tronquée par une coupure est ignorée."""
+        journal = ExecutionJournal(self.path)
+        journal.commencer(3, 7)
+        journal.enregistrer(1, 1, 3)
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"move": 2, "ori')
+        self.assertEqual(lire_journal(self.path)["completed"], 1)
+
+    def test_reprise_puis_fin(self):
+        """Vérifie qu'une partie reprise puis terminée n'est plus proposée à la reprise."""
+        journal = ExecutionJournal(self.path)
+        journal.commencer(2, 3)
+        journal.enregistrer(1, 1, 2)
+        journal.close()
+        journal.reprendre()
+        journal.enregistrer(2, 1, 3)
+        journal.enregistrer(3, 2, 3)
+        journal.terminer()
+        self.assertTrue(lire_journal(self.path)["done"])
+        self.assertIsNone(partie_a_reprendre(self.path))
+
+    def test_sans_journal(self):
+        """Vérifie qu'aucune reprise n'est proposée sans journal."""
+        self.assertIsNone(partie_a_reprendre(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
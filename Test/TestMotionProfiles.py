@@ -0,0 +1,33 @@
+import json
+import os
+import tempfile
+import unittest
+from BlocRobot.MotionProfiles import (
+    charger_profils, profils_uniformes, DEFAULT_PROFILES, DEFAULT_SPEED, PROFILE_TRAVEL, PROFILE_APPROACH
+)
+
+
+class TestMotionProfiles(unittest.TestCase):
+
+    def test_profils_par_defaut(self):
+        """Vérifie que les profils par défaut sont utilisés sans fichier d'installation."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(charger_profils(os.path.join(tmp, "absent.json")), DEFAULT_PROFILES)
+
+    def test_surcharge_par_fichier(self):
+        """Vérifie qu'un fichier JSON remplace seulement les profils qu'il définit."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "motion_profiles.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({PROFILE_APPROACH: [80, 100]}, f)
+            profils = charger_profils(path)
+        self.assertEqual(profils[PROFILE_APPROACH], (80.0, 100.0))
+        self.assertEqual(profils[PROFILE_TRAVEL], DEFAULT_PROFILES[PROFILE_TRAVEL])
+
+    def test_profils_uniformes(self):
+        """Vérifie que les profils uniformes reprennent la vitesse par défaut du Dobot."""
+        self.assertEqual(set(profils_uniformes().values()), {DEFAULT_SPEED})
+
+
+if __name__ == "__main__":
+    unittest.main()
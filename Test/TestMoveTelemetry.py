@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+from BlocRobot.MoveTelemetry import MoveTelemetry
+
+
+class FakeClock:
+    """Horloge pilotée par le test."""
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+class TestMoveTelemetry(unittest.TestCase):
+
+    def jouer_coup(self, telemetry, clock, durees):
+        telemetry.start_move(1, 3)
+        for phase, duree in durees:
+            telemetry.phase(phase)
+            clock.t += duree
+        return telemetry.end_move()
+
+    def test_phases_et_eta(self):
+        """Vérifie les durées par phase, la durée du coup et l'ETA."""
+        clock = FakeClock()
+        records = []
+        telemetry = MoveTelemetry(callback=records.append, total_moves=7, clock=clock)
+        durees = [("travel", 1.0), ("descend", 0.5), ("suction", 0.1), ("lift", 0.5),
+                  ("travel", 1.5), ("descend", 0.5), ("release", 0.1), ("lift", 0.5)]
+        record = self.jouer_coup(telemetry, clock, durees)
+
+        self.assertEqual(records, [record])
+        self.assertEqual(record["move"], 1)
+        self.assertAlmostEqual(record["duration"], 4.7)
+        self.assertEqual(len(record["phases"]), 8)
+        self.assertAlmostEqual(telemetry.summary()["phases"]["travel"], 2.5)
+        self.assertEqual(record["remaining_moves"], 6)
+        self.assertAlmostEqual(record["eta"], 4.7 * 6)
+
+    def test_reprise(self):
+        """En reprise, les coups déjà joués sont déduits des coups restants et de l'ETA."""
+        clock = FakeClock()
+        telemetry = MoveTelemetry(total_moves=7, clock=clock, initial_done=3)
+        record = self.jouer_coup(telemetry, clock, [("travel", 2.0)])
+        self.assertEqual(record["move"], 4)
+        self.assertEqual(record["remaining_moves"], 3)
+        self.assertAlmostEqual(record["eta"], 2.0 * 3)
+
+    def test_eta_inconnue_sans_total(self):
+        """Vérifie que l'ETA vaut None sans nombre total de coups."""
+        clock = FakeClock()
+        telemetry = MoveTelemetry(clock=clock)
+        self.assertIsNone(self.jouer_coup(telemetry, clock, [("travel", 1.0)])["eta"])
+
+    def test_ecriture_jsonl(self):
+        """Vérifie qu'une ligne JSON est écrite par coup."""
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "telemetry", "moves.jsonl")
+            telemetry = MoveTelemetry(path, total_moves=3, clock=clock)
+            for _ in range(3):
+                self.jouer_coup(telemetry, clock, [("travel", 1.0), ("release", 0.1)])
+            telemetry.close()
+            with open(path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual([line["move"] for line in lines], [1, 2, 3])
+        self.assertEqual(lines[-1]["eta"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
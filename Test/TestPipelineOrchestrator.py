@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import unittest
+from BlocAlgo.HanoiIterative import HanoiIterative
+from BlocRobot.DobotControl import DobotControl
+from BlocRobot.DobotSimulator import SimulatedDobot
+from BlocRobot.ExecutionJournal import lire_journal
+from BlocRobot.PipelineOrchestrator import (
+    PipelineOrchestrator, MoveStream, STAGE_CONNECT, STAGE_CAMERA, STAGE_TRAVEL, STAGE_DETECT,
+    STAGE_PLAN, STAGE_EXECUTE, STAGE_HOME, FIRST_MOVE
+)
+
+
+class FakeProcessor:
+    """Caméra factice : compte les ouvertures, préchauffages et libérations."""
+    def __init__(self):
+        self.events = []
+
+    def open_camera(self):
+        self.events.append("open")
+        return True
+
+    def warm_up(self):
+        self.events.append("warm_up")
+
+    def release_camera(self):
+        self.events.append("release")
+
+
+class TestPipelineOrchestrator(unittest.TestCase):
+    """
+    Parties orchestrées sur le Dobot simulé : étapes recouvertes et chronométrées.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal_path = os.path.join(self.tmp.name, "journal.jsonl")
+        self.devices = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def connecter(self):
+        device = SimulatedDobot()
+        self.devices.append(device)
+        return DobotControl(device=device, skip_recent_home=True)
+
+    def test_partie_nombre_impose(self):
+        """Avec un nombre de palets imposé, le plan démarre avant la connexion, sans caméra."""
+        orchestrator = PipelineOrchestrator(self.connecter, nb_palets=3, journal_path=self.journal_path)
+        orchestrator.run()
+        for stage in (STAGE_CONNECT, STAGE_PLAN, STAGE_EXECUTE, STAGE_HOME, FIRST_MOVE):
+            self.assertIn(stage, orchestrator.timings)
+        self.assertNotIn(STAGE_CAMERA, orchestrator.timings)
+        self.assertLessEqual(orchestrator.timings[STAGE_PLAN][0], orchestrator.timings[STAGE_CONNECT][0])
+        self.assertIsNotNone(orchestrator.first_move_delay())
+        self.assertEqual(orchestrator.robot.telemetry.summary()["moves"], 7)
+        self.assertTrue(lire_journal(self.journal_path)["done"])
+
+    def test_reprise_progression(self):
+        """En reprise, le premier coup rejoué annonce les coups restants de la partie, pas de la partie complète."""
+        with open(self.journal_path, "w", encoding="utf-8") as journal_file:
+            journal_file.write(json.dumps({"nb_palets": 3, "total_moves": 7, "started": 0}) + "\n")
+            for coup in (1, 2, 3):
+                journal_file.write(json.dumps({"move": coup, "origin": 1, "destination": 3, "t": 0}) + "\n")
+        records = []
+        orchestrator = PipelineOrchestrator(self.connecter, reprendre=True, journal_path=self.journal_path,
+                                            progress_callback=records.append)
+        orchestrator.run()
+        self.assertEqual([record["move"] for record in records], [4, 5, 6, 7])
+        self.assertEqual(records[0]["remaining_moves"], 3)
+        self.assertEqual(records[-1]["remaining_moves"], 0)
+
+    def test_partie_avec_detection(self):
+        """La caméra préchauffe pendant la connexion, puis est libérée en fin de partie."""
+        processor = FakeProcessor()
+        orchestrator = PipelineOrchestrator(self.connecter, processor_factory=lambda: processor,
+                                            detector=lambda p: 2, journal_path=self.journal_path)
+        orchestrator.run()
+        for stage in (STAGE_CAMERA, STAGE_TRAVEL, STAGE_DETECT, STAGE_PLAN):
+            self.assertIn(stage, orchestrator.timings)
+        self.assertEqual(processor.events, ["open", "warm_up", "release"])
+        self.assertEqual(orchestrator.robot.telemetry.summary()["moves"], 3)
+        self.assertEqual([name for name, *_ in orchestrator.rapport()][0], STAGE_CONNECT)
+
+    def test_nombre_requis_sans_camera(self):
+        """Sans caméra ni nombre de palets, la partie est refusée avant toute connexion."""
+        with self.assertRaises(ValueError):
+            PipelineOrchestrator(self.connecter, journal_path=self.journal_path).run()
+        self.assertEqual(self.devices, [])
+
+    def test_echec_detection_libere_materiel(self):
+        """Aucun palet détecté : la caméra est libérée et le robot déconnecté."""
+        processor = FakeProcessor()
+        orchestrator = PipelineOrchestrator(self.connecter, processor_factory=lambda: processor,
+                                            detector=lambda p: 0, journal_path=self.journal_path)
+        with self.assertRaises(RuntimeError):
+            orchestrator.run()
+        self.assertEqual(processor.events[-1], "release")
+        self.assertNotIn(STAGE_EXECUTE, orchestrator.timings)
+
+    def test_move_stream(self):
+        """Le flux produit les mêmes mouvements que la matrice complète, reprise comprise."""
+        movements = HanoiIterative(4).get_move_matrix()
+        self.assertEqual(list(MoveStream(4, maxsize=2).start()), movements)
+        self.assertEqual(list(MoveStream(4, depart=5).start()), movements[5:])
+
+    def test_move_stream_arret(self):
+        """stop() libère le producteur bloqué sur la file pleine."""
+        stream = MoveStream(10, maxsize=1).start()
+        stream.stop()
+        stream._thread.join(timeout=1)
+        self.assertFalse(stream._thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
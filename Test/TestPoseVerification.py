@@ -0,0 +1,45 @@
+import unittest
+from BlocRobot.PoseVerification import (
+    PoseVerificationPolicy, VERIFY_ALWAYS, VERIFY_GRASP_RELEASE, VERIFY_EVERY_N, VERIFY_NEVER,
+    POINT_GRASP, POINT_RELEASE
+)
+
+class TestPoseVerification(unittest.TestCase):
+
+    def test_modes(self):
+        """
+        Vérifie quels déplacements sont contrôlés selon le mode choisi.
+        """
+        points = [None, POINT_GRASP, None, POINT_RELEASE, None, None]
+        attendus = {
+            VERIFY_ALWAYS: [True] * 6,
+            VERIFY_GRASP_RELEASE: [False, True, False, True, False, False],
+            VERIFY_EVERY_N: [False, False, True, False, False, True],
+            VERIFY_NEVER: [False] * 6,
+        }
+        for mode, attendu in attendus.items():
+            policy = PoseVerificationPolicy(mode=mode, every_n=3, settle_time=0)
+            self.assertEqual([policy.should_verify(p) for p in points], attendu, mode)
+            self.assertEqual(policy.moves, 6)
+
+    def test_tolerance_et_compteurs(self):
+        """
+        Vérifie la tolérance configurable et le comptage des écarts détectés.
+        """
+        policy = PoseVerificationPolicy(tolerance=1.5, settle_time=0)
+        self.assertTrue(policy.check((220, 0, 150), (221, 0.5, 149, 0)))
+        self.assertFalse(policy.check((220, 0, 150), (220, 0, 146, 0)))
+        self.assertEqual(policy.checks, 2)
+        self.assertEqual(policy.deviations, 1)
+        self.assertEqual(policy.max_deviation, 4)
+
+    def test_mode_invalide(self):
+        """
+        Vérifie qu'un mode inconnu est refusé.
+        """
+        with self.assertRaises(ValueError):
+            PoseVerificationPolicy(mode="parfois")
+
+
+if __name__ == "__main__":
+    unittest.main()
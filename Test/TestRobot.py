@@ -1,14 +1,16 @@
+import sys
 from BlocRobot.DobotControl import DobotControl
-import time
-from serial.tools import list_ports
-import pydobot
+from BlocRobot.DobotSimulator import SimulatedDobot
 
 class TestRobot:
-    def __init__(self):
+    def __init__(self, simulation=False):
+        """
+        :param simulation: True pour exécuter les tests sur le Dobot simulé.
+        """
         print("Test de la position home")
         try:
-            self.robot = DobotControl()
-            time.sleep(30)
+            # La prise d'origine rend la main dès la fin du mouvement : pas d'attente fixe
+            self.robot = DobotControl(device=SimulatedDobot() if simulation else None)
             print("✅ Robot initialisé avec succès.")
         except Exception as e:
             print(f"⚠️ Erreur lors de l'initialisation du robot : {e}")
@@ -88,7 +90,7 @@ class TestRobot:
 
 
 if __name__ == "__main__":
-    test = TestRobot()
+    test = TestRobot(simulation="--simulation" in sys.argv)
     print("Démarrage des tests...")
 
     test_methods = [
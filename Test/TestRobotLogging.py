@@ -0,0 +1,49 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+from BlocRobot.RobotLogging import configurer_logs, arreter_logs, lire_niveaux, pydobot_verbose, LOG_ENV_VAR
+
+
+class TestRobotLogging(unittest.TestCase):
+
+    def tearDown(self):
+        arreter_logs()
+        for name in ("pydobot", "BlocRobot.DobotControl"):
+            logging.getLogger(name).setLevel(logging.NOTSET)
+
+    def test_lire_niveaux(self):
+        """Vérifie l'interprétation d'une spécification de niveaux par module."""
+        niveau, niveaux = lire_niveaux("warning, BlocRobot.DobotControl=DEBUG,pydobot=info")
+        self.assertEqual(niveau, logging.WARNING)
+        self.assertEqual(niveaux, {"BlocRobot.DobotControl": logging.DEBUG, "pydobot": logging.INFO})
+        with self.assertRaises(ValueError):
+            lire_niveaux("BlocRobot=BAVARD")
+
+    def test_pydobot_silencieux_par_defaut(self):
+        """Vérifie que la trace de pydobot est désactivée par défaut et activable par HANOI_LOG."""
+        with mock.patch.dict(os.environ, {LOG_ENV_VAR: ""}):
+            configurer_logs()
+            self.assertFalse(pydobot_verbose())
+        with mock.patch.dict(os.environ, {LOG_ENV_VAR: "pydobot=DEBUG"}):
+            configurer_logs()
+            self.assertTrue(pydobot_verbose())
+
+    def test_fichier_json(self):
+        """Vérifie que les messages passent par la file et sont écrits en JSON Lines."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hanoi.log")
+            with mock.patch.dict(os.environ, {LOG_ENV_VAR: ""}):
+                configurer_logs(levels={"BlocRobot.DobotControl": logging.DEBUG}, log_file=path)
+            logging.getLogger("BlocRobot.DobotControl").debug("H= %s", -55)
+            logging.getLogger("BlocRobot.Autre").debug("ignoré")
+            arreter_logs()
+            with open(path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual([(line["logger"], line["message"]) for line in lines], [("BlocRobot.DobotControl", "H= -55")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from BlocCommun import RunProfiler as run_profiler
+from BlocCommun.RunProfiler import RunProfiler, demarrer_profilage, arreter_profilage, span, mesurer
+
+
+@mesurer
+def calcul_instrumente(n):
+    return sum(range(n))
+
+
+def occuper(duration):
+    # Boucle active : échantillonnée hors attente
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+class TestRunProfiler(unittest.TestCase):
+
+    def tearDown(self):
+        run_profiler._profiler = None
+
+    def test_inactif(self):
+        """Sans profilage, span() et mesurer() n'enregistrent rien et ne changent pas le résultat."""
+        self.assertIsNone(run_profiler._profiler)
+        with span("BlocAlgo.test"):
+            pass
+        self.assertEqual(calcul_instrumente(10), 45)
+        self.assertIsNone(arreter_profilage())
+
+    def test_etapes_par_bloc(self):
+        """Les étapes imbriquées d'un même bloc ne sont comptées qu'une fois dans sa durée cumulée."""
+        ticks = iter(range(100))
+        profiler = RunProfiler(clock=lambda: next(ticks))
+        with profiler.span("BlocRobot.partie"):        # 0 -> 5
+            with profiler.span("BlocRobot.coup"):      # 1 -> 2
+                pass
+            with profiler.span("BlocVision.detection"):  # 3 -> 4
+                pass
+        self.assertEqual(profiler.spans["BlocRobot.coup"], [1, 1, 1])
+        self.assertEqual(profiler.bloc_spans["BlocRobot"], 5)
+        self.assertEqual(profiler.bloc_spans["BlocVision"], 1)
+
+    def test_profil_complet(self):
+        """Le profil écrit des piles repliées "pile nombre" et un résumé avec les étapes mesurées."""
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = demarrer_profilage(interval=0.001)
+            self.assertEqual(calcul_instrumente(1000), 499500)
+            occuper(0.05)
+            with redirect_stdout(io.StringIO()):
+                folded_path = arreter_profilage(tmp)
+            self.assertGreater(profiler.active_samples, 0)
+            with open(folded_path, encoding="utf-8") as folded_file:
+                lines = folded_file.read().splitlines()
+            self.assertTrue(lines)
+            for line in lines:
+                stack, count = line.rsplit(" ", 1)
+                self.assertTrue(int(count) > 0 and stack)
+            self.assertTrue(any("TestRunProfiler:occuper" in line for line in lines))
+            with open(folded_path[:-len(".folded")] + ".txt", encoding="utf-8") as summary_file:
+                summary = summary_file.read()
+            self.assertIn("Test.calcul_instrumente", summary)
+            self.assertIn("TestRunProfiler:occuper", summary)
+            self.assertEqual(len(os.listdir(tmp)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import time
+import unittest
+from BlocRobot.DobotControl import DobotControl
+
+
+class FakeDobot:
+    """Connexion factice : mémorise sa fermeture."""
+    def __init__(self, port):
+        self.port = port
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestSonderPorts(unittest.TestCase):
+    """
+    Recherche du Dobot sur plusieurs ports en parallèle, avec des connexions factices
+    dont la durée (ou l'échec) est imposée par port.
+    """
+
+    def sonder(self, delays, prefer=None, timeout=2.0, grace=0.3):
+        """
+        :param delays: Port -> durée (s) de la connexion, ou None pour un port qui échoue.
+        :return: (port retenu, instance retenue, connexions créées, durée de la recherche).
+        """
+        created = []
+
+        def factory(port_name):
+            delay = delays[port_name]
+            if delay is None:
+                raise OSError("pas de Dobot")
+            time.sleep(delay)
+            device = FakeDobot(port_name)
+            created.append(device)
+            return device
+
+        start = time.monotonic()
+        port, device = DobotControl.sonder_ports(list(delays), timeout=timeout, prefer=prefer,
+                                                 factory=factory, grace=grace)
+        return port, device, created, time.monotonic() - start
+
+    def test_port_prioritaire_retenu(self):
+        """Le dernier port valide est retenu même s'il répond un peu après un autre port."""
+        port, device, created, _ = self.sonder({"COM3": 0.0, "COM4": 0.1}, prefer="COM4")
+        self.assertEqual(port, "COM4")
+        self.assertFalse(device.closed)
+        self.assertTrue(all(d.closed for d in created if d is not device))
+
+    def test_cache_obsolete_sans_attente(self):
+        """Un dernier port valide qui échoue ne retarde pas la connexion à un autre port."""
+        port, _, _, duration = self.sonder({"COM3": 0.05, "COM4": None}, prefer="COM4")
+        self.assertEqual(port, "COM3")
+        self.assertLess(duration, 0.3)
+
+    def test_port_prioritaire_bloque(self):
+        """Un port prioritaire bloqué n'est attendu que le délai de grâce ; sa connexion tardive est refermée."""
+        port, _, created, duration = self.sonder({"COM3": 0.0, "COM4": 0.6}, prefer="COM4", grace=0.2)
+        self.assertEqual(port, "COM3")
+        self.assertLess(duration, 0.5)
+        time.sleep(0.6)
+        late = [d for d in created if d.port == "COM4"]
+        self.assertEqual(len(late), 1)
+        self.assertTrue(late[0].closed)
+
+    def test_premiere_connexion_sans_cache(self):
+        """Sans port prioritaire, la première connexion est retenue et les suivantes refermées."""
+        port, device, created, _ = self.sonder({"COM3": 0.0, "COM4": 0.1})
+        self.assertEqual(port, "COM3")
+        time.sleep(0.2)
+        self.assertEqual([d.closed for d in created], [False, True])
+
+    def test_aucun_dobot(self):
+        """Aucun port ne répond : (None, None)."""
+        self.assertEqual(self.sonder({"COM3": None, "COM4": None})[:2], (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from BlocRobot.StackHeightModel import StackHeightModel
+
+
+class TestStackHeightModel(unittest.TestCase):
+
+    def test_default_heights_match_measured_values(self):
+        """Vérifie que le modèle par défaut retrouve les hauteurs mesurées sur le plateau."""
+        model = StackHeightModel()
+        self.assertEqual(model.heights[:6], (-82, -55, -30, -5, 20, 45))
+
+    def test_more_than_five_discs(self):
+        """Vérifie que le modèle accepte plus de 5 palets tant que la hauteur maximale le permet."""
+        model = StackHeightModel()
+        self.assertEqual(model.max_discs, 8)
+        self.assertEqual(model.height(8), 120)
+        self.assertLessEqual(model.clearance(model.max_discs), model.max_height)
+
+    def test_out_of_range(self):
+        """Vérifie qu'un nombre de palets hors du modèle lève une erreur."""
+        model = StackHeightModel()
+        with self.assertRaises(ValueError):
+            model.height(model.max_discs + 1)
+        with self.assertRaises(ValueError):
+            model.clearance(-1)
+
+    def test_from_calibration(self):
+        """Vérifie la construction depuis un dictionnaire de calibration."""
+        model = StackHeightModel.from_calibration({"h_palet_base": -60, "pas_palet": 20})
+        self.assertEqual(model.height(1), -60)
+        self.assertEqual(model.height(3), -20)
+        self.assertEqual(model.clearance(3), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
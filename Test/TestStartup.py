@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from BlocRobot.ExecutionJournal import lire_journal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET = 1.0  # Durée maximale (s) d'une sous-commande sans interface
+HEAVY_MODULES = ("PyQt6", "cv2", "numpy", "pydobot", "serial")
+
+
+def lancer(*args):
+    """Lance python avec args depuis la racine du projet et retourne (résultat, durée)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=30)
+    return result, time.perf_counter() - start
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_imports_differes(self):
+        """L'import du programme principal et du pilote ne charge ni PyQt6, ni OpenCV, ni pydobot."""
+        code = ("import sys, main, BlocRobot.DobotControl, BlocRobot.AsyncDobotControl; "
+                f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+        result, _ = lancer("-c", code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_budget_plan(self):
+        """La sous-commande plan s'exécute dans le budget de démarrage."""
+        result, duration = lancer("main.py", "plan", "--palets", "4")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("15 déplacements pour 4 palets.", result.stdout)
+        self.assertLess(duration, STARTUP_BUDGET)
+
+    def test_partie_sans_interface(self):
+        """Une partie simulée sans interface ne charge jamais PyQt6 et tient dans le budget."""
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = os.path.join(tmp, "journal.jsonl")
+            result, duration = lancer("-X", "importtime", "main.py", "run", "--simulation",
+                                      "--palets", "3", "--journal", journal)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertNotIn("PyQt6", result.stderr)  # -X importtime liste les modules importés
+            self.assertIn("terminée", result.stdout)
+            self.assertTrue(lire_journal(journal)["done"])
+            self.assertLess(duration, STARTUP_BUDGET)
+
+    def test_reprise_sans_interface(self):
+        """--reprendre rejoue seulement les coups manquants de la partie interrompue."""
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = os.path.join(tmp, "journal.jsonl")
+            with open(journal, "w", encoding="utf-8") as journal_file:
+                journal_file.write(json.dumps({"nb_palets": 3, "total_moves": 7, "started": 0}) + "\n")
+                for coup in (1, 2, 3):
+                    journal_file.write(json.dumps({"move": coup, "origin": 1, "destination": 3, "t": 0}) + "\n")
+            result, _ = lancer("main.py", "run", "--simulation", "--reprendre", "--journal", journal)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertIn("Reprise au coup 4", result.stdout)
+            self.assertIn("(4 coups)", result.stdout)
+            self.assertTrue(lire_journal(journal)["done"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import queue
+import unittest
+from unittest import mock
+from BlocRobot.DobotControl import DobotControl, lire_etat, PHOTO_POSE, EXECUTION_PIPELINE, MOTION_JUMP
+from BlocRobot.ExecutionJournal import lire_journal
+from BlocRobot.RobotLogging import arreter_logs
+from BlocRobot.StationManager import (
+    Station, StationManager, associer_stations, obtenir_plan, executer_station, STATE_DONE
+)
+
+
+class TestStationManager(unittest.TestCase):
+
+    def test_associer_stations(self):
+        """Chaque Dobot est associé dans l'ordre à une caméra, s'il en reste."""
+        stations = associer_stations(["COM3", "COM5"], [0])
+        self.assertEqual([(s.port, s.camera_index) for s in stations], [("COM3", 0), ("COM5", None)])
+
+    def test_cache_de_plans(self):
+        """Le plan est calculé une fois puis relu depuis le cache."""
+        cache = {}
+        plan = obtenir_plan(cache, 3)
+        self.assertEqual(len(plan), 7)
+        self.assertIs(obtenir_plan(cache, 3), plan)
+
+    def test_nombre_de_palets_requis_sans_camera(self):
+        """Une station sans caméra exige un nombre de palets imposé."""
+        with self.assertRaises(ValueError):
+            StationManager([Station("sim-1", simulation=True)])
+
+    def test_fichiers_etat_par_station(self):
+        """Chaque station a ses propres fichiers de prise d'origine, de port et de calibration."""
+        first, second = Station("COM3", port="COM3"), Station("/dev/ttyUSB0", port="/dev/ttyUSB0")
+        for path in ("journal_path", "home_state_path", "port_cache_path", "calibration_path"):
+            self.assertNotEqual(getattr(first, path)(), getattr(second, path)())
+        self.assertEqual(os.path.basename(second.home_state_path()), "dobot_home__dev_ttyUSB0.json")
+
+    def test_calibration_par_defaut(self):
+        """Sans fichier propre, une station utilise la calibration de l'installation."""
+        with tempfile.TemporaryDirectory() as tmp:
+            default_path = os.path.join(tmp, "calibration.json")
+            with open(default_path, "w", encoding="utf-8") as calibration_file:
+                json.dump({"source": "installation"}, calibration_file)
+            station = Station("COM3", port="COM3", state_dir=tmp)
+            self.assertEqual(station.lire_calibration(default_path), {"source": "installation"})
+            with open(station.calibration_path(), "w", encoding="utf-8") as calibration_file:
+                json.dump({"source": "station"}, calibration_file)
+            self.assertEqual(station.lire_calibration(default_path), {"source": "station"})
+
+    def test_detection_depuis_position_photo(self):
+        """Le bras rejoint la position photo avant que la station ne compte ses palets."""
+        events = []
+        move_to_and_check = DobotControl.move_to_and_check
+
+        def deplacer(robot, *args, **kwargs):
+            events.append(args[:3])
+            return move_to_and_check(robot, *args, **kwargs)
+
+        def detecter(camera_index):
+            events.append("detection")
+            return 2
+
+        self.addCleanup(arreter_logs)
+        status_queue = queue.Queue()
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(DobotControl, "move_to_and_check", deplacer), \
+                mock.patch("BlocRobot.StationManager.detecter_palets", detecter):
+            station = Station("sim-1", camera_index=0, simulation=True, state_dir=tmp)
+            executer_station(station, None, {}, status_queue, EXECUTION_PIPELINE, MOTION_JUMP)
+        self.assertEqual(events[events.index("detection") - 1], PHOTO_POSE)
+        statuses = []
+        while not status_queue.empty():
+            statuses.append(status_queue.get())
+        self.assertEqual(statuses[-1]["state"], STATE_DONE, statuses[-1])
+
+    def test_stations_simulees_en_parallele(self):
+        """Deux stations simulées jouent leur partie dans deux processus."""
+        with tempfile.TemporaryDirectory() as tmp:
+            stations = [Station(f"sim-{i}", simulation=True, state_dir=tmp) for i in (1, 2)]
+            status = StationManager(stations, nb_palets=3).run(afficher=False)
+            for station in stations:
+                self.assertEqual(status[station.name]["state"], STATE_DONE, status[station.name])
+                self.assertEqual(status[station.name]["move"], 7)
+                self.assertTrue(lire_journal(station.journal_path())["done"])
+                self.assertEqual(os.path.dirname(station.journal_path()), tmp)
+                self.assertEqual(lire_etat(station.home_state_path())["port"], station.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
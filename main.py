@@ -1,91 +1,188 @@
 import sys
-from PyQt6.QtWidgets import QApplication, QMessageBox
+import argparse
+import os
 import time
-import threading
 from BlocAlgo.HanoiIterative import HanoiIterative
-from BlocInterface.SimulationMoves import SimulationMoves
-from BlocVision.CameraProcessor import CameraProcessor
-from BlocInterface.DetectionInterface import DetectionInterface
-from BlocRobot.DobotControl import DobotControl
+from BlocRobot.DobotControl import (
+    DobotControl, ROBOT_STATE_DIR,
+    EXECUTION_BLOCKING, EXECUTION_PIPELINE, MOTION_SEGMENTS, MOTION_JUMP
+)
+from BlocRobot.ExecutionJournal import JOURNAL_PATH
+from BlocRobot.MoveTelemetry import DEFAULT_TELEMETRY_PATH
+from BlocRobot.PipelineOrchestrator import PipelineOrchestrator
+from BlocRobot.RobotLogging import configurer_logs
+from BlocCommun.RunProfiler import demarrer_profilage, arreter_profilage, PROFILE_DIR, SAMPLE_INTERVAL
 import signal
 
-def main():
+# PyQt6, OpenCV et pydobot sont importés dans les fonctions qui les utilisent : les
+# sous-commandes sans interface (plan, detect, run) démarrent sans charger PyQt6.
+SIMULATION_JOURNAL_PATH = os.path.join(ROBOT_STATE_DIR, "execution_journal_simulation.jsonl")
+
+def main(apercu=True, vitesse=1):
     """
     Programme principal pour résoudre la Tour de Hanoï avec un robot et une caméra.
+    Toute la partie se déroule dans un tableau de bord unique : connexion, caméra et robot
+    tournent dans des threads de travail, l'interface n'est jamais bloquée.
+    :param apercu: Propose l'aperçu des déplacements avant de lancer le robot.
+    :param vitesse: Facteur de vitesse de lecture de l'aperçu.
     """
+    from PyQt6.QtWidgets import QApplication
+    from BlocInterface.Dashboard import Dashboard
+    from BlocVision.CameraProcessor import CameraProcessor
 
+    configurer_logs()  # Niveaux par module réglables avec HANOI_LOG (ex. "BlocRobot.DobotControl=DEBUG")
     print("Program Start:")
-    
-    # === 1. INITIALISATION DES COMPOSANTS === 
-    print("Initialisation du robot...")
-    robot = DobotControl()  # Création de l'instance du robot
-    #robot.execute_init()
 
-    print("Initialisation de la caméra...")
-    robot.move_to_and_check(220, -150, 155)
     app = QApplication(sys.argv)
-    reply = QMessageBox.information(
-        None,
-        "Initialisation de la caméra",
-        "Voulez-vous lancer l'initialisation de la caméra ?",
-        QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel
+    dashboard = Dashboard(
+        robot_factory=lambda: DobotControl(skip_recent_home=True),
+        processor_factory=CameraProcessor,  # Le préchauffage attend la stabilisation de l'image
+        apercu=apercu, vitesse=vitesse, progress_callback=afficher_progression,
     )
-    if reply == QMessageBox.StandardButton.Cancel:
-        print("Initialisation de la caméra annulée par l'utilisateur.")
-        robot.disconnect()
-        sys.exit(app.exec())
-        exit(0)
-
-    print("Initialisation de l'interface...")
-    interface = DetectionInterface(app)
-
-    # === 2. ACQUISITION DE L'ÉTAT INITIAL ===
-    print("Prise de photo pour analyser la tour d'origine...")
-    robot.move_to_and_check(230, -90, 155)
-    time.sleep(2)
-    processor = CameraProcessor()
-    frame = processor.capture_image()
-
-    if frame is not None:
-        detection_id = int(time.time())
-        num_discs, _ = processor.detect_discs(frame, detection_id)
-        print(f"Nombre de palets détectés : {num_discs}")
-    
-    #On valide mtn le nombre de palets par l'utilisateur 
-    #interface = DetectionInterface(num_discs)
-    validated_count = interface.run_detection_workflow()
-    if validated_count == -1:
-        print("Annulation de la validation.")
-        robot.disconnect()
-        sys.exit(0)
-        exit(0)
-
-
-    # === 3. CALCUL DES DÉPLACEMENTS SELON L'ALGORITHME DE HANOÏ ===
-    print("Calcul des déplacements...")
-    robot.move_to_and_check(220, -150, 155)
-    algo = HanoiIterative(validated_count)# Génération de la liste des déplacements
-
-    # === 4. EXECUTION DES DEPLACEMENTS PAR LA SIMULATION ===
-    simulation = SimulationMoves(algo, app)
-    simulation.show()
-    app.exec()  # Lancement de l'application PyQt pour la simulation
-
-    # === 4. EXÉCUTION DES DÉPLACEMENTS PAR LE ROBOT ===
-
-    for coup, origine, destination, palets_origin_before, palets_destination_before in algo.get_move_matrix():
-        print(f"Exécution du déplacement {coup}: {origine} -> {destination}")
-        robot.realiser_deplacement(origine, destination, palets_origin_before, palets_destination_before)
-        
-    print("Résolution de la Tour de Hanoï terminée !")
-    robot.return_to_home()
-    robot.disconnect()
-
-    # === 5.FIN DU PROGRAMME ===
-
+    dashboard.show()
+    dashboard.start()
+    app.exec()
+
+    # === FIN DU PROGRAMME : la partie en cours se termine avant la déconnexion ===
+    dashboard.shutdown()
+    if dashboard.robot is not None:
+        print(f"Vérifications de position : {dashboard.robot.verification.stats()}")
+        dashboard.robot.disconnect()
     print("Program End.")
     sys.exit(0)
-    exit(0)
+
+def jouer_sans_interface(nb_palets=None, camera_index=0, save_images=False, show_images=False,
+                         reprendre=False, simulation=False, journal_path=None,
+                         execution_mode=EXECUTION_BLOCKING, motion_mode=MOTION_SEGMENTS):
+    """
+    Partie complète sans aucune fenêtre Qt (sous-commande run) : exécutions sans surveillance et benchmarks.
+    Les étapes indépendantes se recouvrent (PipelineOrchestrator) et leur chronogramme est affiché.
+    :param nb_palets: Nombre de palets imposé, ou None pour le détecter avec la caméra.
+    :param reprendre: Reprend la partie interrompue du journal s'il y en a une.
+    :param simulation: Joue la partie sur un Dobot simulé (aucun matériel requis).
+    :param journal_path: Journal d'exécution (par défaut, un journal distinct en simulation).
+    :return: Durée (s) de la partie, mesurée sur l'horloge du robot.
+    """
+    if journal_path is None:
+        journal_path = SIMULATION_JOURNAL_PATH if simulation else JOURNAL_PATH
+
+    def connecter_robot():
+        device = None
+        if simulation:
+            from BlocRobot.DobotSimulator import SimulatedDobot
+            device = SimulatedDobot()
+        return DobotControl(device=device, skip_recent_home=True,
+                            execution_mode=execution_mode, motion_mode=motion_mode)
+
+    def creer_processor():
+        from BlocVision.CameraProcessor import CameraProcessor
+        return CameraProcessor(camera_index=camera_index, save_images=save_images)
+
+    orchestrator = PipelineOrchestrator(
+        connecter_robot,
+        processor_factory=None if simulation else creer_processor,
+        detector=lambda processor: detecter_camera(processor, show_images),
+        nb_palets=nb_palets, reprendre=reprendre, journal_path=journal_path,
+        telemetry_path=None if simulation else DEFAULT_TELEMETRY_PATH,
+        progress_callback=afficher_progression,
+    )
+    duration = orchestrator.run()
+    telemetry = orchestrator.robot.telemetry
+    summary = telemetry.summary()
+    print(f"Résolution de la Tour de Hanoï terminée en {duration:.1f} s ({summary['moves']} coups)")
+    print(f"Durées moyennes par phase : {summary}")
+    telemetry.close()
+    orchestrator.afficher_rapport()
+    return duration
+
+def detecter_camera(processor, show_images=False):
+    """
+    Compte les palets de la tour de départ avec la caméra préchauffée, sans validation manuelle.
+    Les étapes de traitement sont affichées par OpenCV (et non Qt) si show_images.
+    """
+    frame = processor.capture_image(keep_open=True)
+    if frame is None:
+        raise RuntimeError(f"Aucune image de la caméra {processor.camera_index}")
+    num_discs, steps = processor.detect_discs(frame, int(time.time()))
+    print(f"Nombre de palets détectés : {num_discs}")
+    if show_images:
+        import cv2
+
+        for title, image in steps:
+            cv2.imshow(title, image)
+            cv2.waitKey(0)  # Une touche pour passer à l'étape suivante
+            cv2.destroyWindow(title)
+    return num_discs
+
+def afficher_plan(nb_palets):
+    """
+    Affiche la liste des déplacements pour nb_palets palets (sous-commande plan).
+    """
+    movements = HanoiIterative(nb_palets).get_move_matrix()
+    for coup, origine, destination, palets_origin_before, palets_destination_before in movements:
+        print(f"{coup}: {origine} -> {destination} ({palets_origin_before} -> {palets_destination_before} palets)")
+    print(f"{len(movements)} déplacements pour {nb_palets} palets.")
+
+def detecter_image(path, save_images=False):
+    """
+    Compte les palets d'une image enregistrée, sans robot ni caméra (sous-commande detect).
+    """
+    from BlocVision.CameraProcessor import CameraProcessor
+
+    processor = CameraProcessor(save_images=save_images)
+    frame = processor.load_image_from_file(path)
+    if frame is None:
+        return None
+    num_discs, _ = processor.detect_discs(frame, int(time.time()))
+    print(f"Nombre de palets détectés : {num_discs}")
+    return num_discs
+
+def analyser_arguments(argv=None):
+    """
+    Analyse la ligne de commande. Sans sous-commande, la partie complète est lancée.
+    """
+    parser = argparse.ArgumentParser(description="Résolution de la Tour de Hanoï avec un Dobot et une caméra.")
+    parser.add_argument("--sans-apercu", action="store_true",
+                        help="Masque l'aperçu des déplacements dans le tableau de bord")
+    parser.add_argument("--vitesse", type=float, default=1,
+                        help="Facteur de vitesse de la simulation (défaut : 1 mouvement par seconde)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile toute l'exécution (piles repliées pour flame graph et résumé des points chauds)")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="Dossier des profils")
+    parser.add_argument("--profile-interval", type=float, default=SAMPLE_INTERVAL * 1000,
+                        help="Période d'échantillonnage du profil (ms)")
+    subparsers = parser.add_subparsers(dest="command")
+    plan_parser = subparsers.add_parser("plan", help="Affiche les déplacements sans robot ni interface")
+    plan_parser.add_argument("--palets", type=int, required=True, help="Nombre de palets")
+    detect_parser = subparsers.add_parser("detect", help="Compte les palets d'une image enregistrée")
+    detect_parser.add_argument("image", help="Chemin de l'image")
+    detect_parser.add_argument("--save", action="store_true", help="Archive la détection")
+    run_parser = subparsers.add_parser("run", help="Partie complète sans interface graphique")
+    run_parser.add_argument("--palets", type=int, default=None,
+                            help="Nombre de palets ; par défaut, détection par la caméra")
+    run_parser.add_argument("--camera", type=int, default=0, help="Index de la caméra")
+    run_parser.add_argument("--save-images", action="store_true", help="Archive les étapes de la détection")
+    run_parser.add_argument("--show-images", action="store_true", help="Affiche les étapes de la détection")
+    run_parser.add_argument("--reprendre", action="store_true", help="Reprend la partie interrompue du journal")
+    run_parser.add_argument("--simulation", action="store_true", help="Joue la partie sur un Dobot simulé")
+    run_parser.add_argument("--journal", default=None, help="Fichier du journal d'exécution")
+    run_parser.add_argument("--execution", choices=(EXECUTION_BLOCKING, EXECUTION_PIPELINE), default=EXECUTION_BLOCKING)
+    run_parser.add_argument("--trajectoire", choices=(MOTION_SEGMENTS, MOTION_JUMP), default=MOTION_SEGMENTS)
+    args = parser.parse_args(argv)
+    if args.vitesse <= 0:
+        parser.error("--vitesse doit être strictement positive")
+    if args.profile_interval <= 0:
+        parser.error("--profile-interval doit être strictement positive")
+    return args
+
+def afficher_progression(record):
+    """
+    Affiche la durée du coup terminé et le temps restant estimé (callback de MoveTelemetry).
+    """
+    eta = record["eta"]
+    eta_text = f"{eta:.0f} s" if eta is not None else "inconnu"
+    print(f"⏱️ Coup {record['move']} : {record['duration']:.2f} s | "
+          f"{record['remaining_moves']} coups restants, ETA {eta_text}")
 
 def signal_handler(sig, frame):
     """
@@ -107,7 +204,26 @@ if __name__ == "__main__":
     # Capture des signaux système (ex. Ctrl + C)
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
-    main()
+    args = analyser_arguments()
+    if args.profile:
+        demarrer_profilage(args.profile_interval / 1000)
+    try:
+        if args.command == "plan":
+            afficher_plan(args.palets)
+        elif args.command == "detect":
+            sys.exit(0 if detecter_image(args.image, args.save) is not None else 1)
+        elif args.command == "run":
+            configurer_logs()
+            try:
+                jouer_sans_interface(args.palets, args.camera, args.save_images, args.show_images, args.reprendre,
+                                     args.simulation, args.journal, args.execution, args.trajectoire)
+            except (ValueError, RuntimeError) as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+        else:
+            main(apercu=not args.sans_apercu, vitesse=args.vitesse)
+    finally:
+        arreter_profilage(args.profile_dir)  # Sans effet si le profilage n'est pas actif
     sys.exit(0)
     
 #TODO: robot: Commentaires !